@@ -0,0 +1,13 @@
+import redis
+from django.conf import settings
+
+_client = None
+
+
+def get_redis():
+    """Shared raw Redis client for things the Django cache API can't do
+    (Lua scripts, sorted sets, blocking pops, pub/sub)."""
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(settings.REDIS_URL, decode_responses=True)
+    return _client
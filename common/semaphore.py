@@ -0,0 +1,179 @@
+"""Distributed counting semaphore on Redis, safe across worker hosts.
+
+Leases live in a sorted set scored by their expiry time (Redis server clock,
+so host clock skew doesn't matter). Acquire, renew and release are Lua scripts,
+so the check-and-take is atomic. A holder that crashes loses its lease once
+the TTL runs out; long calls keep theirs alive with a heartbeat thread.
+Releasing pushes a token onto a wake-up list that waiters block on, so they
+retry as soon as a slot frees up instead of polling.
+"""
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from common.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+# Waiters re-check at least this often, to pick up leases that expired
+# without a release (crashed holders never push a wake-up token).
+WAKE_FALLBACK_SECONDS = 5
+WAIT_SAMPLES = 200
+
+_NOW_MS = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+"""
+
+_ACQUIRE_LUA = _NOW_MS + """
+local expired = redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now)
+if expired > 0 then
+    redis.call('HINCRBY', KEYS[2], 'expired', expired)
+end
+if redis.call('ZCARD', KEYS[1]) < tonumber(ARGV[2]) then
+    redis.call('ZADD', KEYS[1], now + tonumber(ARGV[3]), ARGV[1])
+    return 1
+end
+return 0
+"""
+
+_RENEW_LUA = _NOW_MS + """
+if redis.call('ZSCORE', KEYS[1], ARGV[1]) then
+    redis.call('ZADD', KEYS[1], 'XX', now + tonumber(ARGV[2]), ARGV[1])
+    return 1
+end
+return 0
+"""
+
+_RELEASE_LUA = """
+local removed = redis.call('ZREM', KEYS[1], ARGV[1])
+redis.call('RPUSH', KEYS[2], '1')
+redis.call('LTRIM', KEYS[2], -tonumber(ARGV[2]), -1)
+redis.call('PEXPIRE', KEYS[2], 60000)
+return removed
+"""
+
+_HOLDERS_LUA = _NOW_MS + """
+return redis.call('ZRANGEBYSCORE', KEYS[1], '(' .. now, '+inf')
+"""
+
+
+class AcquireCancelled(Exception):
+    """The waiter's should_stop() said to give up."""
+
+
+class RedisSemaphore:
+
+    def __init__(self, name, limit, lease_ttl=60):
+        self.name = name
+        self.limit = limit
+        self.lease_ttl = lease_ttl
+        self.leases_key = f"sem:{name}:leases"
+        self.wake_key = f"sem:{name}:wake"
+        self.metrics_key = f"sem:{name}:metrics"
+        self.waits_key = f"sem:{name}:waits"
+        self._scripts = None
+
+    def _script(self, name):
+        if self._scripts is None:
+            client = get_redis()
+            self._scripts = {
+                "acquire": client.register_script(_ACQUIRE_LUA),
+                "renew": client.register_script(_RENEW_LUA),
+                "release": client.register_script(_RELEASE_LUA),
+                "holders": client.register_script(_HOLDERS_LUA),
+            }
+        return self._scripts[name]
+
+    def _new_holder(self):
+        return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:12]}"
+
+    def try_acquire(self, holder):
+        keys = [self.leases_key, self.metrics_key]
+        args = [holder, self.limit, self.lease_ttl * 1000]
+        return bool(self._script("acquire")(keys=keys, args=args))
+
+    def acquire(self, timeout=600, should_stop=None):
+        """Block until a lease is granted. Returns the holder id.
+
+        `should_stop` is checked between waits (about once a second); when it
+        returns True the wait ends with AcquireCancelled.
+        """
+        client = get_redis()
+        holder = self._new_holder()
+        start = time.monotonic()
+        deadline = start + timeout
+        wait = 1 if should_stop else WAKE_FALLBACK_SECONDS
+        while not self.try_acquire(holder):
+            if should_stop and should_stop():
+                raise AcquireCancelled(f"Stopped waiting for a {self.name} slot")
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                client.hincrby(self.metrics_key, "timeouts", 1)
+                raise TimeoutError(f"Could not acquire {self.name} slot")
+            client.blpop(self.wake_key, timeout=max(1, int(min(remaining, wait))))
+
+        waited_ms = int((time.monotonic() - start) * 1000)
+        pipe = client.pipeline()
+        pipe.hincrby(self.metrics_key, "acquired", 1)
+        pipe.hincrby(self.metrics_key, "wait_ms_total", waited_ms)
+        pipe.lpush(self.waits_key, waited_ms)
+        pipe.ltrim(self.waits_key, 0, WAIT_SAMPLES - 1)
+        pipe.execute()
+        return holder
+
+    def renew(self, holder):
+        """Extend a lease. Returns False if it was already lost."""
+        return bool(self._script("renew")(keys=[self.leases_key], args=[holder, self.lease_ttl * 1000]))
+
+    def release(self, holder):
+        self._script("release")(keys=[self.leases_key, self.wake_key], args=[holder, self.limit])
+
+    @contextmanager
+    def lease(self, timeout=600, should_stop=None):
+        """Hold a slot for the duration of the block, renewing it in the background."""
+        holder = self.acquire(timeout=timeout, should_stop=should_stop)
+        stop = threading.Event()
+
+        def heartbeat():
+            while not stop.wait(self.lease_ttl / 3):
+                try:
+                    if not self.renew(holder):
+                        logger.warning("Lost %s lease %s", self.name, holder)
+                        return
+                except Exception as e:
+                    logger.warning("Could not renew %s lease %s: %s", self.name, holder, e)
+
+        thread = threading.Thread(target=heartbeat, name=f"{self.name}-heartbeat", daemon=True)
+        thread.start()
+        try:
+            yield holder
+        finally:
+            stop.set()
+            self.release(holder)
+
+    def stats(self):
+        """Current usage plus wait-time metrics since the counters were created."""
+        from websites.metrics import percentiles
+
+        client = get_redis()
+        metrics = client.hgetall(self.metrics_key)
+        waits = percentiles([int(w) for w in client.lrange(self.waits_key, 0, -1)]) or {"p50": 0, "p95": 0, "max": 0}
+        holders = self._script("holders")(keys=[self.leases_key])
+        acquired = int(metrics.get("acquired", 0))
+        return {
+            "name": self.name,
+            "limit": self.limit,
+            "in_use": len(holders),
+            "holders": holders,
+            "acquired": acquired,
+            "timeouts": int(metrics.get("timeouts", 0)),
+            "expired": int(metrics.get("expired", 0)),
+            "wait_ms_avg": int(metrics.get("wait_ms_total", 0)) // acquired if acquired else 0,
+            "wait_ms_p50": waits["p50"],
+            "wait_ms_p95": waits["p95"],
+            "wait_ms_max": waits["max"],
+        }
@@ -33,3 +33,13 @@ def upload_file(file_obj, remote_path, content_type='application/octet-stream'):
         ExtraArgs={'ACL': 'public-read', 'ContentType': content_type},
     )
     return f"{env.DO_SPACES_CDN_ENDPOINT}/{full_path}"
+
+
+def read_file(remote_path, start=None, end=None):
+    """Read a file back from DO Spaces: all of it, or bytes start..end (inclusive)."""
+    client = _get_client()
+    kwargs = {}
+    if start is not None:
+        kwargs['Range'] = f"bytes={start}-{'' if end is None else end}"
+    obj = client.get_object(Bucket=env.DO_SPACES_NAME, Key=f"{env.DO_SPACES_BASE_PATH}/{remote_path}", **kwargs)
+    return obj['Body'].read()
@@ -13,7 +13,7 @@ import django
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "siliconfriendly.settings")
 django.setup()
 
-import requests
+from websites import crawler
 from websites.models import Website
 from websites.tasks import generate_website_embedding
 from google import genai
@@ -26,14 +26,10 @@ BATCH_SIZE = 10
 SLEEP_BETWEEN = 1  # seconds between API calls to avoid rate limits
 
 
-def fetch_homepage(url, timeout=10):
-    """Fetch homepage content, return truncated text."""
+def fetch_homepage(website, host=None):
+    """Crawl the homepage (also stored as page_content), return truncated text."""
     try:
-        resp = requests.get(f"https://{url}", timeout=timeout, headers={
-            "User-Agent": "Mozilla/5.0 (compatible; SiliconFriendly/1.0)"
-        })
-        text = resp.text[:8000]  # truncate to avoid huge payloads
-        return text
+        return crawler.refresh_page_content(website, host=host)[:8000]
     except Exception:
         return ""
 
@@ -86,11 +82,11 @@ def main():
         print(f"\n[{i+1}/{total}] {website.url} ({website.name})")
         print(f"  Current: {website.description[:80]}...")
 
-        # Fetch homepage
-        homepage = fetch_homepage(website.url)
+        # Homepage text: the stored copy if there is one, else crawl it
+        homepage = website.page_content[:8000] or fetch_homepage(website)
         if not homepage:
             print(f"  Could not fetch homepage, trying with www...")
-            homepage = fetch_homepage(f"www.{website.url}")
+            homepage = fetch_homepage(website, host=f"www.{website.url}")
 
         if not homepage:
             print(f"  SKIP - no homepage content")
@@ -3,6 +3,9 @@ import os
 # Gemini
 GEMINI_API_KEY = os.environ.get('GEMINI_API_KEY', '')
 
+# Anthropic (website checker, when CHECKER_LLM_BACKEND=api)
+ANTHROPIC_API_KEY = os.environ.get('ANTHROPIC_API_KEY', '')
+
 # DigitalOcean Spaces
 DO_SPACES_NAME = os.environ.get('DO_SPACES_NAME', '')
 DO_SPACES_REGION = os.environ.get('DO_SPACES_REGION', 'sfo2')
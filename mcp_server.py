@@ -17,6 +17,7 @@ django.setup()
 from mcp.server.fastmcp import FastMCP
 from websites.models import Website, WebsiteVerification, Keyword, CRITERIA_FIELDS, LEVEL_RANGES
 from websites.views import _normalize_url, _website_to_dict, CRITERIA_DOCS
+from websites.shared_snapshots import download_snapshot, snapshot_info
 from accounts.models import Silicon
 
 mcp = FastMCP(
@@ -284,6 +285,7 @@ def get_verify_queue(auth_token: str = "") -> dict:
             "name": w.name,
             "description": w.description,
             "current_verification_count": w.v_count,
+            "snapshot": snapshot_info(w),
         }
         for w in websites
     ]
@@ -294,11 +296,47 @@ def get_verify_queue(auth_token: str = "") -> dict:
         "instructions": (
             "Visit each website, evaluate all 30 criteria honestly, "
             "then call verify_website with your results. "
+            "A website with a snapshot was crawled by its last check: get it with "
+            "get_site_snapshot instead of crawling the site yourself, unless it's stale. "
             "You earn 10 search queries per new verification."
         ),
     }
 
 
+@mcp.tool()
+def get_site_snapshot(domain: str, include_content: bool = True) -> dict:
+    """Get the crawl of a website made by its last Silicon Friendly check.
+
+    Verify from this shared snapshot instead of crawling the site yourself.
+
+    Args:
+        domain: The website domain (e.g. "stripe.com")
+        include_content: Include the snapshot itself, not just where to download it
+
+    Returns:
+        The snapshot's url, fetched_at, age_seconds and stale flag, and with
+        include_content its content: the condensed homepage (text, meta tags,
+        JSON-LD, links, forms) and docs page, robots.txt, sitemap, llms.txt,
+        agent card, OpenAPI spec and API probe responses.
+    """
+    domain = _normalize_url(domain)
+    website = Website.objects.filter(url=domain).first()
+    if not website:
+        return {"error": f"'{domain}' is not in the Silicon Friendly directory"}
+    info = snapshot_info(website)
+    if not info:
+        return {"error": f"no snapshot of '{domain}' yet. run a check at https://siliconfriendly.com/check/{domain}/"}
+
+    result = {"domain": domain, **info}
+    if include_content:
+        try:
+            result["content"] = download_snapshot(info["url"])
+        except Exception:
+            result["content"] = None
+            result["content_error"] = "could not download the snapshot, try the url"
+    return result
+
+
 @mcp.tool()
 def verify_website(
     domain: str,
@@ -428,7 +466,7 @@ if __name__ == "__main__":
         "description": "Rate and discover AI-agent-friendly websites",
         "version": "1.0.1",
         "protocol": "JSON-RPC 2.0",
-        "tools_count": 8,
+        "tools_count": 9,
         "documentation": "https://siliconfriendly.com/llms.txt",
         "usage": "Send POST requests with JSON-RPC 2.0 format",
     }).encode()
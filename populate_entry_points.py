@@ -3,13 +3,13 @@
 import os
 import sys
 import django
-import requests
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "siliconfriendly.settings")
 sys.path.insert(0, "/home/ubuntu/silicon-friendly")
 django.setup()
 
+from websites import crawler
 from websites.models import Website
 
 # Priority order - first match wins
@@ -38,14 +38,17 @@ def check_website(website):
         for scheme in ["https", "http"]:
             url = f"{scheme}://{domain}{path}"
             try:
-                resp = requests.head(url, timeout=5, allow_redirects=True)
-                if resp.status_code == 200:
+                # Shared crawler: robots.txt, per-host limits and crawl delay
+                resp = crawler.fetch(url, timeout=5, method="HEAD")
+                if resp is None:
+                    continue
+                if resp["status"] == 200:
                     # For HEAD, verify with GET for small files
                     if path.endswith(('.txt', '.md', '.json')):
-                        get_resp = requests.get(url, timeout=5, allow_redirects=True)
-                        if get_resp.status_code == 200 and len(get_resp.text.strip()) > 10:
+                        get_resp = crawler.fetch(url, timeout=5)
+                        if get_resp and get_resp["status"] == 200 and len(get_resp["body"].strip()) > 10:
                             # Make sure it's not an HTML error page
-                            content = get_resp.text.strip()[:100].lower()
+                            content = get_resp["body"].strip()[:100].lower()
                             if not content.startswith('<!doctype') and not content.startswith('<html'):
                                 print(f"  FOUND: {domain} -> {url}")
                                 return (website.id, url)
@@ -53,6 +56,8 @@ def check_website(website):
                         # For /api/docs type paths, just check status
                         print(f"  FOUND: {domain} -> {url}")
                         return (website.id, url)
+            except (crawler.CrawlRefused, TimeoutError):
+                return None
             except Exception:
                 continue
             break  # If https worked or failed, don't try http for same path
@@ -114,12 +114,36 @@ CELERY_BROKER_URL = REDIS_URL
 CELERY_RESULT_BACKEND = REDIS_URL
 CELERY_TASK_ALWAYS_EAGER = False
 CELERY_TASK_EAGER_PROPAGATES = True
+# Workers listening on several queues drain them in the order given with -Q,
+# so the check lanes (websites.queues) are served highest priority first.
+CELERY_BROKER_TRANSPORT_OPTIONS = {"queue_order_strategy": "priority"}
+
+# Website checker LLM backend (websites.llm): "cli", "api" or "stub".
+CHECKER_LLM_BACKEND = os.environ.get("CHECKER_LLM_BACKEND", "cli")
+CHECKER_LLM_MODEL = os.environ.get("CHECKER_LLM_MODEL", "claude-sonnet-4-5")
+CHECKER_LLM_STUB_LATENCY = float(os.environ.get("CHECKER_LLM_STUB_LATENCY", "0"))
+# Whether stub calls hold a Claude slot like real ones (benchmarks turn this on).
+CHECKER_LLM_STUB_SLOTS = False
+# Reuse stored LLM results for identical prompts (websites.tasks._cached_claude).
+CHECKER_LLM_REUSE_RESULTS = True
+# Site fetches for checks (websites.replay): "live", "record" or "replay".
+CHECKER_FETCH_MODE = os.environ.get("CHECKER_FETCH_MODE", "live")
+CHECKER_FETCH_FIXTURES = os.environ.get("CHECKER_FETCH_FIXTURES", str(BASE_DIR / "websites" / "benchmark" / "sites"))
+CHECKER_FETCH_REPLAY_LATENCY = float(os.environ.get("CHECKER_FETCH_REPLAY_LATENCY", "0"))
 
 CELERY_BEAT_SCHEDULE = {
     "websites-daily-verification-crunch-1956utc": {
         "task": "websites.tasks.daily_verification_crunch",
         "schedule": crontab(hour=19, minute=56),
     },
+    "websites-schedule-rechecks-every-15-min": {
+        "task": "websites.tasks.schedule_rechecks",
+        "schedule": 900.0,
+    },
+    "websites-refresh-page-content-hourly": {
+        "task": "websites.tasks.refresh_stale_page_content",
+        "schedule": 3600.0,
+    },
     "payments-check-pending-every-minute": {
         "task": "payments.tasks.check_pending_payments",
         "schedule": 60.0,
@@ -3,7 +3,7 @@ from django.urls import path, include
 from django.http import JsonResponse, HttpResponse
 
 from websites.views import WebsiteBadgeSvgView, WebsiteBadgeJsView, UniversalBadgeJsView, WebsiteLevelApiView
-from websites.checker import check_website_api, check_page_view, start_check_api, check_status_api, report_download_view
+from websites.checker import check_website_api, check_page_view, start_check_api, cancel_check_api, check_status_api, check_events_api, report_download_view
 from common.ratelimit import check_rate_limit, rate_limit_response, get_client_ip
 from django.core.cache import cache
 
@@ -482,7 +482,8 @@ success response (200):
         "url": "example.com",
         "name": "Example",
         "description": "An example website",
-        "current_verification_count": 3
+        "current_verification_count": 3,
+        "snapshot": {"url": "https://.../snapshots/example.com/20260101T120000-1a2b3c4d.json.gz", "fetched_at": "2026-01-01T12:00:00+00:00", "age_seconds": 5400, "stale": false}
       },
       ...
     ],
@@ -491,16 +492,96 @@ success response (200):
       "l1_meta_tags": "Has proper meta tags (title, description, og:tags, twitter:card)",
       ... all 30 criteria with human-readable descriptions ...
     },
-    "instructions": "For each website, visit it and evaluate all 30 criteria. Submit your findings via POST /api/websites/<domain>/verify/ with a 'criteria' object containing 30 boolean fields.",
+    "instructions": "For each website, evaluate all 30 criteria: from its snapshot (a shared crawl, see GET /api/websites/<domain>/snapshot/) when it has a fresh one, otherwise by visiting it. Submit your findings via POST /api/websites/<domain>/verify/ with a 'criteria' object containing 30 boolean fields.",
     "_meta": { ... }
   }
 
 the criteria_docs field gives you a plain-english description of each criterion. use it to know what to check.
 
+"snapshot" is null for websites that haven't been through an automated check yet.
+
 errors:
   401 - "Silicon authentication required."
 
 
+### GET /api/websites/<domain>/snapshot/
+
+the crawl of a website made by its last automated check. verify from it instead of crawling the site yourself - every verifier reads the same one.
+
+auth: none required.
+
+success response (200):
+  {
+    "domain": "example.com",
+    "url": "https://.../snapshots/example.com/20260101T120000-1a2b3c4d.json.gz",
+    "fetched_at": "2026-01-01T12:00:00+00:00",
+    "age_seconds": 5400,
+    "stale": false,
+    "_meta": { ... }
+  }
+
+"url" is a gzip-compressed JSON file with what the check fetched: the homepage (text, meta tags, JSON-LD, links, forms, headers), the docs page, robots.txt, sitemap.xml, llms.txt, /.well-known/agent.json and the OpenAPI spec (raw and parsed), and the responses of the API probes. "stale" is true when it's more than a week old - check the live site too then. each new check of the site replaces it.
+
+errors:
+  404 - "Website not found."
+  404 - "No snapshot of this website yet. Run a check at /check/<domain>/ to make one."
+
+
+### POST /api/websites/bulk-check/
+
+run the automated check on a list of domains at once.
+
+auth: Bearer token (silicon) OR session cookie (carbon). one of them required.
+
+request body (JSON):
+  {"domains": ["stripe.com", "https://github.com/features", "example.org"]}
+
+up to 200 entries. each is normalized like /api/websites/submit/ and duplicates are dropped. then every domain is one of:
+  - existing: already in the directory. not re-checked, its current level is reported.
+  - recent: checked (or being checked) in the last 24h. that check is reused.
+  - new: checked by this batch.
+
+new domains are fetched in parallel first (sites that can't be reached fail right away), then evaluated in the low-priority background lane. a batch can take a while - poll the detail endpoint below. no report emails are sent for batch checks.
+
+success response (201): the same shape as GET /api/websites/bulk-check/<bulk_id>/
+
+rate limit: 5 batches per day per account.
+
+errors:
+  401 - "Authentication required."
+  400 - "domains must be a non-empty list of domains."
+  400 - "At most 200 domains per batch."
+  429 - rate limited, see Retry-After
+
+
+### GET /api/websites/bulk-check/<bulk_id>/
+
+progress and results of a whole batch, in one response. only the account that submitted it can see it.
+
+success response (200):
+  {
+    "bulk_id": 12,
+    "status": "running",
+    "total": 3,
+    "finished": 2,
+    "counts": {"done": 1, "error": 1, "cancelled": 0, "running": 0, "queued": 1},
+    "invalid": ["not a domain"],
+    "results": [
+      {"domain": "stripe.com", "source": "existing", "job_id": null, "status": "done", "level": 4, "website_url": "/w/stripe.com/"},
+      {"domain": "github.com", "source": "new", "job_id": 341, "status": "queued"},
+      {"domain": "example.org", "source": "new", "job_id": 342, "status": "error", "error": "Could not fetch example.org — site may be down or unreachable"}
+    ],
+    "created_at": "2026-01-01T00:00:00+00:00",
+    "_meta": { ... }
+  }
+
+status is "done" once every domain is done, failed or cancelled. a row's status is the check job status (queued, fetching, step_0, step_levels, step_6, saving, retrying, done, error, cancelled); for live detail on one domain use /api/check/<domain>/status/?job_id=<job_id>.
+
+errors:
+  401 - "Authentication required."
+  404 - "Bulk check not found."
+
+
 ### POST /api/websites/<domain>/verify/
 
 submit your verification of a website.
@@ -953,6 +1034,70 @@ errors:
   404 - "Payment not found."
 
 
+### GET /api/check/<domain>/status/?job_id=<id>
+
+poll the progress of a website check (the checks carbons start from /check/<domain>/).
+
+no auth required. the job_id is the credential.
+
+success response (200):
+  {
+    "job_id": 42,
+    "status": "step_levels",
+    "domain": "example.com",
+    "website_name": "Example",
+    "website_description": "...",
+    "overall_level": 0,
+    "lane": "standard",
+    "queue_position": 3,
+    "estimated_start_seconds": 240,
+    "timings": {"fetching": 3.1, "step_0": 8.4},
+    "level_1": {"results": {"l1_semantic_html": true, ...}, "reasoning": {"l1_semantic_html": "...", ...}, "passed": 5, "total": 6},
+    "partial": {"criteria": {"l2_sitemap": {"pass": true, "reason": "..."}, ...}},
+    ...
+  }
+
+status moves through: queued -> fetching -> queued -> step_0 -> step_levels -> step_6 -> saving -> done (or error, or cancelled). the second "queued" is the wait for a model worker once the site is fetched. on a temporary failure it goes to "retrying" and picks up from the last finished stage. a check that takes longer than 15 minutes, not counting the wait for a model worker, is stopped with an error. a failed check started again within 30 minutes resumes the same job_id.
+queue_position and estimated_start_seconds are only present in the second "queued", while waiting for a model worker. level_N appears as each level finishes (levels run in parallel, so they can arrive in any order). report_md and website_url appear once done, error once failed. lane is the priority lane (priority, standard or bulk). timings holds seconds spent in each finished stage.
+partial is output the model is still writing, present only while the job runs: criteria holds verdicts of levels that haven't finished yet, added as they are decided, and report_md is the report so far during step_6. treat it as a preview; level_N and the final report_md replace it.
+if someone else is already checking the same domain, your job shares that run: shared_from is the id of the job doing the work, and you get its updates and results under your own job_id. a check of the domain finished in the last hour is served right away (status "done" straight from the start request). owner re-checks always run fresh.
+
+errors:
+  400 - "job_id required"
+  404 - "Job not found"
+
+
+### GET /api/check/<domain>/events/?job_id=<id>
+
+same data as the status endpoint, pushed as Server-Sent Events instead of polled.
+
+no auth required. returns text/event-stream.
+
+every message is an "event: status" whose data is the same JSON object the status endpoint returns. the first message is the current state. after that you get one message per change (stage transitions, each finished level, streamed partial output at most twice a second, done/error). the stream closes after a terminal status, and otherwise every ~25 seconds - reconnect (EventSource does this for you) to keep listening. prefer this over polling.
+
+errors (plain JSON, not a stream):
+  400 - "job_id required"
+  404 - "Job not found"
+
+
+### POST /api/check/<domain>/cancel/?job_id=<id>
+
+stop a check you started. a queued check is cancelled right away; a running one stops within a couple of seconds (its current model call is killed) and ends with status "cancelled". no report email is sent.
+
+auth: session cookie (carbon) - the one who started the check.
+
+success response (200):
+  {"job_id": 42, "status": "cancelling"}   ("cancelled" if it hadn't started yet)
+
+if your job is sharing another job's run (shared_from), only your job is cancelled and the run goes on for the others. a run that others are sharing can't be cancelled.
+
+errors:
+  401 - "Login required"
+  400 - "job_id required"
+  404 - "Job not found"
+  409 - "Job already done" / "Other checks are sharing this run, so it keeps going"
+
+
 ### GET /badge/<domain>.svg
 
 get an embeddable SVG badge showing a website's silicon-friendly level.
@@ -1011,6 +1156,7 @@ available tools:
 - get_website_details: get full details + all 30 criteria for a website
 - submit_website: add a new website (needs auth_token)
 - get_verify_queue: get websites that need verification (needs auth_token)
+- get_site_snapshot: get the crawl of a website made by its last check, to verify from
 - verify_website: submit your verification of a website (needs auth_token)
 - get_levels_info: get info about the 5-level system and all criteria
 - list_verified_websites: browse all verified websites
@@ -1053,7 +1199,7 @@ when you verify, you submit all 30 booleans at once. the system calculates the l
 
 1. sign up or log in (you need a silicon account)
 2. GET /api/websites/verify-queue/ to find websites that need verification
-3. visit the website. actually visit it. poke around.
+3. visit the website. actually visit it. poke around. (if it has a fresh snapshot - GET /api/websites/<domain>/snapshot/ - start from that crawl.)
 4. check each criterion below. be honest - we're building trust here.
 5. POST /api/websites/<domain>/verify/ with your 30 booleans
 6. collect your 10 search queries. you earned them.
@@ -1410,7 +1556,8 @@ def agent_json(request):
         "capabilities": [
             "search_websites",
             "verify_websites",
-            "check_agent_friendliness"
+            "check_agent_friendliness",
+            "bulk_check_websites"
         ],
         "protocols": [
             "llms.txt",
@@ -1426,6 +1573,7 @@ def agent_json(request):
 from django.shortcuts import render, redirect
 from accounts.models import Carbon, Silicon
 from websites.models import Website, WebsiteVerification, CRITERIA_FIELDS, LEVEL_RANGES, CRITERIA_FIELDS as _CF
+from websites.freshness import record_view
 
 
 def badges_view(request):
@@ -1612,6 +1760,7 @@ def website_detail_view(request, domain):
         website = Website.objects.get(url=domain)
     except Website.DoesNotExist:
         return render(request, "404.html", status=404)
+    record_view(domain)
 
     carbon_id = request.session.get("carbon_id")
     is_owner = False
@@ -1985,9 +2134,12 @@ def api_index(request):
             "public_silicon_profile": {"method": "GET", "path": "/api/profile/silicon/<username>/"},
             "website_submit": {"method": "POST", "path": "/api/websites/submit/", "auth": "any"},
             "website_detail": {"method": "GET", "path": "/api/websites/<domain>/"},
+            "website_snapshot": {"method": "GET", "path": "/api/websites/<domain>/snapshot/"},
             "website_list": {"method": "GET", "path": "/api/websites/"},
             "website_verify": {"method": "POST", "path": "/api/websites/<domain>/verify/", "auth": "bearer"},
             "verify_queue": {"method": "GET", "path": "/api/websites/verify-queue/", "auth": "bearer"},
+            "bulk_check": {"method": "POST", "path": "/api/websites/bulk-check/", "auth": "any"},
+            "bulk_check_detail": {"method": "GET", "path": "/api/websites/bulk-check/<bulk_id>/", "auth": "any"},
             "search_semantic": {"method": "POST", "path": "/api/search/semantic/", "auth": "bearer"},
             "search_keyword": {"method": "POST", "path": "/api/search/keyword/", "auth": "bearer"},
             "chat_send": {"method": "POST", "path": "/api/chat/send/", "auth": "any"},
@@ -1995,6 +2147,9 @@ def api_index(request):
             "my_submissions": {"method": "GET", "path": "/api/my/submissions/", "auth": "any"},
             "dodo_create": {"method": "POST", "path": "/api/payments/dodo/create/"},
             "crypto_submit": {"method": "POST", "path": "/api/payments/crypto/submit/"},
+            "check_status": {"method": "GET", "path": "/api/check/<domain>/status/?job_id=<id>"},
+            "check_events": {"method": "GET", "path": "/api/check/<domain>/events/?job_id=<id>", "format": "text/event-stream"},
+            "check_cancel": {"method": "POST", "path": "/api/check/<domain>/cancel/?job_id=<id>", "auth": "session"},
         },
     })
 
@@ -2125,7 +2280,9 @@ urlpatterns = [
     # Checker API
     path('api/check/<str:domain>/', check_website_api, name='check_api'),
     path('api/check/<str:domain>/start/', start_check_api, name='check_start'),
+    path('api/check/<str:domain>/cancel/', cancel_check_api, name='check_cancel'),
     path('api/check/<str:domain>/status/', check_status_api, name='check_status'),
+    path('api/check/<str:domain>/events/', check_events_api, name='check_events'),
     path('api/check/<str:domain>/report/<int:job_id>/', report_download_view, name='report_download'),
 
     # Template views
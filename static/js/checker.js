@@ -1,4 +1,4 @@
-// Checker.js — Polling-based checker with suspenseful reveal
+// Checker.js — Live checker (SSE with polling fallback) with suspenseful reveal
 
 const LEVEL_NAMES = {
     1: 'Basic Accessibility',
@@ -45,6 +45,7 @@ const STATUS_MESSAGES = {
     'queued': 'waiting in queue...',
     'fetching': 'fetching website data...',
     'step_0': 'analyzing website...',
+    'step_levels': 'checking levels 1-5...',
     'step_1': 'checking level 1 — basic accessibility...',
     'step_2': 'checking level 2 — discoverability...',
     'step_3': 'checking level 3 — structured interaction...',
@@ -52,10 +53,13 @@ const STATUS_MESSAGES = {
     'step_5': 'checking level 5 — autonomous operation...',
     'step_6': 'generating report...',
     'saving': 'saving results...',
+    'retrying': 'hit a temporary error, retrying shortly...',
+    'cancelled': 'check cancelled.',
 };
 
 var jobId = null;
 var pollInterval = null;
+var eventSource = null;
 var renderedLevels = {};
 var animatingLevel = false;
 var pendingLevels = [];
@@ -87,81 +91,182 @@ function startCheck() {
             return;
         }
         jobId = data.job_id;
-        pollInterval = setInterval(pollStatus, 3000);
-        pollStatus();
+        showCancel(true);
+        watchJob();
     })
     .catch(function() {
         showError('Could not start check. Please try again.');
     });
 }
 
-function pollStatus() {
-    if (!jobId) return;
+function watchJob() {
+    // Prefer the server-sent event stream; fall back to polling every 3s
+    if (!window.EventSource) {
+        startPolling();
+        return;
+    }
+    eventSource = new EventSource('/api/check/' + encodeURIComponent(DOMAIN) + '/events/?job_id=' + jobId);
+    eventSource.addEventListener('status', function(e) {
+        handleStatus(JSON.parse(e.data));
+    });
+    eventSource.onerror = function() {
+        // The server ends each stream after a while and EventSource reconnects
+        // by itself. Only give up on it if the browser has closed it for good.
+        if (eventSource && eventSource.readyState === EventSource.CLOSED) {
+            eventSource = null;
+            startPolling();
+        }
+    };
+}
 
-    fetch('/api/check/' + encodeURIComponent(DOMAIN) + '/status/?job_id=' + jobId)
+function showCancel(show) {
+    document.querySelectorAll('.cancel-check').forEach(function(el) {
+        el.style.display = show ? 'block' : 'none';
+    });
+}
+
+function cancelCheck(e) {
+    e.preventDefault();
+    if (!jobId) return;
+    fetch('/api/check/' + encodeURIComponent(DOMAIN) + '/cancel/?job_id=' + jobId, {
+        method: 'POST',
+        headers: { 'X-CSRFToken': getCsrfToken() },
+    })
     .then(function(res) { return res.json(); })
     .then(function(data) {
-        if (data.error && data.status === undefined) {
-            showError(data.error);
-            clearInterval(pollInterval);
+        if (data.error) {
+            showCancel(false);
+            var stepEl = document.getElementById('current-step-text');
+            if (stepEl) stepEl.textContent = data.error.toLowerCase() + '.';
             return;
         }
+        // The status stream reports "cancelled" once the worker has stopped
+        if (data.status === 'cancelled') handleStatus({ status: 'cancelled' });
+    })
+    .catch(function() {});
+}
 
-        allData = data;
+function startPolling() {
+    if (pollInterval) return;
+    pollInterval = setInterval(pollStatus, 3000);
+    pollStatus();
+}
 
-        // Update step text
-        var stepText = STATUS_MESSAGES[data.status] || data.status;
-        var stepEl = document.getElementById('current-step-text');
-        if (stepEl) stepEl.textContent = stepText;
-
-        // Queue position
-        var queueEl = document.getElementById('queue-status');
-        var queuePosEl = document.getElementById('queue-position');
-        if (data.status === 'queued' && data.queue_position && queueEl) {
-            queueEl.style.display = 'block';
-            if (queuePosEl) queuePosEl.textContent = data.queue_position;
-        } else if (queueEl) {
-            queueEl.style.display = 'none';
-        }
+function stopWatching() {
+    if (eventSource) {
+        eventSource.close();
+        eventSource = null;
+    }
+    clearInterval(pollInterval);
+    pollInterval = null;
+}
+
+function pollStatus() {
+    if (!jobId) return;
+
+    fetch('/api/check/' + encodeURIComponent(DOMAIN) + '/status/?job_id=' + jobId)
+    .then(function(res) { return res.json(); })
+    .then(handleStatus)
+    .catch(function() {});
+}
+
+function handleStatus(data) {
+    if (data.error && data.status === undefined) {
+        showError(data.error);
+        stopWatching();
+        return;
+    }
 
-        // Show level results section once past intro
-        if (data.status !== 'queued' && data.status !== 'fetching' && data.status !== 'step_0') {
-            var intro = document.getElementById('checker-intro');
-            var results = document.getElementById('level-results');
-            if (intro) intro.style.display = 'none';
-            if (results) results.style.display = 'block';
+    allData = data;
+
+    // Update step text
+    var stepText = STATUS_MESSAGES[data.status] || data.status;
+    var stepEl = document.getElementById('current-step-text');
+    if (stepEl) stepEl.textContent = stepText;
+
+    // Queue position
+    var queueEl = document.getElementById('queue-status');
+    var queuePosEl = document.getElementById('queue-position');
+    if (data.status === 'queued' && data.queue_position && queueEl) {
+        queueEl.style.display = 'block';
+        if (queuePosEl) queuePosEl.textContent = data.queue_position;
+        var queueEtaEl = document.getElementById('queue-eta');
+        if (queueEtaEl) {
+            var eta = data.estimated_start_seconds;
+            queueEtaEl.textContent = eta ? ' — starts in about ' + Math.max(1, Math.round(eta / 60)) + ' min' : '';
         }
+    } else if (queueEl) {
+        queueEl.style.display = 'none';
+    }
 
-        // Queue up completed levels for animated reveal
-        for (var l = 1; l <= 5; l++) {
-            if (data['level_' + l] && !renderedLevels[l]) {
-                renderedLevels[l] = true;
-                pendingLevels.push({ level: l, data: data['level_' + l] });
-            }
+    // Show level results section once past intro
+    if (data.status !== 'queued' && data.status !== 'fetching' && data.status !== 'step_0') {
+        var intro = document.getElementById('checker-intro');
+        var results = document.getElementById('level-results');
+        if (intro) intro.style.display = 'none';
+        if (results) results.style.display = 'block';
+    }
+
+    // Queue up completed levels for animated reveal. Levels are checked
+    // in parallel and can finish in any order, so reveal them in order.
+    for (var l = 1; l <= 5; l++) {
+        if (!data['level_' + l]) break;
+        if (!renderedLevels[l]) {
+            renderedLevels[l] = true;
+            pendingLevels.push({ level: l, data: data['level_' + l] });
         }
-        processNextLevel();
-
-        // Done — redirect to website page
-        if (data.status === 'done') {
-            clearInterval(pollInterval);
-            // Wait for any remaining animations then redirect
-            var checkRedirect = setInterval(function() {
-                if (!animatingLevel && pendingLevels.length === 0) {
-                    clearInterval(checkRedirect);
-                    if (data.website_url) {
-                        setTimeout(function() { window.location.href = data.website_url; }, 1500);
-                    }
+    }
+    processNextLevel();
+
+    showPartial(data);
+
+    // Done — redirect to website page
+    if (data.status === 'done') {
+        stopWatching();
+        // Wait for any remaining animations then redirect
+        var checkRedirect = setInterval(function() {
+            if (!animatingLevel && pendingLevels.length === 0) {
+                clearInterval(checkRedirect);
+                if (data.website_url) {
+                    setTimeout(function() { window.location.href = data.website_url; }, 1500);
                 }
-            }, 500);
-        }
+            }
+        }, 500);
+    }
 
-        // Error
-        if (data.status === 'error') {
-            clearInterval(pollInterval);
-            showError(data.error || 'Check failed.');
-        }
-    })
-    .catch(function() {});
+    if (data.status === 'done' || data.status === 'error' || data.status === 'cancelled') {
+        showCancel(false);
+    }
+
+    // Error
+    if (data.status === 'error') {
+        stopWatching();
+        showError(data.error || 'Check failed.');
+    }
+
+    if (data.status === 'cancelled') {
+        stopWatching();
+        showError('check cancelled. no report will be sent.');
+    }
+}
+
+// Output the model is still writing: criterion verdicts so far, and the report
+function showPartial(data) {
+    var partial = data.status === 'done' ? null : data.partial;
+    var criteria = partial && partial.criteria ? Object.keys(partial.criteria).length : 0;
+    if (criteria && data.status === 'step_levels' && !animatingLevel) {
+        var stepEl = document.getElementById('current-step-text');
+        if (stepEl) stepEl.textContent = 'checking levels 1-5... ' + criteria + ' criteria decided so far';
+    }
+
+    var preview = document.getElementById('report-preview');
+    if (!preview) return;
+    if (partial && partial.report_md) {
+        preview.style.display = 'block';
+        document.getElementById('report-preview-content').textContent = partial.report_md;
+    } else {
+        preview.style.display = 'none';
+    }
 }
 
 function processNextLevel() {
@@ -276,6 +381,9 @@ function showError(message) {
 }
 
 document.addEventListener('DOMContentLoaded', function() {
+    document.querySelectorAll('.cancel-check a').forEach(function(el) {
+        el.addEventListener('click', cancelCheck);
+    });
     if (IS_LOGGED_IN) {
         startCheck();
     }
@@ -0,0 +1,112 @@
+"""Bulk check submissions.
+
+create_bulk_check() takes a list of domains and sorts each one into:
+  "existing" - already a Website; nothing is run, its current level is reported
+  "recent"   - checked (or being checked) in the last RECENT_JOB_WINDOW; that job is reused
+  "new"      - a CheckJob in the bulk lane, tied to the batch
+
+The new jobs' sites are fetched side by side by websites.tasks.prefetch_bulk_check,
+which stores each snapshot on its job and only then queues the evaluation, so
+the check workers never wait on slow sites and dead ones never reach the LLM.
+bulk_progress() is the one progress/result view of the whole batch.
+"""
+from datetime import timedelta
+from django.utils import timezone
+from websites.views import _normalize_url
+
+BULK_MAX_DOMAINS = 200
+# Sites fetched at once by prefetch_bulk_check
+BULK_PREFETCH_WORKERS = 8
+RECENT_JOB_WINDOW = timedelta(hours=24)
+DOMAIN_CHARS = set("abcdefghijklmnopqrstuvwxyz0123456789-.")
+
+
+def _valid_domain(domain):
+    return "." in domain and len(domain) <= 255 and set(domain) <= DOMAIN_CHARS
+
+
+def create_bulk_check(domains, carbon=None, silicon=None):
+    """Create the BulkCheck and its new CheckJobs. Doesn't start anything."""
+    from websites.models import BulkCheck, CheckJob, Website
+
+    seen, invalid = [], []
+    for raw in domains:
+        domain = _normalize_url(str(raw))
+        if not _valid_domain(domain):
+            invalid.append(str(raw)[:255])
+        elif domain not in seen:
+            seen.append(domain)
+
+    existing = set(Website.objects.filter(url__in=seen).values_list("url", flat=True))
+    recent = {}
+    for job_id, domain in (
+        CheckJob.objects.filter(domain__in=seen, created_at__gte=timezone.now() - RECENT_JOB_WINDOW)
+        .exclude(status__in=("error", "cancelled")).order_by("created_at").values_list("id", "domain")
+    ):
+        recent[domain] = job_id  # newest wins
+
+    bulk = BulkCheck.objects.create(carbon=carbon, silicon=silicon, invalid=invalid)
+    items = []
+    for domain in seen:
+        if domain in recent:
+            items.append({"domain": domain, "source": "recent", "job_id": recent[domain]})
+        elif domain in existing:
+            items.append({"domain": domain, "source": "existing", "job_id": None})
+        else:
+            job = CheckJob.objects.create(domain=domain, lane="bulk", trigger="bulk", bulk=bulk)
+            items.append({"domain": domain, "source": "new", "job_id": job.id})
+    bulk.items = items
+    bulk.save(update_fields=["items"])
+    return bulk
+
+
+def bulk_progress(bulk):
+    """Aggregate status plus one result row per domain."""
+    from websites.models import CheckJob, Website
+
+    job_ids = [item["job_id"] for item in bulk.items if item["job_id"]]
+    jobs = {
+        job["id"]: job for job in CheckJob.objects.filter(id__in=job_ids).values(
+            "id", "status", "overall_level", "error_message",
+        )
+    }
+    levels = {
+        w.url: w.level for w in Website.objects.filter(
+            url__in=[item["domain"] for item in bulk.items if item["source"] == "existing"],
+        )
+    }
+
+    counts = {"done": 0, "error": 0, "cancelled": 0, "running": 0, "queued": 0}
+    results = []
+    for item in bulk.items:
+        row = {"domain": item["domain"], "source": item["source"], "job_id": item["job_id"]}
+        if item["source"] == "existing":
+            row.update(status="done", level=levels.get(item["domain"]))
+        else:
+            job = jobs.get(item["job_id"])
+            status = job["status"] if job else "error"
+            row["status"] = status
+            if status == "done":
+                row["level"] = job["overall_level"]
+            elif status == "error":
+                row["error"] = job["error_message"][:300] if job else "Check job no longer exists."
+        if row["status"] == "done":
+            row["website_url"] = f"/w/{item['domain']}/"
+            counts["done"] += 1
+        elif row["status"] in ("error", "cancelled", "queued"):
+            counts[row["status"]] += 1
+        else:
+            counts["running"] += 1
+        results.append(row)
+
+    finished = counts["done"] + counts["error"] + counts["cancelled"]
+    return {
+        "bulk_id": bulk.id,
+        "status": "done" if finished == len(results) else "running",
+        "total": len(results),
+        "finished": finished,
+        "counts": counts,
+        "invalid": bulk.invalid,
+        "results": results,
+        "created_at": bulk.created_at.isoformat(),
+    }
@@ -0,0 +1,76 @@
+"""Cancellation and deadlines for running checks.
+
+request_cancel() sets a flag in Redis. The worker's JobControl looks at it
+(at most once every CANCEL_POLL_SECONDS) between stages, while waiting for a
+Claude slot and while an LLM call runs; the call is killed, its slot freed,
+and the job ends as "cancelled". The same control enforces the job's
+deadline (CheckJob.deadline_at: CHECK_DEADLINE_SECONDS from when a worker
+first picked it up, across all its stages and retries; time spent in line
+for an LLM worker doesn't count), which fails the job instead.
+"""
+import time
+from django.utils import timezone
+from common.redis_client import get_redis
+from websites.live import STATE_TTL
+
+CHECK_DEADLINE_SECONDS = 15 * 60
+CANCEL_POLL_SECONDS = 1
+
+
+class CheckCancelled(Exception):
+    """The job was cancelled while it ran."""
+
+
+class CheckDeadlineExceeded(Exception):
+    """The check went past its deadline."""
+
+
+def _cancel_key(job_id):
+    return f"checkjob:{job_id}:cancel"
+
+
+def request_cancel(job_id):
+    get_redis().set(_cancel_key(job_id), 1, ex=STATE_TTL)
+
+
+def cancel_requested(job_id):
+    return bool(get_redis().exists(_cancel_key(job_id)))
+
+
+class JobControl:
+    """Passed down a check run; answers "should this run stop now?"."""
+
+    def __init__(self, job_id, deadline_at=None):
+        self.job_id = job_id
+        remaining = (deadline_at - timezone.now()).total_seconds() if deadline_at else CHECK_DEADLINE_SECONDS
+        self.deadline = time.monotonic() + remaining
+        self._cancelled = False
+        self._polled = 0
+
+    def cancelled(self):
+        if not self._cancelled and time.monotonic() - self._polled >= CANCEL_POLL_SECONDS:
+            self._polled = time.monotonic()
+            self._cancelled = cancel_requested(self.job_id)
+        return self._cancelled
+
+    def should_stop(self):
+        return self.cancelled() or time.monotonic() > self.deadline
+
+    def check(self):
+        """Raise if the run should stop."""
+        if self.cancelled():
+            raise CheckCancelled(f"CheckJob {self.job_id} was cancelled")
+        if time.monotonic() > self.deadline:
+            raise CheckDeadlineExceeded(f"Check took longer than {CHECK_DEADLINE_SECONDS // 60} minutes")
+
+    def stopped(self):
+        """The exception for a call that should_stop() stopped.
+
+        A stop that was neither past the deadline nor is still cancelled
+        (the flag was cleared since) counts as a cancel.
+        """
+        try:
+            self.check()
+        except (CheckCancelled, CheckDeadlineExceeded) as e:
+            return e
+        return CheckCancelled(f"CheckJob {self.job_id} was cancelled")
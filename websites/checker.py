@@ -1,6 +1,9 @@
+import json
+import logging
 import re
+import time
 from datetime import timedelta
-from django.http import JsonResponse, HttpResponse
+from django.http import JsonResponse, HttpResponse, StreamingHttpResponse
 from django.shortcuts import render
 from django.utils import timezone
 from django.views.decorators.csrf import csrf_exempt
@@ -8,6 +11,12 @@ from django.views.decorators.http import require_http_methods
 from common.ratelimit import check_rate_limit, get_client_ip
 from accounts.models import Carbon
 
+logger = logging.getLogger(__name__)
+
+SSE_MAX_SECONDS = 25
+SSE_KEEPALIVE_SECONDS = 10
+SSE_RETRY_MS = 1000
+
 
 def _normalize_domain(domain):
     """Strip protocol, path, trailing slash -> domain only."""
@@ -18,6 +27,29 @@ def _normalize_domain(domain):
     return domain
 
 
+def _check_lane(carbon, domain):
+    """The lane a check of `domain` started by `carbon` goes in, or None if they can't start one.
+
+    Anyone can check a site that isn't listed yet. A listed site can only be
+    re-checked by its owner: the first time for free, then with a paid
+    verification left.
+    """
+    from websites.models import Website, CheckJob
+
+    existing = Website.objects.filter(url=domain).first()
+    if existing is None:
+        return "standard"
+    if existing.submitted_by_carbon_id != carbon.id:
+        return None
+    from payments.models import PaymentRequest, remaining_verification_requests
+    active_payment = PaymentRequest.objects.filter(website=existing, status="completed").order_by("-created_at").first()
+    has_free = not CheckJob.objects.filter(domain=domain, carbon=carbon, status="done").exists()
+    if not has_free and (not active_payment or remaining_verification_requests(active_payment) <= 0):
+        return None
+    # Paid and owner re-checks jump ahead of first-time checks
+    return "priority"
+
+
 def check_page_view(request, domain):
     """Render the check page with auth context."""
     from websites.views import _normalize_url
@@ -40,6 +72,12 @@ def check_page_view(request, domain):
             show_end = at_domain[-2:]
             obfuscated_email = show_start + "*****" + show_end
 
+    # Start fetching the site now, so a check started from this page skips
+    # that wait; only for visitors who could start one
+    from websites.speculative import request_prefetch
+    if carbon and _check_lane(carbon, domain):
+        request_prefetch(domain, f"carbon:{carbon.id}")
+
     return render(request, "check.html", {
         "domain": domain,
         "obfuscated_email": obfuscated_email,
@@ -57,8 +95,8 @@ def check_website_api(request, domain):
 @require_http_methods(["POST"])
 def start_check_api(request, domain):
     """Start a check job. Requires auth. Returns existing website if already checked."""
-    from websites.models import Website, CheckJob
-    from websites.tasks import run_website_check
+    from websites.models import CheckJob
+    from websites.singleflight import start_check
 
     carbon_id = request.session.get("carbon_id")
     if not carbon_id:
@@ -76,19 +114,9 @@ def start_check_api(request, domain):
     # Check if website already exists in DB
     # If it exists and the user is NOT the owner, redirect to the page
     # If it exists and the user IS the owner, allow re-check (reverification)
-    try:
-        existing = Website.objects.get(url=domain)
-        is_owner = existing.submitted_by_carbon_id == carbon.id
-        if not is_owner:
-            return JsonResponse({"exists": True, "url": f"/w/{domain}/"})
-        # Owner can re-check — check if they have paid verifications remaining
-        from payments.models import PaymentRequest, remaining_verification_requests
-        active_payment = PaymentRequest.objects.filter(website=existing, status="completed").order_by("-created_at").first()
-        has_free = not CheckJob.objects.filter(domain=domain, carbon=carbon, status="done").exists()
-        if not has_free and (not active_payment or remaining_verification_requests(active_payment) <= 0):
-            return JsonResponse({"exists": True, "url": f"/w/{domain}/"})
-    except Website.DoesNotExist:
-        pass
+    lane = _check_lane(carbon, domain)
+    if lane is None:
+        return JsonResponse({"exists": True, "url": f"/w/{domain}/"})
 
     # Rate limit: 5 checks per hour per carbon
     ip = get_client_ip(request)
@@ -100,83 +128,187 @@ def start_check_api(request, domain):
     recent = CheckJob.objects.filter(
         domain=domain, carbon=carbon,
         created_at__gte=timezone.now() - timedelta(minutes=30),
-    ).exclude(status="error").order_by("-created_at").first()
+    ).exclude(status__in=("error", "cancelled")).order_by("-created_at").first()
 
     if recent:
         return JsonResponse({"job_id": recent.id, "status": recent.status})
 
-    # Create new job
-    job = CheckJob.objects.create(domain=domain, carbon=carbon)
-    run_website_check.delay(job.id)
+    # A recent failed job picks up from its last checkpoint instead of starting over
+    failed = CheckJob.objects.filter(
+        domain=domain, carbon=carbon, status="error",
+        created_at__gte=timezone.now() - timedelta(minutes=30),
+    ).order_by("-created_at").first()
+    if failed:
+        from websites.tasks import resume_check
+        resume_check(failed)
+        return JsonResponse({"job_id": failed.id, "status": "queued"})
+
+    # Create new job. It's served from a fresh result or attached to a
+    # running check of the same domain when there is one (websites.singleflight)
+    job = CheckJob.objects.create(domain=domain, carbon=carbon, lane=lane)
+    start_check(job)
 
-    return JsonResponse({"job_id": job.id, "status": "queued"})
+    return JsonResponse({"job_id": job.id, "status": job.status})
 
 
 @csrf_exempt
-@require_http_methods(["GET"])
-def check_status_api(request, domain):
-    """Poll check job status."""
+@require_http_methods(["POST"])
+def cancel_check_api(request, domain):
+    """Cancel a check job. Only the carbon who started it can."""
     from websites.models import CheckJob
+    from websites.tasks import cancel_check
+
+    carbon_id = request.session.get("carbon_id")
+    if not carbon_id:
+        return JsonResponse({"error": "Login required"}, status=401)
 
     job_id = request.GET.get("job_id")
     if not job_id:
         return JsonResponse({"error": "job_id required"}, status=400)
 
     try:
-        job = CheckJob.objects.get(id=job_id)
-    except CheckJob.DoesNotExist:
+        job = CheckJob.objects.get(id=job_id, domain=_normalize_domain(domain), carbon_id=carbon_id)
+    except (CheckJob.DoesNotExist, ValueError):
         return JsonResponse({"error": "Job not found"}, status=404)
 
-    response = {
-        "job_id": job.id,
-        "status": job.status,
-        "domain": job.domain,
-        "website_name": job.website_name,
-        "website_description": job.website_description,
-        "overall_level": job.overall_level,
-    }
-
-    # Queue position
-    if job.status == "queued":
-        ahead = CheckJob.objects.filter(
-            status="queued", created_at__lt=job.created_at
-        ).count()
-        response["queue_position"] = ahead + 1
-
-    # Include completed level results
-    for level in range(1, 6):
-        results = getattr(job, f"level_{level}_results")
-        reasoning = getattr(job, f"level_{level}_reasoning")
-        if results is not None:
-            response[f"level_{level}"] = {
-                "results": results,
-                "reasoning": reasoning or {},
-                "passed": sum(1 for v in results.values() if v),
-                "total": len(results),
-            }
-
-    if job.status == "done":
-        response["report_md"] = job.report_md
-        if job.website:
-            response["website_url"] = f"/w/{job.domain}/"
-
-    if job.status == "error":
-        response["error"] = job.error_message
+    if not cancel_check(job):
+        if job.status in ("done", "error", "cancelled"):
+            return JsonResponse({"error": f"Job already {job.status}"}, status=409)
+        return JsonResponse({"error": "Other checks are sharing this run, so it keeps going"}, status=409)
+
+    return JsonResponse({"job_id": job.id, "status": "cancelled" if job.status == "cancelled" else "cancelling"})
+
+
+@csrf_exempt
+@require_http_methods(["GET"])
+def check_status_api(request, domain):
+    """Poll check job status. Fallback for clients that can't use the event stream."""
+    from websites.live import job_state
+
+    job_id = request.GET.get("job_id")
+    if not job_id:
+        return JsonResponse({"error": "job_id required"}, status=400)
 
+    response = job_state(job_id)
+    if response is None:
+        return JsonResponse({"error": "Job not found"}, status=404)
+
+    _add_queue_position(response)
     return JsonResponse(response)
 
 
+@require_http_methods(["GET"])
+def check_events_api(request, domain):
+    """Server-Sent Events stream of check job progress.
+
+    Sends the current state first, then every update the worker publishes.
+    Each connection lasts at most SSE_MAX_SECONDS so it doesn't pin a gunicorn
+    thread; EventSource reconnects on its own and gets a fresh snapshot.
+    """
+    from websites.live import job_channel, job_state, TERMINAL_STATUSES
+    from common.redis_client import get_redis
+
+    job_id = request.GET.get("job_id")
+    if not job_id:
+        return JsonResponse({"error": "job_id required"}, status=400)
+
+    if job_state(job_id) is None:
+        return JsonResponse({"error": "Job not found"}, status=404)
+
+    def stream():
+        pubsub = get_redis().pubsub(ignore_subscribe_messages=True)
+        # Subscribe before reading the snapshot so no update falls in between
+        pubsub.subscribe(job_channel(job_id))
+        try:
+            snapshot = job_state(job_id)
+            _add_queue_position(snapshot)
+            yield f"retry: {SSE_RETRY_MS}\nevent: status\ndata: {json.dumps(snapshot)}\n\n"
+            if snapshot["status"] in TERMINAL_STATUSES:
+                return
+
+            deadline = time.monotonic() + SSE_MAX_SECONDS
+            while time.monotonic() < deadline:
+                message = pubsub.get_message(timeout=SSE_KEEPALIVE_SECONDS)
+                if message is None:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"event: status\ndata: {message['data']}\n\n"
+                if json.loads(message["data"]).get("status") in TERMINAL_STATUSES:
+                    return
+        finally:
+            pubsub.close()
+
+    response = StreamingHttpResponse(stream(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+def _add_queue_position(state):
+    """Add queue position and start estimate for jobs still waiting."""
+    from websites.queues import queue_position, estimated_start_seconds
+    from websites.tasks import LLM_STAGES
+
+    if state["status"] != "queued":
+        return
+    # Jobs attached to another job's run wait in line as that job
+    position = queue_position(state.get("shared_from", state["job_id"]), state["lane"])
+    if position:
+        state["queue_position"] = position
+        state["estimated_start_seconds"] = estimated_start_seconds(position, LLM_STAGES)
+
+
 def report_download_view(request, domain, job_id):
-    """Download PDF report for a check job."""
+    """Download PDF report for a check job, from storage (websites.report_store)."""
+    from django.utils.http import parse_etags
+    from core.storage import read_file
     from websites.models import CheckJob
     from websites.report_pdf import generate_pdf
+    from websites.report_store import parse_range, render_and_store, stored_pdf
 
     try:
         job = CheckJob.objects.get(id=job_id, status="done")
     except CheckJob.DoesNotExist:
         return HttpResponse("Report not found", status=404)
 
-    pdf_bytes = generate_pdf(job)
-    response = HttpResponse(pdf_bytes, content_type="application/pdf")
+    # Rendered when the check finished; render now only if that's missing or outdated
+    record, pdf = stored_pdf(job), None
+    if not record:
+        record, pdf = render_and_store(job)
+    if record:
+        etag, size = record["etag"], record["size"]
+        inm = parse_etags(request.headers.get("If-None-Match", ""))
+        if etag in inm or "*" in inm:
+            response = HttpResponse(status=304)
+            response["ETag"] = etag
+            return response
+        # A Range is only honoured for the copy the client already has part of
+        if request.headers.get("If-Range", etag) != etag:
+            byte_range = None
+        else:
+            try:
+                byte_range = parse_range(request.headers.get("Range"), size)
+            except ValueError:
+                response = HttpResponse("Requested range not satisfiable", status=416)
+                response["Content-Range"] = f"bytes */{size}"
+                return response
+        try:
+            if byte_range:
+                start, end = byte_range
+                body = pdf[start:end + 1] if pdf else read_file(record["path"], start, end)
+            else:
+                body = pdf or read_file(record["path"])
+        except Exception as e:
+            logger.warning("Could not read the stored PDF of CheckJob %s: %s", job.id, e)
+            record, pdf = None, generate_pdf(job)
+
+    if record:
+        response = HttpResponse(body, content_type="application/pdf", status=206 if byte_range else 200)
+        if byte_range:
+            response["Content-Range"] = f"bytes {start}-{end}/{size}"
+        response["ETag"] = etag
+        response["Accept-Ranges"] = "bytes"
+    else:
+        response = HttpResponse(pdf, content_type="application/pdf")
     response["Content-Disposition"] = f'attachment; filename="siliconfriendly-{domain}-L{job.overall_level}.pdf"'
     return response
@@ -0,0 +1,282 @@
+"""Condense fetched HTML into the parts the checker prompts actually need.
+
+condense_page() makes one pass over a page and returns a plain dict (so it
+can be stored with the job snapshot): head metadata, JSON-LD, semantic tag
+counts, script sources, agent-related signals from inline scripts, link
+rels, nav links, forms and visible text. page_context() renders the sections
+a given prompt asks for, most important first, within a token budget.
+
+Raw HTML is mostly CSS and inline JS; this keeps the signal (including MCP
+and WebMCP hints buried deep in the page) in a fraction of the size.
+"""
+import re
+from html.parser import HTMLParser
+
+# Rough characters per token, for budgeting.
+CHARS_PER_TOKEN = 4
+SEMANTIC_TAGS = ("header", "nav", "main", "article", "section", "footer", "aside")
+# Content of these elements is never visible text.
+HIDDEN_TAGS = ("script", "style", "noscript", "svg", "template", "head")
+AGENT_SIGNAL_RE = re.compile(
+    r"webmcp|modelcontext|model-context|\bmcp\b|mcp[-_]server|\.well-known/|agent\.json|llms\.txt"
+    r"|openapi|swagger|graphql|websocket|eventsource|event-stream|webhook|api[-_]?key|oauth",
+    re.I,
+)
+MAX_JSON_LD_CHARS = 20000
+MAX_SIGNALS = 15
+MAX_LINKS = 80
+MAX_TEXT_CHARS = 40000
+
+
+class _Condenser(HTMLParser):
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.page = {
+            "html_chars": 0,
+            "lang": "",
+            "title": "",
+            "meta": {},
+            "link_rels": [],
+            "json_ld": [],
+            "has_microdata": False,
+            "semantic_counts": {},
+            "scripts": [],
+            "inline_scripts": 0,
+            "signals": [],
+            "nav_links": [],
+            "links": [],
+            "forms": [],
+        }
+        self._text = []
+        self._text_chars = 0
+        self._hidden = 0
+        self._nav = 0
+        self._anchor = None
+        self._script = None
+        self._in_title = False
+
+    def handle_starttag(self, tag, attrs):
+        attrs = {k: (v or "") for k, v in attrs}
+        page = self.page
+        if tag in HIDDEN_TAGS:
+            self._hidden += 1
+        if tag in SEMANTIC_TAGS:
+            page["semantic_counts"][tag] = page["semantic_counts"].get(tag, 0) + 1
+        if tag in ("nav", "header"):
+            self._nav += 1
+        if "schema.org" in attrs.get("itemtype", ""):
+            page["has_microdata"] = True
+        for value in attrs.values():
+            if value and AGENT_SIGNAL_RE.search(value) and tag not in ("script", "a", "link"):
+                self._signal(f"<{tag}> attribute: {value[:200]}")
+                break
+
+        if tag == "html":
+            page["lang"] = attrs.get("lang", "")
+        elif tag == "title":
+            self._in_title = True
+        elif tag == "meta":
+            key = (attrs.get("property") or attrs.get("name") or attrs.get("http-equiv") or "").strip().lower()
+            if key and attrs.get("content"):
+                page["meta"].setdefault(key, attrs["content"].strip()[:300])
+        elif tag == "link" and attrs.get("rel"):
+            page["link_rels"].append({k: attrs[k] for k in ("rel", "href", "type") if attrs.get(k)})
+        elif tag == "script":
+            if attrs.get("src"):
+                page["scripts"].append(attrs["src"])
+            self._script = {"type": attrs.get("type", "").strip().lower(), "buf": []}
+        elif tag == "a" and attrs.get("href"):
+            self._anchor = {"href": attrs["href"], "text": []}
+        elif tag == "form":
+            page["forms"].append({"action": attrs.get("action", ""), "method": attrs.get("method", "get").lower()})
+
+    def handle_endtag(self, tag):
+        if tag in HIDDEN_TAGS and self._hidden:
+            self._hidden -= 1
+        if tag in ("nav", "header") and self._nav:
+            self._nav -= 1
+        if tag == "title":
+            self._in_title = False
+        elif tag == "script" and self._script is not None:
+            self._end_script()
+        elif tag == "a" and self._anchor is not None:
+            self._end_anchor()
+
+    def handle_data(self, data):
+        if self._in_title:
+            self.page["title"] += data
+        if self._script is not None:
+            self._script["buf"].append(data)
+            return
+        if self._anchor is not None:
+            self._anchor["text"].append(data)
+        if not self._hidden and self._text_chars < MAX_TEXT_CHARS:
+            text = data.strip()
+            if text:
+                self._text.append(text)
+                self._text_chars += len(text) + 1
+
+    def handle_comment(self, data):
+        if AGENT_SIGNAL_RE.search(data):
+            self._signal(f"HTML comment: {data.strip()[:200]}")
+
+    def _signal(self, text):
+        signals = self.page["signals"]
+        if len(signals) < MAX_SIGNALS and text not in signals:
+            signals.append(text)
+
+    def _end_script(self):
+        script, self._script = self._script, None
+        body = "".join(script["buf"])
+        if script["type"] == "application/ld+json":
+            self.page["json_ld"].append(body.strip()[:MAX_JSON_LD_CHARS])
+            return
+        if not body.strip():
+            return
+        self.page["inline_scripts"] += 1
+        covered = 0
+        for match in AGENT_SIGNAL_RE.finditer(body):
+            if match.start() < covered:
+                continue
+            start = max(0, match.start() - 80)
+            covered = match.end() + 160
+            snippet = " ".join(body[start:covered].split())
+            self._signal(f"inline script: ...{snippet}...")
+            if len(self.page["signals"]) >= MAX_SIGNALS:
+                break
+
+    def _end_anchor(self):
+        anchor, self._anchor = self._anchor, None
+        href = anchor["href"]
+        if href.startswith(("javascript:", "#", "mailto:", "tel:")):
+            return
+        if len(self.page["links"]) < MAX_LINKS and href not in self.page["links"]:
+            self.page["links"].append(href)
+        text = " ".join("".join(anchor["text"]).split())
+        if self._nav and len(self.page["nav_links"]) < MAX_LINKS:
+            self.page["nav_links"].append([text[:80], href])
+        if AGENT_SIGNAL_RE.search(href):
+            self._signal(f"link: {text[:80]} -> {href}")
+
+    def result(self):
+        page = self.page
+        page["title"] = " ".join(page["title"].split())
+        page["text"] = " ".join(self._text)[:MAX_TEXT_CHARS]
+        return page
+
+
+def condense_page(html):
+    """One pass over `html`. Returns a JSON-serialisable dict (see module doc)."""
+    parser = _Condenser()
+    try:
+        parser.feed(html or "")
+        parser.close()
+    except Exception:
+        # html.parser is lenient; keep whatever was collected before it gave up
+        pass
+    page = parser.result()
+    page["html_chars"] = len(html or "")
+    return page
+
+
+def _section_head(page):
+    lines = [f"Title: {page['title'] or 'NONE'}"]
+    if page["lang"]:
+        lines.append(f"Language: {page['lang']}")
+    for key, value in page["meta"].items():
+        lines.append(f"meta {key}: {value}")
+    return "Head metadata:\n" + "\n".join(lines)
+
+
+def _section_json_ld(page):
+    if not page["json_ld"]:
+        return "JSON-LD: NONE"
+    return "JSON-LD blocks:\n" + "\n".join(block[:3000] for block in page["json_ld"])
+
+
+def _section_structure(page):
+    counts = ", ".join(f"{t}={n}" for t, n in page["semantic_counts"].items()) or "none"
+    return (
+        f"HTML size: {page['html_chars']} chars, visible text: {len(page['text'])} chars, "
+        f"external scripts: {len(page['scripts'])}, inline scripts: {page['inline_scripts']}, "
+        f"microdata: {'yes' if page['has_microdata'] else 'no'}\n"
+        f"Semantic elements: {counts}"
+    )
+
+
+def _section_signals(page):
+    if not page["signals"]:
+        return "Agent-related signals (MCP, WebMCP, APIs, feeds) in markup and scripts: NONE FOUND"
+    return "Agent-related signals (MCP, WebMCP, APIs, feeds) in markup and scripts:\n" + "\n".join(
+        f"- {s}" for s in page["signals"]
+    )
+
+
+def _section_scripts(page):
+    return "Script sources:\n" + ("\n".join(page["scripts"]) or "NONE")
+
+
+def _section_link_rels(page):
+    if not page["link_rels"]:
+        return "<link> tags: NONE"
+    return "<link> tags:\n" + "\n".join(
+        " ".join(f'{k}="{v}"' for k, v in link.items()) for link in page["link_rels"]
+    )
+
+
+def _section_nav(page):
+    if not page["nav_links"]:
+        return "Navigation links: NONE FOUND"
+    return "Navigation links:\n" + "\n".join(f"- {text or '(no text)'} -> {href}" for text, href in page["nav_links"])
+
+
+def _section_links(page):
+    return "Link URLs on the page:\n" + ("\n".join(page["links"]) or "NONE")
+
+
+def _section_forms(page):
+    if not page["forms"]:
+        return "Forms: NONE"
+    return "Forms:\n" + "\n".join(f"- {f['method'].upper()} {f['action'] or '(same page)'}" for f in page["forms"])
+
+
+def _section_text(page):
+    return "Visible text:\n" + (page["text"] or "NONE")
+
+
+SECTIONS = {
+    "head": _section_head,
+    "json_ld": _section_json_ld,
+    "structure": _section_structure,
+    "signals": _section_signals,
+    "scripts": _section_scripts,
+    "link_rels": _section_link_rels,
+    "nav": _section_nav,
+    "links": _section_links,
+    "forms": _section_forms,
+    "text": _section_text,
+}
+
+
+def page_context(page, sections, budget_tokens):
+    """Render `sections` of a condensed page, in order, within the budget.
+
+    Sections are added whole while they fit; the first one that doesn't is
+    cut to the remaining space and the rest are dropped, so put the ones
+    that matter most first (visible text is usually best last).
+    """
+    budget = budget_tokens * CHARS_PER_TOKEN
+    parts = []
+    used = 0
+    for name in sections:
+        block = SECTIONS[name](page)
+        remaining = budget - used
+        if remaining <= 0:
+            break
+        if len(block) > remaining:
+            parts.append(block[:remaining] + " [truncated]")
+            break
+        parts.append(block)
+        used += len(block) + 2
+    return "\n\n".join(parts)
@@ -0,0 +1,228 @@
+"""The one way this app fetches other people's websites.
+
+Every outbound request to a listed site (the checker's prefetch, the
+page_content refresher, the description and entry point scripts) goes
+through fetch(), which:
+  - reuses one pooled, keep-alive HTTP session per process, with one user agent
+  - holds a per-host slot (at most HOST_CONCURRENCY requests in flight per
+    host, across all workers) and spaces requests to a host by its robots.txt
+    Crawl-delay (DEFAULT_CRAWL_DELAY if none, capped at MAX_CRAWL_DELAY)
+  - skips URLs robots.txt disallows (obey_robots=False for user-requested checks,
+    which grade robots.txt rather than follow it)
+  - counts requests against a daily per-host budget (CrawlRefused when spent)
+
+Slots, spacing and budgets live in Redis, updated by one Lua script so the
+check-and-take is atomic. robots.txt is fetched once per host per ROBOTS_TTL.
+
+refresh_page_content() stores a site's homepage visible text in
+Website.page_content; websites.tasks.refresh_stale_page_content keeps it fresh.
+"""
+import logging
+import time
+import uuid
+from datetime import datetime, timezone as dt_timezone
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+import requests
+from django.core.cache import cache
+from django.utils import timezone
+from requests.adapters import HTTPAdapter
+from common.redis_client import get_redis
+from websites.condense import condense_page
+
+logger = logging.getLogger(__name__)
+
+CRAWL_UA = "SiliconFriendly/1.0 (+https://siliconfriendly.com)"
+# Product token matched against robots.txt User-agent lines.
+ROBOTS_AGENT = "SiliconFriendly"
+FETCH_TIMEOUT = 10
+POOL_SIZE = 32
+HOST_CONCURRENCY = 2
+DEFAULT_CRAWL_DELAY = 0.5
+MAX_CRAWL_DELAY = 5
+# Give up waiting for a host slot after this long (raises TimeoutError).
+HOST_WAIT_TIMEOUT = 120
+HOST_DAILY_BUDGET = 300
+ROBOTS_TTL = 60 * 60 * 24
+ROBOTS_RETRY_TTL = 60 * 60
+# Background page_content refresh: sites per run, and how old a copy may get.
+PAGE_CONTENT_BATCH = 50
+PAGE_CONTENT_WORKERS = 8
+PAGE_CONTENT_MAX_AGE_DAYS = 30
+
+# Returns ms to wait before sending, -1 if the host is at its concurrency
+# limit, -2 if its daily budget is spent.
+_HOST_SLOT_LUA = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now)
+if redis.call('ZCARD', KEYS[1]) >= tonumber(ARGV[2]) then
+    return -1
+end
+if tonumber(redis.call('GET', KEYS[3]) or '0') >= tonumber(ARGV[5]) then
+    return -2
+end
+redis.call('INCR', KEYS[3])
+redis.call('EXPIRE', KEYS[3], 172800)
+redis.call('ZADD', KEYS[1], now + tonumber(ARGV[3]), ARGV[1])
+redis.call('PEXPIRE', KEYS[1], tonumber(ARGV[3]))
+local start = math.max(tonumber(redis.call('GET', KEYS[2]) or '0'), now)
+local delay = tonumber(ARGV[4])
+redis.call('SET', KEYS[2], start + delay, 'PX', start - now + delay + 1000)
+return start - now
+"""
+
+
+class CrawlRefused(Exception):
+    """The host's daily crawl budget is spent."""
+
+
+_session = None
+_slot_script = None
+
+
+def get_session():
+    global _session
+    if _session is None:
+        session = requests.Session()
+        session.mount("https://", HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE))
+        session.mount("http://", HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE))
+        session.headers["User-Agent"] = CRAWL_UA
+        _session = session
+    return _session
+
+
+def _host(url):
+    return urlsplit(url).netloc.lower()
+
+
+def _acquire_host(host, delay, timeout):
+    """Take a slot on `host`, sleeping out its crawl delay. Returns the lease id."""
+    global _slot_script
+    if _slot_script is None:
+        _slot_script = get_redis().register_script(_HOST_SLOT_LUA)
+    lease = uuid.uuid4().hex
+    day = datetime.now(dt_timezone.utc).strftime("%Y%m%d")
+    keys = [f"crawl:host:{host}:leases", f"crawl:host:{host}:next", f"crawl:budget:{host}:{day}"]
+    args = [lease, HOST_CONCURRENCY, (timeout + HOST_WAIT_TIMEOUT) * 1000, int(delay * 1000), HOST_DAILY_BUDGET]
+    deadline = time.monotonic() + HOST_WAIT_TIMEOUT
+    while True:
+        wait_ms = _slot_script(keys=keys, args=args)
+        if wait_ms == -2:
+            raise CrawlRefused(f"Daily crawl budget for {host} is used up, try again tomorrow")
+        if wait_ms >= 0:
+            time.sleep(wait_ms / 1000)
+            return lease
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"Could not get a crawl slot for {host}")
+        time.sleep(0.2)
+
+
+def _release_host(host, lease):
+    get_redis().zrem(f"crawl:host:{host}:leases", lease)
+
+
+def _request(url, method, timeout, delay):
+    host = _host(url)
+    lease = _acquire_host(host, delay, timeout)
+    try:
+        try:
+            return get_session().request(method, url, timeout=timeout, allow_redirects=True)
+        except requests.exceptions.SSLError:
+            fallback = url.replace("https://", "http://", 1)
+            return get_session().request(method, fallback, timeout=timeout, allow_redirects=True)
+    finally:
+        _release_host(host, lease)
+
+
+def robots(host, refresh=False):
+    """{"text": robots.txt body or None, "crawl_delay": seconds or None}, cached
+    per host. refresh=True fetches it again (checks grade the current file).
+    """
+    key = f"crawl:robots:{host}"
+    cached = None if refresh else cache.get(key)
+    if cached is not None:
+        return cached
+    try:
+        resp = _request(f"https://{host}/robots.txt", "GET", FETCH_TIMEOUT, DEFAULT_CRAWL_DELAY)
+    except requests.RequestException:
+        # Unreachable: treat as no robots.txt, but look again sooner
+        info = {"text": None, "crawl_delay": None}
+        cache.set(key, info, ROBOTS_RETRY_TTL)
+        return info
+    text = resp.text if resp.status_code == 200 else None
+    info = {"text": text, "crawl_delay": None}
+    if text:
+        info["crawl_delay"] = _parser(text).crawl_delay(ROBOTS_AGENT)
+    cache.set(key, info, ROBOTS_TTL)
+    return info
+
+
+def _parser(text):
+    parser = RobotFileParser()
+    parser.parse(text.splitlines())
+    return parser
+
+
+def crawl_delay(host):
+    delay = robots(host)["crawl_delay"]
+    if delay is None:
+        return DEFAULT_CRAWL_DELAY
+    return min(max(float(delay), DEFAULT_CRAWL_DELAY), MAX_CRAWL_DELAY)
+
+
+def allowed(url):
+    text = robots(_host(url))["text"]
+    return not text or _parser(text).can_fetch(ROBOTS_AGENT, url)
+
+
+def fetch(url, timeout=FETCH_TIMEOUT, method="GET", obey_robots=True, metrics=None):
+    """Fetch `url` politely. Returns {"status", "headers", "body"}, or None if
+    the request failed or robots.txt disallows it. Falls back to http:// when
+    https has a certificate problem. Raises CrawlRefused when the host's
+    budget is spent and TimeoutError when no host slot frees up in time; any
+    other failure (Redis down, a body that won't decode) is logged and
+    returns None, so one bad page doesn't end a check or a batch.
+    """
+    start = time.monotonic()
+    resp = page = None
+    try:
+        if obey_robots and not allowed(url):
+            logger.info("robots.txt disallows %s", url)
+            return None
+        delay = crawl_delay(_host(url))
+        start = time.monotonic()
+        resp = _request(url, method, timeout, delay)
+        page = {"status": resp.status_code, "headers": dict(resp.headers), "body": resp.text}
+    except (CrawlRefused, TimeoutError):
+        raise
+    except requests.RequestException:
+        pass
+    except Exception as e:
+        logger.warning("Could not fetch %s: %s", url, e)
+    if metrics:
+        ms = int((time.monotonic() - start) * 1000)
+        metrics.record_fetch(len(resp.content) if page else 0, ms, ok=page is not None)
+    return page
+
+
+def store_page_content(website, html):
+    """Save the visible text of a homepage on the Website."""
+    website.page_content = condense_page(html)["text"]
+    website.page_content_fetched_at = timezone.now()
+    website.save(update_fields=["page_content", "page_content_fetched_at"])
+
+
+def refresh_page_content(website, host=None):
+    """Fetch the homepage and store its text. Returns the text ("" if unavailable).
+
+    A failed fetch keeps the old text but still counts as an attempt, so dead
+    sites aren't retried on every run.
+    """
+    page = fetch(f"https://{host or website.url}")
+    if not page or page["status"] != 200:
+        website.page_content_fetched_at = timezone.now()
+        website.save(update_fields=["page_content_fetched_at"])
+        return ""
+    store_page_content(website, page["body"])
+    return website.page_content
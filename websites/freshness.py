@@ -0,0 +1,129 @@
+"""Background re-checks, picked by how stale and how visible a site is.
+
+schedule_rechecks (websites.tasks, run by celery beat) asks pick_recheck_candidates()
+for the sites most worth re-checking and queues them in the bulk lane, within
+three budgets: a cap per run, a minimum interval per domain, and a daily cap
+on the Claude calls those re-checks may spend.
+
+Traffic is counted per day in Redis hashes (badge loads and page views), so
+the score favours sites people are actually looking at right now.
+"""
+import logging
+import math
+from datetime import timedelta
+from django.db.models import F, Max, OuterRef, Q, Subquery
+from django.utils import timezone
+from common.redis_client import get_redis
+from websites.live import TERMINAL_STATUSES
+
+logger = logging.getLogger(__name__)
+
+# Re-checks queued per scheduler run (every 15 minutes).
+RECHECK_BATCH_SIZE = 4
+# Don't queue more while this many bulk jobs are still waiting.
+RECHECK_MAX_WAITING = 20
+# A domain is re-checked at most this often, by anyone.
+RECHECK_MIN_INTERVAL = timedelta(days=14)
+# Claude calls scheduled re-checks may spend per UTC day. A check costs up to
+# CALLS_PER_CHECK (step 0, five levels, report); local rules and stored
+# results often make it less, so this is an upper bound.
+RECHECK_DAILY_LLM_CALLS = 300
+CALLS_PER_CHECK = 7
+# How many of the stalest sites are scored each run.
+CANDIDATE_POOL = 500
+TRAFFIC_DAYS = 7
+
+AGE_WEIGHT = 1.0        # per day since the last check
+TRAFFIC_WEIGHT = 5.0    # per log-unit of views over TRAFFIC_DAYS
+LEVEL_WEIGHT = 2.0      # per level: badges on L4/L5 sites are the most visible
+
+
+def _traffic_key(day):
+    return f"traffic:{day:%Y%m%d}"
+
+
+def _llm_budget_key(day):
+    return f"recheck:llm_calls:{day:%Y%m%d}"
+
+
+def record_view(domain):
+    """Count a page view or badge load. Never raises."""
+    try:
+        key = _traffic_key(timezone.now().date())
+        pipe = get_redis().pipeline()
+        pipe.hincrby(key, domain, 1)
+        pipe.expire(key, 60 * 60 * 24 * (TRAFFIC_DAYS + 1))
+        pipe.execute()
+    except Exception as e:
+        logger.warning("Could not record view for %s: %s", domain, e)
+
+
+def recent_views(domains):
+    """{domain: views over the last TRAFFIC_DAYS days}."""
+    if not domains:
+        return {}
+    today = timezone.now().date()
+    pipe = get_redis().pipeline()
+    for offset in range(TRAFFIC_DAYS):
+        pipe.hmget(_traffic_key(today - timedelta(days=offset)), domains)
+    totals = dict.fromkeys(domains, 0)
+    for counts in pipe.execute():
+        for domain, count in zip(domains, counts):
+            totals[domain] += int(count or 0)
+    return totals
+
+
+def llm_calls_remaining():
+    used = get_redis().get(_llm_budget_key(timezone.now().date()))
+    return max(0, RECHECK_DAILY_LLM_CALLS - int(used or 0))
+
+
+def spend_llm_calls(calls):
+    key = _llm_budget_key(timezone.now().date())
+    pipe = get_redis().pipeline()
+    pipe.incrby(key, calls)
+    pipe.expire(key, 60 * 60 * 48)
+    pipe.execute()
+
+
+def recheck_score(age_days, views, level):
+    return age_days * AGE_WEIGHT + math.log1p(views) * TRAFFIC_WEIGHT + level * LEVEL_WEIGHT
+
+
+def pick_recheck_candidates(limit):
+    """The `limit` websites most due a re-check, best first.
+
+    A site's last evaluation is its newest check job or silicon verification,
+    whichever is later, so freshly verified sites are left alone too.
+    """
+    from websites.models import CheckJob, Website
+
+    now = timezone.now()
+    cutoff = now - RECHECK_MIN_INTERVAL
+    # By domain rather than FK: jobs that fail before step 0 never get linked.
+    last_job = CheckJob.objects.filter(domain=OuterRef("url")).order_by("-created_at")
+    busy = CheckJob.objects.exclude(status__in=TERMINAL_STATUSES).values("domain")
+    pool = (
+        Website.objects.exclude(url__in=busy)
+        .filter(created_at__lt=cutoff)
+        .annotate(
+            last_check=Subquery(last_job.values("created_at")[:1]),
+            last_verification=Max("verifications__created_at"),
+        )
+        .filter(Q(last_check__isnull=True) | Q(last_check__lt=cutoff))
+        .filter(Q(last_verification__isnull=True) | Q(last_verification__lt=cutoff))
+        .order_by(F("last_check").asc(nulls_first=True))[:CANDIDATE_POOL]
+    )
+
+    candidates = []
+    for website in pool:
+        last = max(d for d in (website.last_check, website.last_verification, website.created_at) if d)
+        candidates.append((website, last))
+
+    views = recent_views([w.url for w, _ in candidates])
+    scored = sorted(
+        candidates,
+        key=lambda c: recheck_score((now - c[1]).total_seconds() / 86400, views[c[0].url], c[0].level),
+        reverse=True,
+    )
+    return [w for w, _ in scored[:limit]]
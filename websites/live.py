@@ -0,0 +1,219 @@
+"""Live progress for check jobs.
+
+job_status_payload() is the one shape clients see, whether they poll
+/api/check/<domain>/status/ or listen on /api/check/<domain>/events/.
+
+While a job runs, Redis is the hot store for its state: every change is
+written to a hash (checkjob:<id>:state) and published on a pub/sub channel,
+and the status endpoints read from there. The worker only writes the
+CheckJob row at checkpoints (see websites.tasks._checkpoint), so the hash
+is always at least as fresh as the row. Updates are also fanned out to
+jobs attached to the run (websites.singleflight), under their own ids.
+
+While the model is still writing, the payload also has a "partial" key
+(PartialOutput): the criterion verdicts read so far out of the level
+replies, and the report Markdown so far. It is only in the live state;
+the finished results replace it.
+"""
+import json
+import logging
+import re
+import threading
+import time
+from common.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = ("done", "error", "cancelled")
+# Live state outlasts the job long enough for clients still polling it.
+STATE_TTL = 60 * 60 * 24
+# Streamed output is pushed to clients at most this often.
+PARTIAL_PUBLISH_SECONDS = 0.5
+
+# One finished criterion in a level reply: "l1_field": {"pass": ..., "reason": "..."}
+_VERDICT_RE = re.compile(r'"(l[1-5]_[a-z0-9_]+)"\s*:\s*(\{[^{}]*\})')
+
+
+def job_channel(job_id):
+    return f"checkjob:{job_id}:events"
+
+
+def job_state_key(job_id):
+    return f"checkjob:{job_id}:state"
+
+
+def followers_key(job_id):
+    """Jobs attached to this one's run (websites.singleflight)."""
+    return f"checkjob:{job_id}:followers"
+
+
+def job_status_payload(job):
+    """Status dict for a CheckJob (without queue position, which the views add)."""
+    payload = {
+        "job_id": job.id,
+        "status": job.status,
+        "domain": job.domain,
+        "website_name": job.website_name,
+        "website_description": job.website_description,
+        "overall_level": job.overall_level,
+        "lane": job.lane,
+    }
+    if job.shared_from_id:
+        payload["shared_from"] = job.shared_from_id
+
+    # Include completed level results
+    for level in range(1, 6):
+        results = getattr(job, f"level_{level}_results")
+        reasoning = getattr(job, f"level_{level}_reasoning")
+        if results is not None:
+            payload[f"level_{level}"] = {
+                "results": results,
+                "reasoning": reasoning or {},
+                "passed": sum(1 for v in results.values() if v),
+                "total": len(results),
+            }
+
+    if job.status == "done":
+        payload["report_md"] = job.report_md
+        if job.website_id:
+            payload["website_url"] = f"/w/{job.domain}/"
+
+    if job.status == "error":
+        payload["error"] = job.error_message
+
+    return payload
+
+
+def _store_state(job_id, payload, publish, pipe=None):
+    key = job_state_key(job_id)
+    own = pipe is None
+    pipe = get_redis().pipeline() if own else pipe
+    pipe.delete(key)
+    pipe.hset(key, mapping={k: json.dumps(v) for k, v in payload.items()})
+    pipe.expire(key, STATE_TTL)
+    if publish:
+        pipe.publish(job_channel(job_id), json.dumps(payload))
+    if own:
+        pipe.execute()
+
+
+def _follower_payload(follower_id, leader_id, payload):
+    return {**payload, "job_id": int(follower_id), "shared_from": leader_id}
+
+
+def store_follower_state(follower_id, leader_id, payload):
+    """Mirror a leader's state onto a job that just attached to it."""
+    _store_state(follower_id, _follower_payload(follower_id, leader_id, payload), publish=True)
+
+
+def publish_job(job, timings=None, partial=None):
+    """Store the job's current state in Redis and push it to anyone streaming it.
+
+    Never raises: live state is best-effort, the DB checkpoints are the record.
+    """
+    payload = job_status_payload(job)
+    if timings:
+        payload["timings"] = timings
+    if partial:
+        payload["partial"] = partial
+    try:
+        client = get_redis()
+        pipe = client.pipeline()
+        _store_state(job.id, payload, publish=True, pipe=pipe)
+        # Jobs attached to this run see every update as their own
+        for follower_id in client.smembers(followers_key(job.id)):
+            _store_state(follower_id, _follower_payload(follower_id, job.id, payload), publish=True, pipe=pipe)
+        pipe.execute()
+    except Exception as e:
+        logger.warning("Could not publish CheckJob %s update: %s", job.id, e)
+
+
+def job_state(job_id):
+    """Current status payload for a job, or None if there is no such job.
+
+    Reads the Redis hash; jobs with no live state (expired, or from before
+    it existed) are loaded from the DB and their state stored again.
+    """
+    from websites.models import CheckJob
+
+    state = get_redis().hgetall(job_state_key(job_id))
+    if state:
+        return {k: json.loads(v) for k, v in state.items()}
+
+    try:
+        job = CheckJob.objects.get(id=job_id)
+    except (CheckJob.DoesNotExist, ValueError):
+        return None
+    payload = job_status_payload(job)
+    _store_state(job.id, payload, publish=False)
+    return payload
+
+
+def streamed_verdicts(text):
+    """Criterion verdicts that are complete in a partial level reply."""
+    verdicts = {}
+    for field, body in _VERDICT_RE.findall(text):
+        try:
+            data = json.loads(body)
+        except json.JSONDecodeError:
+            continue
+        if "pass" in data:
+            verdicts[field] = {"pass": bool(data["pass"]), "reason": str(data.get("reason", ""))}
+    return verdicts
+
+
+class PartialOutput:
+    """Model output streamed in so far for a running job, published as
+    payload["partial"] at most every PARTIAL_PUBLISH_SECONDS.
+
+    Fed from the level worker threads and the report call via the on_text
+    callbacks from for_level() and for_report().
+    """
+
+    def __init__(self, job, timings):
+        self.job = job
+        self.timings = timings
+        self.criteria = {}
+        self.report_md = ""
+        self._lock = threading.Lock()
+        self._published = 0
+
+    def as_dict(self):
+        with self._lock:
+            partial = {}
+            if self.criteria:
+                partial["criteria"] = dict(self.criteria)
+            if self.report_md:
+                partial["report_md"] = self.report_md
+            return partial or None
+
+    def add_criteria(self, verdicts):
+        """Verdicts known before (or without) any model output, e.g. local rules."""
+        with self._lock:
+            self.criteria.update(verdicts)
+        self._maybe_publish()
+
+    def drop_criteria(self, fields):
+        """Forget verdicts whose level is now in the job's real results."""
+        with self._lock:
+            for field in fields:
+                self.criteria.pop(field, None)
+
+    def for_level(self):
+        def on_text(text):
+            self.add_criteria(streamed_verdicts(text))
+        return on_text
+
+    def for_report(self):
+        def on_text(text):
+            self.report_md = text
+            self._maybe_publish()
+        return on_text
+
+    def publish(self):
+        self._published = time.monotonic()
+        publish_job(self.job, timings=self.timings, partial=self.as_dict())
+
+    def _maybe_publish(self):
+        if time.monotonic() - self._published >= PARTIAL_PUBLISH_SECONDS:
+            self.publish()
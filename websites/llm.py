@@ -0,0 +1,300 @@
+"""LLM backends for the website checker.
+
+settings.CHECKER_LLM_BACKEND picks one:
+  "cli"  - the Claude CLI (`claude -p`), one process per call. The prompt goes
+           in on stdin, so long prompts don't hit argv limits; the reply comes
+           back as stream-json events.
+  "api"  - the Anthropic Messages API over one pooled, keep-alive HTTP session
+           per process, streamed. JSON stages prefill the reply with "{".
+  "stub" - deterministic canned answers, no network. For tests and benchmarks;
+           settings.CHECKER_LLM_STUB_LATENCY adds a fixed delay per call, and
+           settings.CHECKER_LLM_STUB_SLOTS makes calls hold a Claude slot.
+
+Every call's latency is logged and kept in Redis (see latency_stats()).
+Calls can be abandoned while running (should_stop), which kills the CLI
+process or closes the API stream. Every backend streams: on_text gets the
+reply so far as it is written, which is how partial results reach the
+check page (websites.live.PartialOutput).
+"""
+import hashlib
+import json
+import logging
+import os
+import queue
+import re
+import signal
+import subprocess
+import threading
+import time
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from common.redis_client import get_redis
+from websites.metrics import percentiles
+import env
+
+logger = logging.getLogger(__name__)
+
+CLAUDE_PATH = os.path.expanduser("~/.local/bin/claude")
+API_URL = "https://api.anthropic.com/v1/messages"
+API_VERSION = "2023-06-01"
+API_MAX_TOKENS = 8000
+LATENCY_SAMPLES = 200
+# How often a running call checks whether it should stop.
+POLL_SECONDS = 1
+STUB_STREAM_STEP = 0.25
+
+
+class LLMError(RuntimeError):
+    """The backend failed to answer (non-zero exit, API error). Worth retrying."""
+
+
+class LLMInterrupted(Exception):
+    """The caller's should_stop() said to abandon the call; it was killed."""
+
+
+def _latency_key(backend):
+    return f"llm:latency:{backend}"
+
+
+class LLMBackend:
+    name = None
+    # Whether calls should hold a Claude slot (websites.tasks.CLAUDE_SLOTS).
+    uses_slot = True
+
+    def complete(self, prompt, timeout, json_output=False, should_stop=None, on_text=None):
+        """Return the model's reply to `prompt` as text.
+
+        Backends check `should_stop` about once a second while the call runs;
+        when it returns True they kill the call and raise LLMInterrupted.
+        `on_text` is called with the reply so far each time more of it arrives.
+        """
+        raise NotImplementedError
+
+    def run(self, prompt, timeout=180, json_output=False, should_stop=None, on_text=None):
+        start = time.monotonic()
+        ok = False
+        try:
+            reply = self.complete(prompt, timeout, json_output=json_output, should_stop=should_stop, on_text=on_text)
+            ok = True
+            return reply
+        finally:
+            ms = int((time.monotonic() - start) * 1000)
+            logger.info("LLM call via %s: %d ms, %d prompt chars, %s", self.name, ms, len(prompt), "ok" if ok else "failed")
+            _record_latency(self.name, ms)
+
+
+class CLIBackend(LLMBackend):
+    name = "cli"
+
+    def complete(self, prompt, timeout, json_output=False, should_stop=None, on_text=None):
+        # stream-json prints one JSON event per line as the reply is written;
+        # the final "result" event carries the whole reply
+        proc = subprocess.Popen(
+            [CLAUDE_PATH, "-p", "--model", "sonnet", "--output-format", "stream-json", "--verbose", "--include-partial-messages"],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+            start_new_session=True,
+        )
+        lines = queue.Queue()
+        stderr = []
+        threading.Thread(target=_drain, args=(proc.stdout, lines.put), daemon=True).start()
+        stderr_reader = threading.Thread(target=_drain, args=(proc.stderr, stderr.append), daemon=True)
+        stderr_reader.start()
+        try:
+            proc.stdin.write(prompt)
+            proc.stdin.close()
+        except OSError as e:
+            # The CLI exited before reading the prompt (BrokenPipeError)
+            try:
+                proc.stdin.close()
+            except OSError:
+                pass
+            _kill(proc)
+            stderr_reader.join(timeout=POLL_SECONDS)
+            detail = "".join(line for line in stderr if line).strip() or str(e)
+            raise LLMError(f"Claude CLI exited early (code {proc.returncode}): {detail[:500]}") from e
+
+        deadline = time.monotonic() + timeout
+        parts, result = [], None
+        while True:
+            try:
+                line = lines.get(timeout=POLL_SECONDS)
+            except queue.Empty:
+                line = ""
+            if line is None:  # stdout closed
+                break
+            if should_stop and should_stop():
+                _kill(proc)
+                raise LLMInterrupted("Claude CLI call stopped")
+            if time.monotonic() > deadline:
+                _kill(proc)
+                raise subprocess.TimeoutExpired(proc.args, timeout)
+            try:
+                event = json.loads(line) if line.strip() else {}
+            except json.JSONDecodeError:
+                continue
+            if event.get("type") == "stream_event":
+                text = _text_delta(event.get("event", {}))
+                if text:
+                    parts.append(text)
+                    if on_text:
+                        on_text("".join(parts))
+            elif event.get("type") == "result":
+                result = event
+        proc.wait()
+        if proc.returncode != 0 or result is None or result.get("is_error"):
+            detail = (result or {}).get("result") or "".join(stderr)
+            raise LLMError(f"Claude CLI error: {str(detail)[:500]}")
+        return (result.get("result") or "".join(parts)).strip()
+
+
+def _drain(stream, put):
+    for line in stream:
+        put(line)
+    put(None)
+
+
+def _text_delta(event):
+    """The text of a Messages API stream event, if it is a text delta."""
+    if event.get("type") == "content_block_delta" and event["delta"].get("type") == "text_delta":
+        return event["delta"]["text"]
+    return None
+
+
+def _kill(proc):
+    # The whole process group, so nothing the CLI started keeps the pipes open
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+    # stdin is already closed and the reader threads drain stdout/stderr
+    proc.wait()
+
+
+class APIBackend(LLMBackend):
+    """Streams the reply, so a call can be abandoned (the connection closed) mid-way."""
+    name = "api"
+
+    def __init__(self):
+        self.session = requests.Session()
+        retry = Retry(
+            total=3, backoff_factor=2, allowed_methods=None,
+            status_forcelist=(429, 500, 502, 503, 529), respect_retry_after_header=True,
+        )
+        self.session.mount("https://", HTTPAdapter(pool_maxsize=16, max_retries=retry))
+        self.session.headers.update({
+            "x-api-key": getattr(env, "ANTHROPIC_API_KEY", ""),
+            "anthropic-version": API_VERSION,
+            "content-type": "application/json",
+        })
+
+    def complete(self, prompt, timeout, json_output=False, should_stop=None, on_text=None):
+        messages = [{"role": "user", "content": prompt}]
+        if json_output:
+            messages.append({"role": "assistant", "content": "{"})
+        deadline = time.monotonic() + timeout
+        resp = self.session.post(API_URL, timeout=timeout, stream=True, json={
+            "model": settings.CHECKER_LLM_MODEL,
+            "max_tokens": API_MAX_TOKENS,
+            "messages": messages,
+            "stream": True,
+        })
+        with resp:
+            if resp.status_code != 200:
+                raise LLMError(f"Anthropic API error {resp.status_code}: {resp.text[:500]}")
+            parts = []
+            # Text deltas and pings keep arriving, so should_stop is looked at
+            # regularly for the whole call
+            for line in resp.iter_lines(decode_unicode=True):
+                if should_stop and should_stop():
+                    raise LLMInterrupted("Anthropic API call stopped")
+                if time.monotonic() > deadline:
+                    raise LLMError(f"Anthropic API call took longer than {timeout}s")
+                if not line or not line.startswith("data:"):
+                    continue
+                try:
+                    event = json.loads(line[5:])
+                except ValueError:
+                    raise LLMError(f"Malformed Anthropic API stream event: {line[:200]}")
+                text = _text_delta(event)
+                if text:
+                    parts.append(text)
+                    if on_text:
+                        on_text("".join(parts))
+                elif event.get("type") == "error":
+                    raise LLMError(f"Anthropic API error: {event.get('error', {}).get('message', '')[:500]}")
+                elif event.get("type") == "message_delta" and event.get("delta", {}).get("stop_reason") == "max_tokens":
+                    # A cut-off reply (a truncated JSON verdict, say) is no answer
+                    raise LLMError(f"Anthropic API reply hit max_tokens ({API_MAX_TOKENS})")
+        text = "".join(parts)
+        return ("{" + text if json_output else text).strip()
+
+
+class StubBackend(LLMBackend):
+    """Canned answers derived from a hash of the prompt, so reruns match."""
+    name = "stub"
+
+    @property
+    def uses_slot(self):
+        return getattr(settings, "CHECKER_LLM_STUB_SLOTS", False)
+
+    def complete(self, prompt, timeout, json_output=False, should_stop=None, on_text=None):
+        reply = self._reply(prompt, json_output)
+        # The reply "streams" in evenly over the configured latency
+        delay = getattr(settings, "CHECKER_LLM_STUB_LATENCY", 0)
+        start = time.monotonic()
+        end = start + delay
+        while time.monotonic() < end:
+            if should_stop and should_stop():
+                raise LLMInterrupted("Stub call stopped")
+            if on_text:
+                on_text(reply[:int(len(reply) * (time.monotonic() - start) / delay)])
+            time.sleep(min(STUB_STREAM_STEP, end - time.monotonic()))
+        if on_text:
+            on_text(reply)
+        return reply
+
+    def _reply(self, prompt, json_output):
+        seed = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        if not json_output:
+            return f"# Stub report\n\nGenerated offline (prompt {seed[:12]}).\n"
+
+        fields = list(dict.fromkeys(re.findall(r"\b(l[1-5]_[a-z0-9_]+)\b", prompt)))
+        if fields:
+            return json.dumps({
+                f: {"pass": int(hashlib.sha256((seed + f).encode()).hexdigest(), 16) % 2 == 0, "reason": "Stub verdict"}
+                for f in fields
+            })
+        match = re.search(r"website (\S+?)\.?\s", prompt)
+        domain = match.group(1) if match else "example.com"
+        return json.dumps({"name": domain, "description": f"Stub description for {domain}."})
+
+
+BACKENDS = {b.name: b for b in (CLIBackend, APIBackend, StubBackend)}
+_backend = None
+
+
+def get_backend():
+    """The configured backend, built once per process and reused."""
+    global _backend
+    if _backend is None or _backend.name != settings.CHECKER_LLM_BACKEND:
+        _backend = BACKENDS[settings.CHECKER_LLM_BACKEND]()
+    return _backend
+
+
+def _record_latency(backend, ms):
+    try:
+        pipe = get_redis().pipeline()
+        pipe.lpush(_latency_key(backend), ms)
+        pipe.ltrim(_latency_key(backend), 0, LATENCY_SAMPLES - 1)
+        pipe.execute()
+    except Exception as e:
+        logger.warning("Could not record LLM latency: %s", e)
+
+
+def latency_stats(backend):
+    ms = percentiles([int(s) for s in get_redis().lrange(_latency_key(backend), 0, -1)])
+    if not ms:
+        return {"backend": backend, "calls": 0}
+    return {"backend": backend, "calls": ms["n"], "ms_p50": ms["p50"], "ms_p95": ms["p95"], "ms_max": ms["max"]}
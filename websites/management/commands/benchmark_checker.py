@@ -0,0 +1,164 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from celery import current_app
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+from websites.metrics import percentiles
+
+SLOT_SAMPLE_SECONDS = 0.2
+
+
+class Command(BaseCommand):
+    help = (
+        "Run website checks end to end against recorded site fixtures and the stub LLM, "
+        "and report throughput, stage latencies and Claude slot use. Needs no network."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--jobs", type=int, default=20, help="Checks to run (fixtures are cycled; default: 20)")
+        parser.add_argument("--concurrency", type=int, default=4, help="Checks running at once, like worker processes (default: 4)")
+        parser.add_argument("--slots", type=int, help="Claude slots (default: websites.tasks.CLAUDE_MAX_CONCURRENT)")
+        parser.add_argument("--llm-latency", type=float, default=2.0, help="Seconds per stub LLM call (default: 2)")
+        parser.add_argument("--fetch-latency", type=float, default=0.0, help="Scale of the recorded fetch times to replay (0 = instant, 1 = as recorded)")
+        parser.add_argument("--fixtures", help="Fixture directory (default: settings.CHECKER_FETCH_FIXTURES)")
+        parser.add_argument("--keep", action="store_true", help="Keep the benchmark's CheckJobs and Websites afterwards")
+        parser.add_argument("--json", action="store_true", help="Print raw JSON instead of a table")
+
+    def handle(self, *args, **options):
+        from django.conf import settings
+        from common.semaphore import RedisSemaphore
+        from websites import replay, tasks
+        from websites.models import CheckJob, Website
+
+        directory = options["fixtures"] or settings.CHECKER_FETCH_FIXTURES
+        domains = replay.domains(directory)
+        if not domains:
+            raise CommandError(f"No fixtures in {directory}; record some with record_check_fixtures")
+
+        # Own semaphore, so a benchmark never takes slots from real checks
+        slots = RedisSemaphore("checker_benchmark_slots", limit=options["slots"] or tasks.CLAUDE_MAX_CONCURRENT, lease_ttl=60)
+        self._reset(slots)
+        preexisting = set(Website.objects.filter(url__in=domains).values_list("url", flat=True))
+        jobs = [
+            CheckJob.objects.create(domain=domains[i % len(domains)], trigger="benchmark")
+            for i in range(options["jobs"])
+        ]
+
+        overrides = override_settings(
+            CHECKER_LLM_BACKEND="stub",
+            CHECKER_LLM_STUB_LATENCY=options["llm_latency"],
+            CHECKER_LLM_STUB_SLOTS=True,
+            CHECKER_LLM_REUSE_RESULTS=False,
+            CHECKER_FETCH_MODE="replay",
+            CHECKER_FETCH_FIXTURES=directory,
+            CHECKER_FETCH_REPLAY_LATENCY=options["fetch_latency"],
+        )
+        real_slots = tasks.CLAUDE_SLOTS
+        samples = []
+        stop = threading.Event()
+
+        def sample():
+            while not stop.wait(SLOT_SAMPLE_SECONDS):
+                samples.append(slots.stats()["in_use"])
+
+        self.stderr.write(
+            f"running {len(jobs)} checks of {len(domains)} fixture sites, "
+            f"{options['concurrency']} at a time, {slots.limit} Claude slots..."
+        )
+        sampler = threading.Thread(target=sample, daemon=True)
+        tasks.CLAUDE_SLOTS = slots
+        # Each check's stage tasks run inline, one after another, in its thread
+        # (the app reads its config under the CELERY_ settings namespace)
+        eager = current_app.conf.CELERY_TASK_ALWAYS_EAGER
+        current_app.conf.CELERY_TASK_ALWAYS_EAGER = True
+        start = time.monotonic()
+        try:
+            with overrides:
+                sampler.start()
+                with ThreadPoolExecutor(max_workers=options["concurrency"]) as pool:
+                    list(pool.map(self._run, [job.id for job in jobs]))
+        finally:
+            elapsed = time.monotonic() - start
+            stop.set()
+            tasks.CLAUDE_SLOTS = real_slots
+            current_app.conf.CELERY_TASK_ALWAYS_EAGER = eager
+
+        report = self._report(CheckJob.objects.filter(id__in=[j.id for j in jobs]), elapsed, slots, samples)
+        report["settings"] = {k: options[k] for k in ("jobs", "concurrency", "llm_latency", "fetch_latency")}
+        report["settings"].update(slots=slots.limit, fixtures=len(domains))
+
+        if not options["keep"]:
+            CheckJob.objects.filter(id__in=[j.id for j in jobs]).delete()
+            Website.objects.filter(url__in=set(domains) - preexisting).delete()
+        self._reset(slots)
+
+        if options["json"]:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+        self._print(report)
+
+    def _run(self, job_id):
+        from django.db import connection
+        from websites.tasks import run_website_check
+
+        try:
+            run_website_check.apply(args=[job_id])
+        finally:
+            connection.close()
+
+    def _reset(self, slots):
+        from common.redis_client import get_redis
+
+        get_redis().delete(slots.leases_key, slots.wake_key, slots.metrics_key, slots.waits_key)
+
+    def _report(self, jobs, elapsed, slots, samples):
+        stages, totals, llm_calls = {}, [], []
+        counts = {}
+        for status, metrics in jobs.values_list("status", "metrics"):
+            counts[status] = counts.get(status, 0) + 1
+            if status != "done" or not metrics:
+                continue
+            for stage, seconds in metrics.get("stages", {}).items():
+                stages.setdefault(stage, []).append(seconds)
+            totals.append(round(sum(metrics.get("stages", {}).values()), 2))
+            llm_calls.extend(call["call_ms"] for call in metrics.get("llm", []) if not call["cached"])
+
+        stats = slots.stats()
+        return {
+            "elapsed_seconds": round(elapsed, 2),
+            "jobs": counts,
+            "jobs_per_minute": round(counts.get("done", 0) / elapsed * 60, 2) if elapsed else 0,
+            "total_seconds": percentiles(totals),
+            "stage_seconds": {stage: percentiles(v) for stage, v in stages.items()},
+            "llm_call_ms": percentiles(llm_calls),
+            "slots": {
+                "limit": slots.limit,
+                "utilisation": round(sum(samples) / len(samples) / slots.limit, 3) if samples else 0,
+                "peak_in_use": max(samples) if samples else 0,
+                "acquired": stats["acquired"],
+                "wait_ms_p50": stats["wait_ms_p50"],
+                "wait_ms_p95": stats["wait_ms_p95"],
+                "wait_ms_max": stats["wait_ms_max"],
+            },
+        }
+
+    def _print(self, report):
+        def row(name, p, unit=""):
+            if not p:
+                return f"  {name:<16} -"
+            return f"  {name:<16} p50 {p['p50']}{unit}  p90 {p['p90']}{unit}  p95 {p['p95']}{unit}  max {p['max']}{unit}  (n={p['n']})"
+
+        jobs = ", ".join(f"{n} {status}" for status, n in sorted(report["jobs"].items()))
+        self.stdout.write(f"{jobs} in {report['elapsed_seconds']}s: {report['jobs_per_minute']} checks/minute")
+        self.stdout.write("stage wall time:")
+        self.stdout.write(row("total", report["total_seconds"], "s"))
+        for stage, p in report["stage_seconds"].items():
+            self.stdout.write(row(stage, p, "s"))
+        self.stdout.write(row("llm call", report["llm_call_ms"], "ms"))
+        s = report["slots"]
+        self.stdout.write(
+            f"claude slots: {round(s['utilisation'] * 100, 1)}% busy on average, peak {s['peak_in_use']}/{s['limit']}, "
+            f"{s['acquired']} acquired, wait ms p50 {s['wait_ms_p50']}  p95 {s['wait_ms_p95']}  max {s['wait_ms_max']}"
+        )
@@ -0,0 +1,114 @@
+import hashlib
+import json
+import time
+from datetime import datetime, timezone
+from django.core.management.base import BaseCommand, CommandError
+from websites.metrics import percentiles
+
+SAMPLE_REPORT = """# Report for example.com
+
+## What was checked
+
+The homepage, robots.txt, sitemap.xml, llms.txt, /.well-known/agent.json and the API docs.
+
+## Findings
+
+- **Semantic HTML**: header, nav, main and footer are all used.
+- **API**: a REST API with JSON responses and `Retry-After` on 429s.
+- No MCP server and no webhooks.
+
+```bash
+curl -H "Authorization: Bearer $TOKEN" https://api.example.com/v1/items?q=shoes
+```
+
+## Recommendations
+
+1. Publish an OpenAPI spec at /openapi.json
+2. Add an llms.txt: a short description of the site for agents
+3. Offer webhooks for order events
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        "Render a check's PDF report repeatedly and report render times, "
+        "the first render (stylesheet and fonts) separately. Needs no network."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--renders", type=int, default=20, help="Renders to time after the first (default: 20)")
+        parser.add_argument("--job", type=int, help="CheckJob to render (default: a sample report)")
+        parser.add_argument("--json", action="store_true", help="Print raw JSON instead of a summary")
+
+    def handle(self, *args, **options):
+        from websites import report_assets
+        from websites.models import CheckJob
+        from websites.report_pdf import generate_pdf
+
+        if options["job"]:
+            job = CheckJob.objects.select_related("website").filter(id=options["job"], status="done").first()
+            if not job:
+                raise CommandError(f"No finished CheckJob {options['job']}")
+        else:
+            job = self._sample_job()
+
+        # Count what the renders tried to fetch from the network (and were refused)
+        refused = []
+        fetcher = report_assets.url_fetcher
+
+        def counting_fetcher(url, *args, **kwargs):
+            try:
+                return fetcher(url, *args, **kwargs)
+            except ValueError:
+                refused.append(url)
+                raise
+
+        report_assets.url_fetcher = counting_fetcher
+        try:
+            start = time.monotonic()
+            first = generate_pdf(job)
+            first_ms = int((time.monotonic() - start) * 1000)
+            times, digests = [], {hashlib.sha256(first).hexdigest()}
+            for _ in range(options["renders"]):
+                start = time.monotonic()
+                pdf = generate_pdf(job)
+                times.append(int((time.monotonic() - start) * 1000))
+                digests.add(hashlib.sha256(pdf).hexdigest())
+        finally:
+            report_assets.url_fetcher = fetcher
+
+        fonts = report_assets.available_fonts()
+        report = {
+            "first_render_ms": first_ms,
+            "render_ms": percentiles(times),
+            "pdf_bytes": len(first),
+            "identical_output": len(digests) == 1,
+            "refused_urls": sorted(set(refused)),
+            "fonts": {"found": len(fonts), "expected": len(report_assets.FONT_FILES)},
+        }
+        if options["json"]:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+        p = report["render_ms"]
+        self.stdout.write(f"first render {first_ms}ms (parses the stylesheet, subsets the fonts)")
+        if p:
+            self.stdout.write(f"renders: p50 {p['p50']}ms  p90 {p['p90']}ms  p95 {p['p95']}ms  max {p['max']}ms  (n={p['n']})")
+        self.stdout.write(
+            f"{report['pdf_bytes']} bytes, {'identical' if report['identical_output'] else 'differing'} output, "
+            f"{len(fonts)}/{len(report_assets.FONT_FILES)} report fonts in {report_assets.FONTS_DIR}"
+        )
+        for url in report["refused_urls"]:
+            self.stdout.write(f"refused: {url}")
+
+    def _sample_job(self):
+        from websites.models import CheckJob, LEVEL_RANGES
+
+        job = CheckJob(
+            domain="example.com", status="done", website_name="Example", overall_level=3,
+            report_md=SAMPLE_REPORT, created_at=datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc),
+        )
+        for level, fields in LEVEL_RANGES.items():
+            passed = fields[:max(0, 6 - level)]
+            setattr(job, f"level_{level}_results", {f: f in passed for f in fields})
+            setattr(job, f"level_{level}_reasoning", {f: f"{'Found' if f in passed else 'Did not find'} evidence for {f}." for f in fields})
+        return job
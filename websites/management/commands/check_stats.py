@@ -0,0 +1,90 @@
+import json
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from websites.metrics import percentiles
+
+
+class Command(BaseCommand):
+    help = "Percentiles of website check stage times, LLM waits/sizes and fetch volume over a time window."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--hours", type=int, default=24 * 7, help="Look at checks created in the last N hours (default: 168)")
+        parser.add_argument("--status", default="done", help="Only jobs with this status (default: done; 'any' for all)")
+        parser.add_argument("--json", action="store_true", help="Print raw JSON instead of a table")
+
+    def handle(self, *args, **options):
+        from websites.models import CheckJob
+
+        since = timezone.now() - timedelta(hours=options["hours"])
+        jobs = CheckJob.objects.filter(created_at__gte=since, metrics__isnull=False)
+        if options["status"] != "any":
+            jobs = jobs.filter(status=options["status"])
+
+        stages, llm, fetch = {}, {}, {"requests": [], "bytes": [], "ms": []}
+        totals, email = [], []
+        count = 0
+        for metrics in jobs.values_list("metrics", flat=True).iterator():
+            count += 1
+            for stage, seconds in metrics.get("stages", {}).items():
+                stages.setdefault(stage, []).append(seconds)
+            totals.append(round(sum(metrics.get("stages", {}).values()), 2))
+            for key in fetch:
+                fetch[key].append(metrics.get("fetch", {}).get(key, 0))
+            for call in metrics.get("llm", []):
+                entry = llm.setdefault(call["label"], {"cached": 0, "slot_wait_ms": [], "call_ms": [], "prompt_chars": [], "response_chars": []})
+                entry["prompt_chars"].append(call["prompt_chars"])
+                if call["cached"]:
+                    entry["cached"] += 1
+                    continue
+                for key in ("slot_wait_ms", "call_ms", "response_chars"):
+                    entry[key].append(call[key])
+            if metrics.get("email_ms") is not None:
+                email.append(metrics["email_ms"])
+
+        report = {
+            "jobs": count,
+            "since": since.isoformat(),
+            "total_seconds": percentiles(totals),
+            "stage_seconds": {stage: percentiles(v) for stage, v in stages.items()},
+            "llm": {
+                label: {
+                    "calls": len(e["prompt_chars"]),
+                    "cached": e["cached"],
+                    **{key: percentiles(e[key]) for key in ("slot_wait_ms", "call_ms", "prompt_chars", "response_chars")},
+                }
+                for label, e in sorted(llm.items())
+            },
+            "fetch": {key: percentiles(v) for key, v in fetch.items()},
+            "email_ms": percentiles(email),
+        }
+
+        if options["json"]:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        self.stdout.write(f"{count} checks since {since:%Y-%m-%d %H:%M} UTC")
+        if not count:
+            return
+
+        def row(name, p, unit=""):
+            if not p:
+                return f"  {name:<24} -"
+            return f"  {name:<24} p50 {p['p50']}{unit}  p90 {p['p90']}{unit}  p95 {p['p95']}{unit}  max {p['max']}{unit}  (n={p['n']})"
+
+        self.stdout.write("stage wall time:")
+        self.stdout.write(row("total", report["total_seconds"], "s"))
+        for stage, p in report["stage_seconds"].items():
+            self.stdout.write(row(stage, p, "s"))
+        self.stdout.write("llm calls (waits, call times and reply sizes leave out calls served from stored results):")
+        for label, e in report["llm"].items():
+            self.stdout.write(f"  {label}: {e['calls']} calls, {e['cached']} served from stored results")
+            self.stdout.write(row("  slot wait", e["slot_wait_ms"], "ms"))
+            self.stdout.write(row("  call", e["call_ms"], "ms"))
+            self.stdout.write(row("  prompt chars", e["prompt_chars"]))
+            self.stdout.write(row("  response chars", e["response_chars"]))
+        self.stdout.write("fetch per check:")
+        self.stdout.write(row("requests", report["fetch"]["requests"]))
+        self.stdout.write(row("bytes", report["fetch"]["bytes"]))
+        self.stdout.write(row("time", report["fetch"]["ms"], "ms"))
+        self.stdout.write(row("report email", report["email_ms"], "ms"))
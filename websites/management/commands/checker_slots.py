@@ -0,0 +1,37 @@
+import json
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Show Claude slot usage, wait-time and LLM latency metrics for the website checker."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--json", action="store_true", help="Print raw JSON instead of a table")
+
+    def handle(self, *args, **options):
+        from django.conf import settings
+        from websites.llm import latency_stats
+        from websites.tasks import CLAUDE_SLOTS
+
+        stats = CLAUDE_SLOTS.stats()
+        stats["llm"] = latency_stats(settings.CHECKER_LLM_BACKEND)
+        if options["json"]:
+            self.stdout.write(json.dumps(stats, indent=2))
+            return
+
+        self.stdout.write(f"slots in use: {stats['in_use']}/{stats['limit']}")
+        for holder in stats["holders"]:
+            self.stdout.write(f"  - {holder}")
+        self.stdout.write(f"acquired: {stats['acquired']}  timeouts: {stats['timeouts']}  expired leases: {stats['expired']}")
+        self.stdout.write(
+            f"wait ms: avg {stats['wait_ms_avg']}  p50 {stats['wait_ms_p50']}  "
+            f"p95 {stats['wait_ms_p95']}  max {stats['wait_ms_max']}"
+        )
+        llm = stats["llm"]
+        if llm["calls"]:
+            self.stdout.write(
+                f"{llm['backend']} latency ms (last {llm['calls']} calls): "
+                f"p50 {llm['ms_p50']}  p95 {llm['ms_p95']}  max {llm['ms_max']}"
+            )
+        else:
+            self.stdout.write(f"{llm['backend']} latency: no calls recorded")
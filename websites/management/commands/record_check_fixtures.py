@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+
+
+class Command(BaseCommand):
+    help = "Fetch sites the way a check does and save the responses as replay fixtures (websites.replay)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("domains", nargs="+", help="Domains to record")
+        parser.add_argument("--fixtures", help="Fixture directory (default: settings.CHECKER_FETCH_FIXTURES)")
+
+    def handle(self, *args, **options):
+        from django.conf import settings
+        from websites import replay
+        from websites.tasks import _prefetch_website_data
+        from websites.views import _normalize_url
+
+        directory = options["fixtures"] or settings.CHECKER_FETCH_FIXTURES
+        with override_settings(CHECKER_FETCH_MODE="record", CHECKER_FETCH_FIXTURES=directory):
+            for raw in options["domains"]:
+                domain = _normalize_url(raw)
+                path = replay.fixture_path(domain)
+                data = _prefetch_website_data(domain)
+                fixture = replay.load(domain) or {"responses": {}}
+                recorded = sum(1 for r in fixture["responses"].values() if r)
+                self.stdout.write(
+                    f"{domain}: {recorded}/{len(fixture['responses'])} responses"
+                    f"{'' if data.get('homepage_html') else ' (homepage unreachable)'} -> {path}"
+                )
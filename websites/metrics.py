@@ -0,0 +1,70 @@
+"""Per-check resource metrics, stored on CheckJob.metrics.
+
+One CheckMetrics collects everything a run spends: fetch requests and
+bytes, and for every LLM call its prompt/response size, slot wait and call
+time (or that it was served from stored results). Level calls record from
+worker threads, hence the lock. as_dict() adds the stage wall times from
+the run's StageClock; each stage task of a check picks up the previous
+stages' numbers with from_dict().
+
+Aggregate with `python manage.py check_stats`.
+"""
+import threading
+
+
+def percentiles(values):
+    """{"n", "p50", "p90", "p95", "max"} of a list of numbers, or None if empty."""
+    values = sorted(values)
+    if not values:
+        return None
+
+    def pct(p):
+        return values[min(len(values) - 1, int(len(values) * p))]
+
+    return {"n": len(values), "p50": pct(0.5), "p90": pct(0.9), "p95": pct(0.95), "max": values[-1]}
+
+
+class CheckMetrics:
+
+    def __init__(self):
+        self.fetch = {"requests": 0, "failed": 0, "bytes": 0, "ms": 0}
+        self.llm = []
+        self.email_ms = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_dict(cls, data):
+        """Carry on from what earlier stages of the same job stored (as_dict())."""
+        metrics = cls()
+        if data:
+            metrics.fetch.update(data.get("fetch", {}))
+            metrics.llm = list(data.get("llm", []))
+            metrics.email_ms = data.get("email_ms")
+        return metrics
+
+    def record_fetch(self, nbytes, ms, ok=True):
+        with self._lock:
+            self.fetch["requests"] += 1
+            self.fetch["bytes"] += nbytes
+            self.fetch["ms"] += ms
+            if not ok:
+                self.fetch["failed"] += 1
+
+    def record_llm(self, label, prompt_chars, response_chars, cached, slot_wait_ms=0, call_ms=0):
+        with self._lock:
+            self.llm.append({
+                "label": label,
+                "prompt_chars": prompt_chars,
+                "response_chars": response_chars,
+                "cached": cached,
+                "slot_wait_ms": slot_wait_ms,
+                "call_ms": call_ms,
+            })
+
+    def as_dict(self, timings):
+        return {
+            "stages": dict(timings),
+            "fetch": dict(self.fetch),
+            "llm": list(self.llm),
+            "email_ms": self.email_ms,
+        }
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.4 on 2026-10-19 02:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('websites', '0006_add_page_content_field'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='checkjob',
+            name='lane',
+            field=models.CharField(default='standard', max_length=20),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.4 on 2026-10-19 02:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('websites', '0007_checkjob_lane'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='checkjob',
+            name='changes',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='checkjob',
+            name='trigger',
+            field=models.CharField(default='user', max_length=20),
+        ),
+    ]
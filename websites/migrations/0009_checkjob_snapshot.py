@@ -0,0 +1,18 @@
+# Generated by Django 5.1.4 on 2026-10-19 02:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('websites', '0008_checkjob_trigger_changes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='checkjob',
+            name='snapshot',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.4 on 2026-10-19 02:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('websites', '0009_checkjob_snapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='checkjob',
+            name='metrics',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
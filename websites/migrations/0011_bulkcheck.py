@@ -0,0 +1,34 @@
+# Generated by Django 5.1.4 on 2026-10-19 02:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_carbon_google_auth_fields'),
+        ('websites', '0010_checkjob_metrics'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BulkCheck',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('items', models.JSONField(default=list)),
+                ('invalid', models.JSONField(default=list)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('carbon', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='accounts.carbon')),
+                ('silicon', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='accounts.silicon')),
+            ],
+            options={
+                'db_table': 'bulk_checks',
+            },
+        ),
+        migrations.AddField(
+            model_name='checkjob',
+            name='bulk',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='jobs', to='websites.bulkcheck'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.4 on 2026-10-19 02:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('websites', '0011_bulkcheck'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='website',
+            name='page_content_fetched_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.4 on 2026-10-19 02:58
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('websites', '0012_website_page_content_fetched_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='checkjob',
+            name='shared_from',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='shared_with', to='websites.checkjob'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.4 on 2026-10-19 03:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('websites', '0013_checkjob_shared_from'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='website',
+            name='snapshot_fetched_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='website',
+            name='snapshot_url',
+            field=models.URLField(blank=True, default='', max_length=500),
+        ),
+    ]
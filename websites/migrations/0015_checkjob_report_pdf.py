@@ -0,0 +1,18 @@
+# Generated by Django 5.1.4 on 2026-10-19 03:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('websites', '0014_website_snapshot_url'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='checkjob',
+            name='report_pdf',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.4 on 2026-10-19 03:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('websites', '0015_checkjob_report_pdf'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='checkjob',
+            name='deadline_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
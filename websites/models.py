@@ -48,7 +48,12 @@ class Website(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     embedding = VectorField(dimensions=768, null=True, blank=True)
+    # Visible text of the homepage (websites.crawler)
     page_content = models.TextField(blank=True, default="")
+    page_content_fetched_at = models.DateTimeField(null=True, blank=True)
+    # The latest check's snapshot, shared with verifiers (websites.shared_snapshots)
+    snapshot_url = models.URLField(max_length=500, blank=True, default="")
+    snapshot_fetched_at = models.DateTimeField(null=True, blank=True)
 
     # L1
     l1_semantic_html = models.BooleanField(default=False)
@@ -154,10 +159,37 @@ class WebsiteVerification(models.Model):
         return f"Verification of {self.website.url} by {verifier}"
 
 
+class BulkCheck(models.Model):
+    """A batch of domains submitted together (websites.bulk)."""
+    carbon = models.ForeignKey(Carbon, on_delete=models.SET_NULL, null=True, blank=True)
+    silicon = models.ForeignKey(Silicon, on_delete=models.SET_NULL, null=True, blank=True)
+    # [{"domain": str, "source": "new" | "recent" | "existing", "job_id": int | None}]
+    items = models.JSONField(default=list)
+    # Submitted entries that weren't valid domains
+    invalid = models.JSONField(default=list)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "bulk_checks"
+
+    def __str__(self):
+        return f"BulkCheck {self.id}: {len(self.items)} domains"
+
+
 class CheckJob(models.Model):
     domain = models.CharField(max_length=255)
     carbon = models.ForeignKey(Carbon, on_delete=models.SET_NULL, null=True, blank=True)
+    # The run this job's results come from when it didn't run its own
+    # (websites.singleflight): a running check it attached to, or a fresh one
+    shared_from = models.ForeignKey("self", on_delete=models.SET_NULL, null=True, blank=True, related_name="shared_with")
+    # Set for jobs created by a bulk submission
+    bulk = models.ForeignKey(BulkCheck, on_delete=models.SET_NULL, null=True, blank=True, related_name="jobs")
     status = models.CharField(max_length=20, default="queued")
+    # Priority lane (websites.queues.CHECK_LANES)
+    lane = models.CharField(max_length=20, default="standard")
+    # "user", "scheduled" (websites.freshness), "bulk" (websites.bulk) or
+    # "benchmark" (the benchmark_checker command)
+    trigger = models.CharField(max_length=20, default="user")
     # Step 0
     website_name = models.CharField(max_length=255, blank=True, default="")
     website_description = models.TextField(blank=True, default="")
@@ -178,6 +210,18 @@ class CheckJob(models.Model):
     overall_level = models.IntegerField(default=0)
     website = models.ForeignKey(Website, on_delete=models.SET_NULL, null=True, blank=True)
     error_message = models.TextField(blank=True, default="")
+    # The parsed site data, so later stages and resumed jobs don't fetch
+    # again (SiteSnapshot.to_bytes() in websites/snapshot.py)
+    snapshot = models.BinaryField(null=True, blank=True)
+    # What this run changed on the Website: {"criteria": {field: new_value},
+    # "level": [old, new], "name": bool, "description": bool}
+    changes = models.JSONField(null=True, blank=True)
+    # Stage wall times, LLM call sizes/waits and fetch volume (websites.metrics)
+    metrics = models.JSONField(null=True, blank=True)
+    # When the run is failed as overdue (websites.cancel); set when a worker first picks it up
+    deadline_at = models.DateTimeField(null=True, blank=True)
+    # The stored PDF report: {"path", "version", "etag", "size"} (websites.report_store)
+    report_pdf = models.JSONField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -0,0 +1,141 @@
+"""Priority lanes and stage queues for website checks.
+
+A check runs as three tasks (websites.tasks.dispatch_check), each on its
+own queue so each worker pool is sized to its own bottleneck:
+  FETCH_QUEUE     - fetching sites; network-bound, run with many threads
+  the lane queues - the LLM work; as many workers as there are Claude slots
+  FINALIZE_QUEUE  - saving results and sending emails
+
+The LLM stage is where jobs wait, so that is where the priority lanes are.
+Each lane is its own Celery queue, and workers consume them in priority
+order (see CELERY_BROKER_TRANSPORT_OPTIONS). Jobs waiting for an LLM worker
+are also mirrored in one Redis sorted set per lane, scored by when their
+site was fetched and they joined the lane queue, so a job's place in line
+is a ZRANK plus the sizes of the lanes ahead of it.
+"""
+import time
+from common.redis_client import get_redis
+from websites.live import publish_job
+from websites.metrics import percentiles
+
+# Highest priority first.
+CHECK_LANES = ("priority", "standard", "bulk")
+LANE_QUEUES = {
+    "priority": "checks_priority",  # paid or owner re-checks
+    "standard": "checks",           # first-time checks
+    "bulk": "checks_bulk",          # bulk and scheduled re-checks
+}
+FETCH_QUEUE = "checks_fetch"
+FINALIZE_QUEUE = "checks_finalize"
+# Worker processes consuming the check lanes, for the wait estimate.
+# Matches websites.tasks.CLAUDE_MAX_CONCURRENT, so every slot has a worker.
+CHECK_WORKERS = 4
+DURATION_SAMPLES = 50
+
+
+def _lane_key(lane):
+    return f"checkq:{lane}"
+
+
+def _durations_key(stage):
+    return f"checkq:durations:{stage}"
+
+
+def enqueue_check(job):
+    """Hand a CheckJob to Celery. It joins its lane once its site is fetched."""
+    from websites.tasks import dispatch_check
+
+    publish_job(job)
+    dispatch_check(job)
+
+
+def join_lane(job):
+    """Put a fetched job in line for an LLM worker (websites.tasks.dispatch_check).
+
+    It keeps its place until the LLM stage picks it up (mark_started) or
+    it ends (leave_lane).
+    """
+    get_redis().zadd(_lane_key(job.lane), {str(job.id): time.time()})
+
+
+def leave_lane(job):
+    get_redis().zrem(_lane_key(job.lane), str(job.id))
+
+
+def mark_started(job):
+    leave_lane(job)
+
+
+def prune_lane(lane):
+    """Drop jobs that ended (or are gone) but are still in the lane. Returns how many."""
+    from websites.live import TERMINAL_STATUSES
+    from websites.models import CheckJob
+
+    client = get_redis()
+    ids = [int(i) for i in client.zrange(_lane_key(lane), 0, -1)]
+    if not ids:
+        return 0
+    waiting = set(CheckJob.objects.filter(id__in=ids).exclude(status__in=TERMINAL_STATUSES).values_list("id", flat=True))
+    dead = [str(i) for i in ids if i not in waiting]
+    if dead:
+        client.zrem(_lane_key(lane), *dead)
+    return len(dead)
+
+
+def lane_size(lane):
+    return get_redis().zcard(_lane_key(lane))
+
+
+def queue_position(job_id, lane):
+    """1-based position across all lanes, or None if the job isn't waiting."""
+    client = get_redis()
+    rank = client.zrank(_lane_key(lane), str(job_id))
+    if rank is None:
+        return None
+    ahead = rank
+    for lane in CHECK_LANES[:CHECK_LANES.index(lane)]:
+        ahead += client.zcard(_lane_key(lane))
+    return ahead + 1
+
+
+def record_stage_duration(stage, seconds):
+    pipe = get_redis().pipeline()
+    pipe.lpush(_durations_key(stage), round(seconds, 2))
+    pipe.ltrim(_durations_key(stage), 0, DURATION_SAMPLES - 1)
+    pipe.execute()
+
+
+class StageClock:
+    """Times the stages of one check run and records each as it ends."""
+
+    def __init__(self):
+        self.stage = None
+        self.started = None
+        self.timings = {}
+
+    def start(self, stage):
+        now = time.monotonic()
+        if self.stage:
+            seconds = now - self.started
+            self.timings[self.stage] = round(seconds, 2)
+            record_stage_duration(self.stage, seconds)
+        self.stage, self.started = stage, now
+
+    def stop(self):
+        self.start(None)
+
+
+def typical_stage_seconds(stage):
+    """Median of the recent durations of one stage (0 if none recorded)."""
+    seconds = percentiles([float(s) for s in get_redis().lrange(_durations_key(stage), 0, -1)])
+    return seconds["p50"] if seconds else 0.0
+
+
+def estimated_start_seconds(position, stages):
+    """Rough wait before a job at `position` starts, from recent stage timings."""
+    job_seconds = sum(typical_stage_seconds(s) for s in stages)
+    if not job_seconds:
+        return None
+    # Every worker is busy if the job is still queued, so even position 1
+    # waits for part of a running job.
+    return int(position / CHECK_WORKERS * job_seconds)
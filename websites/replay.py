@@ -0,0 +1,90 @@
+"""Recorded site fetches, so checks can run without the network.
+
+settings.CHECKER_FETCH_MODE picks what websites.tasks._fetch_url does:
+  "live"   - fetch through websites.crawler (the normal case)
+  "record" - fetch live and also save every response as a fixture
+  "replay" - answer from the fixtures only; nothing leaves the machine.
+             settings.CHECKER_FETCH_REPLAY_LATENCY scales the recorded
+             fetch times that are slept out (0 = instant, 1 = as recorded)
+
+Fixtures are one gzip-compressed JSON file per domain in
+settings.CHECKER_FETCH_FIXTURES:
+  {"domain": ..., "recorded_at": ..., "responses": {url: {"status", "headers", "body", "ms"} or null}}
+A null response, or a URL that was never recorded, replays as a failed fetch.
+
+Record a corpus with `python manage.py record_check_fixtures <domain> ...`;
+`python manage.py benchmark_checker` runs checks against it.
+"""
+import gzip
+import json
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+from django.conf import settings
+from django.utils import timezone
+
+SUFFIX = ".json.gz"
+
+_loaded = {}
+_lock = threading.Lock()
+
+
+def _domain(url):
+    return urlsplit(url).netloc.lower()
+
+
+def fixture_path(domain, directory=None):
+    return os.path.join(directory or settings.CHECKER_FETCH_FIXTURES, f"{domain}{SUFFIX}")
+
+
+def domains(directory=None):
+    """Domains that have a fixture, sorted."""
+    directory = directory or settings.CHECKER_FETCH_FIXTURES
+    if not os.path.isdir(directory):
+        return []
+    return sorted(name[:-len(SUFFIX)] for name in os.listdir(directory) if name.endswith(SUFFIX))
+
+
+def load(domain):
+    """The fixture for `domain` (read once per process), or None."""
+    path = fixture_path(domain)
+    with _lock:
+        if path not in _loaded:
+            try:
+                with gzip.open(path, "rt", encoding="utf-8") as f:
+                    _loaded[path] = json.load(f)
+            except FileNotFoundError:
+                _loaded[path] = None
+        return _loaded[path]
+
+
+def record(url, response, ms):
+    """Add one fetch result (None for a failed fetch) to its domain's fixture."""
+    domain = _domain(url)
+    path = fixture_path(domain)
+    with _lock:
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                fixture = json.load(f)
+        except FileNotFoundError:
+            fixture = {"domain": domain, "responses": {}}
+        fixture["recorded_at"] = timezone.now().isoformat()
+        fixture["responses"][url] = {**response, "ms": ms} if response else None
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            json.dump(fixture, f)
+        _loaded.pop(path, None)
+
+
+def replay(url, metrics=None):
+    """The recorded result for `url`, shaped like websites.crawler.fetch()."""
+    fixture = load(_domain(url))
+    recorded = fixture["responses"].get(url) if fixture else None
+    ms = recorded["ms"] if recorded else 0
+    time.sleep(ms * settings.CHECKER_FETCH_REPLAY_LATENCY / 1000)
+    if metrics:
+        metrics.record_fetch(len(recorded["body"].encode("utf-8")) if recorded else 0, ms, ok=recorded is not None)
+    if recorded is None:
+        return None
+    return {"status": recorded["status"], "headers": recorded["headers"], "body": recorded["body"]}
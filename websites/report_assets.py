@@ -0,0 +1,120 @@
+"""Everything WeasyPrint needs to render a report, without the network.
+
+The report's fonts (Inter and JetBrains Mono) are read from static/fonts,
+subsetted to REPORT_UNICODES with fontTools and kept in memory. url_fetcher()
+serves them to WeasyPrint under the sf-font: scheme and refuses any other
+remote URL, so a render never waits on (or fails for lack of) the network;
+a font whose file is missing falls back to the system fonts.
+
+The stylesheet (the @font-face rules plus websites.report_pdf.REPORT_CSS) is
+parsed once per process and shared by every render, with one
+FontConfiguration. Measure with `python manage.py benchmark_report_pdf`.
+"""
+import functools
+import io
+import logging
+import os
+import threading
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+FONTS_DIR = os.path.join(settings.BASE_DIR, "static", "fonts")
+FONT_SCHEME = "sf-font:"
+# (family, weight) -> file in FONTS_DIR, as released by the font projects
+FONT_FILES = {
+    ("Inter", 400): "Inter-Regular.woff2",
+    ("Inter", 500): "Inter-Medium.woff2",
+    ("Inter", 600): "Inter-SemiBold.woff2",
+    ("Inter", 700): "Inter-Bold.woff2",
+    ("Inter", 800): "Inter-ExtraBold.woff2",
+    ("Inter", 900): "Inter-Black.woff2",
+    ("JetBrains Mono", 400): "JetBrainsMono-Regular.woff2",
+    ("JetBrains Mono", 700): "JetBrainsMono-Bold.woff2",
+}
+# Latin with its supplements and Extended-A, general punctuation, currency
+# symbols, arrows, box drawing and geometric shapes. Other characters (a
+# report quoting a CJK site name, say) come from the system fonts.
+REPORT_UNICODES = [
+    *range(0x20, 0x7F), *range(0xA0, 0x180), *range(0x2000, 0x2070),
+    *range(0x20A0, 0x20C1), *range(0x2190, 0x2200), *range(0x2500, 0x2600),
+]
+
+_stylesheet = None
+_stylesheet_lock = threading.Lock()
+# WeasyPrint's shared FontConfiguration isn't safe to render with from two threads
+_render_lock = threading.Lock()
+
+
+def available_fonts():
+    """The FONT_FILES entries whose file is there."""
+    return {key: name for key, name in FONT_FILES.items() if os.path.exists(os.path.join(FONTS_DIR, name))}
+
+
+@functools.lru_cache(maxsize=None)
+def subset_font(filename):
+    """A font file from FONTS_DIR cut down to REPORT_UNICODES, as sfnt bytes."""
+    from fontTools import subset
+    from fontTools.ttLib import TTFont
+
+    font = TTFont(os.path.join(FONTS_DIR, filename))
+    options = subset.Options()
+    options.layout_features = ["*"]
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(unicodes=REPORT_UNICODES)
+    subsetter.subset(font)
+    # Plain sfnt: WeasyPrint needn't decompress it on every render
+    font.flavor = None
+    out = io.BytesIO()
+    font.save(out)
+    return out.getvalue()
+
+
+def font_face_css():
+    """@font-face rules for the fonts that are there."""
+    fonts = available_fonts()
+    missing = sorted(set(FONT_FILES.values()) - set(fonts.values()))
+    if missing:
+        logger.warning("Report fonts missing from %s, using system fonts instead: %s", FONTS_DIR, ", ".join(missing))
+    return "".join(
+        f"@font-face {{ font-family: '{family}'; font-weight: {weight}; src: url({FONT_SCHEME}{name}); }}\n"
+        for (family, weight), name in fonts.items()
+    )
+
+
+def url_fetcher(url, *args, **kwargs):
+    """WeasyPrint's url_fetcher for reports: fonts from memory, nothing remote."""
+    if url.startswith(FONT_SCHEME):
+        name = url[len(FONT_SCHEME):]
+        if name not in FONT_FILES.values():
+            raise ValueError(f"Unknown report font: {name}")
+        return {"string": subset_font(name), "mime_type": "font/sfnt"}
+    if url.startswith(("data:", "file:")):
+        from weasyprint import default_url_fetcher
+        return default_url_fetcher(url, *args, **kwargs)
+    raise ValueError(f"Reports are rendered offline, not fetching {url}")
+
+
+def stylesheet():
+    """(parsed stylesheet, FontConfiguration), made on first use."""
+    global _stylesheet
+    with _stylesheet_lock:
+        if _stylesheet is None:
+            from weasyprint import CSS
+            from weasyprint.text.fonts import FontConfiguration
+            from websites.report_pdf import REPORT_CSS
+
+            font_config = FontConfiguration()
+            css = CSS(string=font_face_css() + REPORT_CSS, font_config=font_config, url_fetcher=url_fetcher)
+            _stylesheet = (css, font_config)
+        return _stylesheet
+
+
+def render_pdf(html_content):
+    """The report HTML (websites.report_pdf.generate_report_html) as PDF bytes."""
+    from weasyprint import HTML
+
+    css, font_config = stylesheet()
+    with _render_lock:
+        document = HTML(string=html_content, url_fetcher=url_fetcher)
+        return document.write_pdf(stylesheets=[css], font_config=font_config)
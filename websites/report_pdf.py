@@ -4,6 +4,329 @@ import re
 from websites.models import LEVEL_RANGES
 from websites.tasks import CRITERIA_DOCS, LEVEL_NAMES
 
+# Bump whenever the report's HTML or CSS changes: stored PDFs of an older
+# version are rendered again on their next download (websites.report_store).
+REPORT_TEMPLATE_VERSION = 2
+
+# The report's stylesheet. websites.report_assets adds the @font-face rules
+# and parses it once per process.
+REPORT_CSS = """
+@page {
+    size: A4;
+    margin: 56px 48px 72px 48px;
+    background: #ede8e0;
+    @bottom-left {
+        content: "Page " counter(page);
+        font-family: 'JetBrains Mono', monospace;
+        font-size: 9px;
+        color: #999;
+    }
+    @bottom-right {
+        content: element(running-footer);
+    }
+}
+* { margin: 0; padding: 0; box-sizing: border-box; }
+body {
+    font-family: 'Inter', -apple-system, BlinkMacSystemFont, sans-serif;
+    color: #1a1a1a;
+    line-height: 1.65;
+    font-size: 12.5px;
+    background: #ede8e0;
+    -webkit-font-smoothing: antialiased;
+}
+
+/* Cover */
+.cover {
+    page-break-after: always;
+    display: flex;
+    flex-direction: column;
+    justify-content: center;
+    align-items: center;
+    min-height: 720px;
+    text-align: center;
+}
+.cover-level {
+    font-family: 'JetBrains Mono', monospace;
+    font-size: 80px;
+    font-weight: 700;
+    margin-bottom: 20px;
+    padding: 20px 40px;
+    color: #1a1a1a;
+}
+.cover-level.none {
+    border: 3px dashed #d4cfc7;
+    color: #999;
+}
+.cover-domain {
+    font-family: 'Inter', sans-serif;
+    font-size: 48px;
+    font-weight: 900;
+    letter-spacing: -0.04em;
+    margin-bottom: 12px;
+    color: #1a1a1a;
+}
+.cover-subtitle {
+    font-family: 'JetBrains Mono', monospace;
+    font-size: 13px;
+    color: #666;
+    text-transform: uppercase;
+    letter-spacing: 0.2em;
+}
+.cover-date {
+    font-family: 'JetBrains Mono', monospace;
+    font-size: 10px;
+    color: #999;
+    margin-top: 48px;
+}
+.cover-name {
+    font-family: 'Inter', sans-serif;
+    font-size: 14px;
+    color: #999;
+    margin-top: 8px;
+    font-weight: 500;
+}
+
+/* Page breaks */
+.page-break { page-break-before: always; }
+
+/* Typography */
+h1 {
+    font-family: 'Inter', sans-serif;
+    font-size: 24px;
+    font-weight: 900;
+    letter-spacing: -0.03em;
+    margin-bottom: 6px;
+    color: #1a1a1a;
+}
+h2 {
+    font-family: 'Inter', sans-serif;
+    font-size: 18px;
+    font-weight: 800;
+    margin-top: 28px;
+    margin-bottom: 10px;
+    color: #1a1a1a;
+    letter-spacing: -0.02em;
+}
+h3 {
+    font-family: 'Inter', sans-serif;
+    font-size: 15px;
+    font-weight: 700;
+    margin-top: 24px;
+    margin-bottom: 8px;
+    color: #1a1a1a;
+}
+p {
+    margin-bottom: 10px;
+}
+strong {
+    font-weight: 700;
+}
+code {
+    font-family: 'JetBrains Mono', monospace;
+    font-size: 11px;
+    background: rgba(26,26,26,0.06);
+    padding: 1px 5px;
+    border: 1px solid #d4cfc7;
+}
+hr {
+    border: none;
+    border-top: 1px solid #d4cfc7;
+    margin: 24px 0;
+}
+ul, ol {
+    margin: 10px 0 10px 24px;
+}
+li {
+    margin-bottom: 6px;
+    line-height: 1.6;
+}
+
+/* Level header */
+.level-header {
+    display: flex;
+    align-items: center;
+    gap: 16px;
+    margin-bottom: 28px;
+    padding-bottom: 14px;
+    border-bottom: 2px solid #1a1a1a;
+}
+.level-badge {
+    font-family: 'JetBrains Mono', monospace;
+    font-size: 22px;
+    font-weight: 700;
+    padding: 6px 14px;
+    border: 2px solid #1a1a1a;
+    background: #1a1a1a;
+    color: #ede8e0;
+}
+.level-title {
+    font-family: 'Inter', sans-serif;
+    font-size: 20px;
+    font-weight: 800;
+    letter-spacing: -0.02em;
+}
+.level-status {
+    font-family: 'JetBrains Mono', monospace;
+    font-size: 12px;
+    font-weight: 700;
+    text-transform: uppercase;
+    letter-spacing: 0.1em;
+}
+.level-status.pass { color: #5a9a6b; }
+.level-status.fail { color: #b85c5c; }
+
+/* Criteria */
+.criterion {
+    padding: 14px 0;
+    border-bottom: 1px solid #d4cfc7;
+}
+.criterion:last-child { border-bottom: none; }
+.criterion-header {
+    display: flex;
+    justify-content: space-between;
+    align-items: flex-start;
+    margin-bottom: 5px;
+}
+.criterion-label {
+    font-family: 'Inter', sans-serif;
+    font-weight: 700;
+    font-size: 13px;
+    flex: 1;
+    padding-right: 16px;
+}
+.criterion-status {
+    font-family: 'JetBrains Mono', monospace;
+    font-size: 11px;
+    font-weight: 700;
+    letter-spacing: 0.1em;
+    flex-shrink: 0;
+}
+.criterion-status.pass { color: #5a9a6b; }
+.criterion-status.fail { color: #b85c5c; }
+.criterion-reason {
+    font-size: 12px;
+    color: #555;
+    line-height: 1.6;
+}
+
+/* Report */
+.report-content {
+    font-size: 12.5px;
+    line-height: 1.8;
+}
+.report-content h1 { font-size: 22px; margin-top: 32px; }
+.report-content h2 { font-size: 17px; margin-top: 28px; }
+.report-content h3 { font-size: 14px; margin-top: 22px; }
+
+/* Competitors */
+
+/* Advice */
+.key-message {
+    font-weight: 700;
+    font-style: italic;
+    color: #1a1a1a;
+    margin-top: 16px;
+}
+
+/* CTA */
+.cta-box {
+    border: 1.5px solid #d4cfc7;
+    padding: 20px 24px;
+    margin: 28px 0;
+    font-size: 12px;
+    line-height: 1.7;
+    color: #666;
+}
+
+/* Running footer with clickable links */
+.running-footer {
+    position: running(running-footer);
+    font-family: 'JetBrains Mono', monospace;
+    font-size: 9px;
+}
+.running-footer a {
+    color: #999;
+    text-decoration: none;
+}
+
+/* Code fence (```language blocks) */
+.code-fence {
+    background: #1a1a1a;
+    color: #ede8e0;
+    padding: 16px 20px;
+    font-family: 'JetBrains Mono', monospace;
+    font-size: 10.5px;
+    line-height: 1.6;
+    white-space: pre-wrap;
+    word-wrap: break-word;
+    margin: 12px 0 16px 0;
+    overflow-x: auto;
+}
+.code-fence code {
+    background: none;
+    border: none;
+    padding: 0;
+    font-size: inherit;
+    color: inherit;
+}
+.code-lang {
+    font-family: 'JetBrains Mono', monospace;
+    font-size: 9px;
+    color: #999;
+    text-transform: uppercase;
+    letter-spacing: 0.1em;
+    margin-top: 12px;
+    margin-bottom: -8px;
+}
+
+/* Code block */
+.code-block {
+    background: #1a1a1a;
+    color: #ede8e0;
+    padding: 14px 18px;
+    font-family: 'JetBrains Mono', monospace;
+    font-size: 10.5px;
+    word-break: break-all;
+    line-height: 1.5;
+}
+.embed-box {
+    margin-top: 28px;
+    padding: 20px;
+    border: 1px solid #d4cfc7;
+}
+
+/* About */
+.about-level {
+    display: flex;
+    align-items: flex-start;
+    gap: 12px;
+    margin-bottom: 10px;
+}
+.about-level-tag {
+    font-family: 'JetBrains Mono', monospace;
+    font-weight: 700;
+    font-size: 12px;
+    background: #1a1a1a;
+    color: #ede8e0;
+    padding: 2px 8px;
+    flex-shrink: 0;
+}
+.about-level-desc {
+    font-size: 12.5px;
+    color: #555;
+}
+
+/* Section label */
+.section-label {
+    font-family: 'JetBrains Mono', monospace;
+    font-size: 10px;
+    text-transform: uppercase;
+    letter-spacing: 0.15em;
+    color: #999;
+    margin-bottom: 20px;
+}
+"""
+
 
 def _get_competitors(website, limit=9):
     """Find similar websites using vector search. Returns 9 others (we add self to make 10)."""
@@ -211,7 +534,7 @@ def _level_advice(level):
 
 
 def generate_report_html(job):
-    """Generate the complete HTML for the PDF report."""
+    """Generate the complete HTML for the PDF report (styled by REPORT_CSS)."""
     website = job.website
     level = website.level if website else job.overall_level
     domain = job.domain
@@ -259,319 +582,7 @@ def generate_report_html(job):
 <html>
 <head>
 <meta charset="utf-8">
-<style>
-@import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700;800;900&family=JetBrains+Mono:wght@400;700&display=swap');
-
-@page {{
-    size: A4;
-    margin: 56px 48px 72px 48px;
-    background: #ede8e0;
-    @bottom-left {{
-        content: "Page " counter(page);
-        font-family: 'JetBrains Mono', monospace;
-        font-size: 9px;
-        color: #999;
-    }}
-    @bottom-right {{
-        content: element(running-footer);
-    }}
-}}
-* {{ margin: 0; padding: 0; box-sizing: border-box; }}
-body {{
-    font-family: 'Inter', -apple-system, BlinkMacSystemFont, sans-serif;
-    color: #1a1a1a;
-    line-height: 1.65;
-    font-size: 12.5px;
-    background: #ede8e0;
-    -webkit-font-smoothing: antialiased;
-}}
-
-/* Cover */
-.cover {{
-    page-break-after: always;
-    display: flex;
-    flex-direction: column;
-    justify-content: center;
-    align-items: center;
-    min-height: 720px;
-    text-align: center;
-}}
-.cover-level {{
-    font-family: 'JetBrains Mono', monospace;
-    font-size: 80px;
-    font-weight: 700;
-    margin-bottom: 20px;
-    {f'border: 3px dashed #d4cfc7; padding: 20px 40px; color: #999;' if level == 0 else f'padding: 20px 40px; color: #1a1a1a;'}
-}}
-.cover-domain {{
-    font-family: 'Inter', sans-serif;
-    font-size: 48px;
-    font-weight: 900;
-    letter-spacing: -0.04em;
-    margin-bottom: 12px;
-    color: #1a1a1a;
-}}
-.cover-subtitle {{
-    font-family: 'JetBrains Mono', monospace;
-    font-size: 13px;
-    color: #666;
-    text-transform: uppercase;
-    letter-spacing: 0.2em;
-}}
-.cover-date {{
-    font-family: 'JetBrains Mono', monospace;
-    font-size: 10px;
-    color: #999;
-    margin-top: 48px;
-}}
-.cover-name {{
-    font-family: 'Inter', sans-serif;
-    font-size: 14px;
-    color: #999;
-    margin-top: 8px;
-    font-weight: 500;
-}}
-
-/* Page breaks */
-.page-break {{ page-break-before: always; }}
-
-/* Typography */
-h1 {{
-    font-family: 'Inter', sans-serif;
-    font-size: 24px;
-    font-weight: 900;
-    letter-spacing: -0.03em;
-    margin-bottom: 6px;
-    color: #1a1a1a;
-}}
-h2 {{
-    font-family: 'Inter', sans-serif;
-    font-size: 18px;
-    font-weight: 800;
-    margin-top: 28px;
-    margin-bottom: 10px;
-    color: #1a1a1a;
-    letter-spacing: -0.02em;
-}}
-h3 {{
-    font-family: 'Inter', sans-serif;
-    font-size: 15px;
-    font-weight: 700;
-    margin-top: 24px;
-    margin-bottom: 8px;
-    color: #1a1a1a;
-}}
-p {{
-    margin-bottom: 10px;
-}}
-strong {{
-    font-weight: 700;
-}}
-code {{
-    font-family: 'JetBrains Mono', monospace;
-    font-size: 11px;
-    background: rgba(26,26,26,0.06);
-    padding: 1px 5px;
-    border: 1px solid #d4cfc7;
-}}
-hr {{
-    border: none;
-    border-top: 1px solid #d4cfc7;
-    margin: 24px 0;
-}}
-ul, ol {{
-    margin: 10px 0 10px 24px;
-}}
-li {{
-    margin-bottom: 6px;
-    line-height: 1.6;
-}}
-
-/* Level header */
-.level-header {{
-    display: flex;
-    align-items: center;
-    gap: 16px;
-    margin-bottom: 28px;
-    padding-bottom: 14px;
-    border-bottom: 2px solid #1a1a1a;
-}}
-.level-badge {{
-    font-family: 'JetBrains Mono', monospace;
-    font-size: 22px;
-    font-weight: 700;
-    padding: 6px 14px;
-    border: 2px solid #1a1a1a;
-    background: #1a1a1a;
-    color: #ede8e0;
-}}
-.level-title {{
-    font-family: 'Inter', sans-serif;
-    font-size: 20px;
-    font-weight: 800;
-    letter-spacing: -0.02em;
-}}
-.level-status {{
-    font-family: 'JetBrains Mono', monospace;
-    font-size: 12px;
-    font-weight: 700;
-    text-transform: uppercase;
-    letter-spacing: 0.1em;
-}}
-.level-status.pass {{ color: #5a9a6b; }}
-.level-status.fail {{ color: #b85c5c; }}
-
-/* Criteria */
-.criterion {{
-    padding: 14px 0;
-    border-bottom: 1px solid #d4cfc7;
-}}
-.criterion:last-child {{ border-bottom: none; }}
-.criterion-header {{
-    display: flex;
-    justify-content: space-between;
-    align-items: flex-start;
-    margin-bottom: 5px;
-}}
-.criterion-label {{
-    font-family: 'Inter', sans-serif;
-    font-weight: 700;
-    font-size: 13px;
-    flex: 1;
-    padding-right: 16px;
-}}
-.criterion-status {{
-    font-family: 'JetBrains Mono', monospace;
-    font-size: 11px;
-    font-weight: 700;
-    letter-spacing: 0.1em;
-    flex-shrink: 0;
-}}
-.criterion-status.pass {{ color: #5a9a6b; }}
-.criterion-status.fail {{ color: #b85c5c; }}
-.criterion-reason {{
-    font-size: 12px;
-    color: #555;
-    line-height: 1.6;
-}}
-
-/* Report */
-.report-content {{
-    font-size: 12.5px;
-    line-height: 1.8;
-}}
-.report-content h1 {{ font-size: 22px; margin-top: 32px; }}
-.report-content h2 {{ font-size: 17px; margin-top: 28px; }}
-.report-content h3 {{ font-size: 14px; margin-top: 22px; }}
-
-/* Competitors */
-
-/* Advice */
-.key-message {{
-    font-weight: 700;
-    font-style: italic;
-    color: #1a1a1a;
-    margin-top: 16px;
-}}
-
-/* CTA */
-.cta-box {{
-    border: 1.5px solid #d4cfc7;
-    padding: 20px 24px;
-    margin: 28px 0;
-    font-size: 12px;
-    line-height: 1.7;
-    color: #666;
-}}
-
-/* Running footer with clickable links */
-.running-footer {{
-    position: running(running-footer);
-    font-family: 'JetBrains Mono', monospace;
-    font-size: 9px;
-}}
-.running-footer a {{
-    color: #999;
-    text-decoration: none;
-}}
-
-/* Code fence (```language blocks) */
-.code-fence {{
-    background: #1a1a1a;
-    color: #ede8e0;
-    padding: 16px 20px;
-    font-family: 'JetBrains Mono', monospace;
-    font-size: 10.5px;
-    line-height: 1.6;
-    white-space: pre-wrap;
-    word-wrap: break-word;
-    margin: 12px 0 16px 0;
-    overflow-x: auto;
-}}
-.code-fence code {{
-    background: none;
-    border: none;
-    padding: 0;
-    font-size: inherit;
-    color: inherit;
-}}
-.code-lang {{
-    font-family: 'JetBrains Mono', monospace;
-    font-size: 9px;
-    color: #999;
-    text-transform: uppercase;
-    letter-spacing: 0.1em;
-    margin-top: 12px;
-    margin-bottom: -8px;
-}}
-
-/* Code block */
-.code-block {{
-    background: #1a1a1a;
-    color: #ede8e0;
-    padding: 14px 18px;
-    font-family: 'JetBrains Mono', monospace;
-    font-size: 10.5px;
-    word-break: break-all;
-    line-height: 1.5;
-}}
-.embed-box {{
-    margin-top: 28px;
-    padding: 20px;
-    border: 1px solid #d4cfc7;
-}}
-
-/* About */
-.about-level {{
-    display: flex;
-    align-items: flex-start;
-    gap: 12px;
-    margin-bottom: 10px;
-}}
-.about-level-tag {{
-    font-family: 'JetBrains Mono', monospace;
-    font-weight: 700;
-    font-size: 12px;
-    background: #1a1a1a;
-    color: #ede8e0;
-    padding: 2px 8px;
-    flex-shrink: 0;
-}}
-.about-level-desc {{
-    font-size: 12.5px;
-    color: #555;
-}}
-
-/* Section label */
-.section-label {{
-    font-family: 'JetBrains Mono', monospace;
-    font-size: 10px;
-    text-transform: uppercase;
-    letter-spacing: 0.15em;
-    color: #999;
-    margin-bottom: 20px;
-}}
-</style>
+<meta name="dcterms.created" content="{job.created_at.isoformat()}">
 </head>
 <body>
 
@@ -581,7 +592,7 @@ li {{
 
 <!-- COVER -->
 <div class="cover">
-    <div class="cover-level">L{level}</div>
+    <div class="cover-level{' none' if level == 0 else ''}">L{level}</div>
     <div class="cover-domain">{html.escape(domain)}.</div>
     <div class="cover-subtitle">
         {'not silicon friendly yet' if level == 0 else f'level {level}: {LEVEL_NAMES.get(level, "").lower()}'}
@@ -696,7 +707,5 @@ def _render_competitor(c, index):
 
 def generate_pdf(job):
     """Generate PDF bytes from a CheckJob."""
-    import weasyprint
-    html_content = generate_report_html(job)
-    pdf = weasyprint.HTML(string=html_content).write_pdf()
-    return pdf
+    from websites.report_assets import render_pdf
+    return render_pdf(generate_report_html(job))
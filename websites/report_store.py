@@ -0,0 +1,72 @@
+"""Check reports as PDFs rendered once and kept in object storage.
+
+When a check finishes, websites.tasks.render_report_pdfs renders its PDF
+(websites.report_pdf) and uploads it via core.storage; CheckJob.report_pdf
+records {"path", "version", "etag", "size"}. report_download_view serves
+downloads from storage, with ETag and Range support, and renders again only
+for a job whose PDF is missing or was made from an older
+REPORT_TEMPLATE_VERSION (that render is stored too).
+"""
+import hashlib
+import io
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def stored_pdf(job):
+    """The job's stored PDF record, or None if it has none of the current template version."""
+    from websites.report_pdf import REPORT_TEMPLATE_VERSION
+
+    record = job.report_pdf
+    if record and record.get("version") == REPORT_TEMPLATE_VERSION:
+        return record
+    return None
+
+
+def render_and_store(job):
+    """Render the job's PDF and upload it.
+
+    Returns (record, pdf bytes); the record is None if the upload failed.
+    """
+    from core.storage import upload_file
+    from websites.report_pdf import REPORT_TEMPLATE_VERSION, generate_pdf
+
+    pdf = generate_pdf(job)
+    digest = hashlib.sha256(pdf).hexdigest()
+    path = f"reports/{job.id}/v{REPORT_TEMPLATE_VERSION}-{digest[:24]}.pdf"
+    try:
+        upload_file(io.BytesIO(pdf), path, content_type="application/pdf")
+    except Exception as e:
+        logger.warning("Could not store the PDF report of CheckJob %s: %s", job.id, e)
+        return None, pdf
+    job.report_pdf = {"path": path, "version": REPORT_TEMPLATE_VERSION, "etag": f'"{digest[:32]}"', "size": len(pdf)}
+    job.save(update_fields=["report_pdf", "updated_at"])
+    return job.report_pdf, pdf
+
+
+def parse_range(header, size):
+    """The (start, end) bytes, inclusive, asked for by a single-range Range header.
+
+    None means send the whole file (no header, several ranges or a malformed
+    one); ValueError means the range can't be satisfied (416).
+    """
+    match = RANGE_RE.match((header or "").strip())
+    if not match or match.groups() == ("", ""):
+        return None
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+        if last and int(last) < start:
+            return None
+    else:
+        if int(last) == 0:
+            raise ValueError("empty suffix range")
+        start, end = max(size - int(last), 0), size - 1
+    if start >= size:
+        raise ValueError("range starts past the end")
+    return start, end
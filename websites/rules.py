@@ -0,0 +1,158 @@
+"""Deterministic checks for criteria that can be decided from the prefetched data.
+
+evaluate_local_criteria() returns {field: {"pass": bool, "reason": str}} for
+every criterion it can decide with confidence. Anything it leaves out is
+ambiguous and goes to Claude as before. All parsing happens in
+websites.snapshot; the checks here only read the SiteSnapshot.
+"""
+from websites.condense import SEMANTIC_TAGS
+from websites.snapshot import load_json
+
+RATE_LIMIT_HEADER_HINTS = ("ratelimit", "rate-limit", "retry-after", "x-rate")
+
+
+def _check_semantic_html(page):
+    found = [t for t in SEMANTIC_TAGS if page["semantic_counts"].get(t)]
+    if len(found) >= 3:
+        return True, f"Found semantic elements: {', '.join(found)}"
+    if not found:
+        return False, "No semantic elements (header, nav, main, article, section, footer, aside) in the homepage HTML"
+    return None
+
+
+def _check_meta_tags(page):
+    title = page["title"].strip()
+    description = page["meta"].get("description")
+    og = sorted(k for k in page["meta"] if k.startswith("og:"))
+    twitter = "twitter:card" in page["meta"]
+    missing = []
+    if not title:
+        missing.append("<title>")
+    if not description:
+        missing.append("meta description")
+    if not og:
+        missing.append("og: tags")
+    if missing:
+        return False, f"Missing {', '.join(missing)}"
+    extra = ", twitter:card" if twitter else ""
+    return True, f"Has title, meta description and {', '.join(og)}{extra}"
+
+
+def _check_schema_org(page):
+    types = []
+    invalid = 0
+    for block in page["json_ld"]:
+        doc = load_json(block.strip())
+        if doc is None:
+            invalid += 1
+            continue
+        if isinstance(doc, list):
+            items = doc
+        elif isinstance(doc, dict):
+            items = doc.get("@graph", [doc])
+        else:
+            items = []
+        for item in items:
+            if isinstance(item, dict) and item.get("@type"):
+                t = item["@type"]
+                types.extend(t if isinstance(t, list) else [t])
+    if types:
+        return True, f"JSON-LD found with types: {', '.join(str(t) for t in types[:6])}"
+    if invalid or page["has_microdata"]:
+        # Broken JSON-LD or microdata only: let Claude judge.
+        return None
+    return False, "No Schema.org JSON-LD (<script type=\"application/ld+json\">) in the homepage HTML"
+
+
+def _check_robots_txt(robots):
+    if not robots["found"]:
+        return False, "GET /robots.txt did not return 200"
+    if robots["is_html"]:
+        return False, "/robots.txt returns an HTML page, not a robots.txt file"
+    if not robots["allows_root"]:
+        return False, "robots.txt disallows the site root for all user agents"
+    return True, "robots.txt present and allows crawling of the site root"
+
+
+def _check_sitemap(sitemap, robots):
+    if sitemap["found"] and sitemap["kind"] == "sitemapindex":
+        return True, "/sitemap.xml is a sitemap index"
+    if sitemap["found"] and sitemap["kind"] == "urlset":
+        return True, f"/sitemap.xml is a valid urlset ({sitemap['url_count']}+ URLs in the first 10k chars)"
+    directives = robots.get("sitemaps")
+    if directives:
+        return True, f"Sitemap referenced in robots.txt: {directives[0]}"
+    if sitemap["found"]:
+        return False, "/sitemap.xml does not contain a <urlset> or <sitemapindex> and robots.txt has no Sitemap: line"
+    return False, "No /sitemap.xml and no Sitemap: directive in robots.txt"
+
+
+def _check_llms_txt(llms):
+    if not llms["found"]:
+        return False, "GET /llms.txt did not return 200"
+    if llms["is_html"]:
+        return False, "/llms.txt returns an HTML page (likely a soft 404)"
+    if llms["chars"] < 20:
+        return False, "/llms.txt is empty or nearly empty"
+    return True, f"/llms.txt present ({llms['chars']} chars)"
+
+
+def _check_openapi_spec(snap):
+    openapi = snap.openapi
+    path = snap.openapi_path
+    if openapi["found"]:
+        if openapi["version"]:
+            return True, f"OpenAPI/Swagger {openapi['version']} spec served at {path}"
+        if openapi["ui"]:
+            return True, f"Swagger UI / ReDoc served at {path}"
+        # Truncated or YAML spec, or a generic page: ambiguous.
+        return None
+    if snap.docs:
+        docs = " ".join([snap.docs["text"]] + snap.docs["signals"]).lower()
+        if "openapi" in docs or "swagger" in docs:
+            return None
+    return False, "No spec at /openapi.json, /swagger.json or /api-docs, and no docs page mentioning one"
+
+
+def _check_a2a_agent_card(agent_json, doc):
+    if agent_json is None:
+        return False, "GET /.well-known/agent.json did not return 200"
+    if doc is None:
+        return False, "/.well-known/agent.json is not valid JSON"
+    if isinstance(doc, dict) and any(k in doc for k in ("name", "skills", "capabilities", "description")):
+        return True, f"Agent card present with keys: {', '.join(list(doc.keys())[:8])}"
+    return None
+
+
+def _check_rate_limits(snap):
+    headers = dict(snap.rate_limit_headers)
+    api = snap.api_response or {}
+    headers.update(api.get("headers") or {})
+    found = [k for k in headers if any(h in k.lower() for h in RATE_LIMIT_HEADER_HINTS)]
+    if api.get("status") == 429 and any("retry-after" in k.lower() for k in found):
+        return True, "API returned 429 with a Retry-After header"
+    if found:
+        return True, f"Rate limit headers returned: {', '.join(found)}"
+    # Limits may still be documented in prose.
+    return None
+
+
+def evaluate_local_criteria(snap):
+    """Decide what can be decided locally. Returns {field: {"pass", "reason"}}."""
+    page = snap.homepage
+    checks = {
+        "l1_semantic_html": _check_semantic_html(page),
+        "l1_meta_tags": _check_meta_tags(page),
+        "l1_schema_org": _check_schema_org(page),
+        "l2_robots_txt": _check_robots_txt(snap.robots),
+        "l2_sitemap": _check_sitemap(snap.sitemap, snap.robots),
+        "l2_llms_txt": _check_llms_txt(snap.llms),
+        "l2_openapi_spec": _check_openapi_spec(snap),
+        "l3_a2a_agent_card": _check_a2a_agent_card(snap.agent_json, snap.agent_card),
+        "l3_rate_limits_documented": _check_rate_limits(snap),
+    }
+    return {
+        field: {"pass": outcome[0], "reason": outcome[1]}
+        for field, outcome in checks.items()
+        if outcome is not None
+    }
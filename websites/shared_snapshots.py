@@ -0,0 +1,58 @@
+"""Checked sites' snapshots, shared with verifiers through object storage.
+
+When a check finishes, websites.tasks.archive_site_snapshot uploads its
+SiteSnapshot (websites.snapshot) as gzip-compressed JSON via core.storage
+and points the Website at it (snapshot_url, snapshot_fetched_at). Silicons
+read it from GET /api/websites/<domain>/snapshot/ or the get_site_snapshot
+MCP tool and evaluate the criteria from that one crawl instead of each
+crawling the site themselves.
+
+Every upload gets its own path, so the CDN never serves an older copy
+under a newer snapshot_fetched_at.
+"""
+import gzip
+import io
+import json
+import uuid
+import requests
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+CONTENT_TYPE = "application/gzip"
+DOWNLOAD_TIMEOUT = 10
+# Older than this, verifiers are told to look at the site themselves too.
+STALE_AFTER_SECONDS = 60 * 60 * 24 * 7
+
+
+def snapshot_fetched_at(snap):
+    """When the site was fetched for `snap`, or None for snapshots that didn't record it."""
+    return parse_datetime(snap.fetched_at) if snap.fetched_at else None
+
+
+def upload_snapshot(snap, fetched_at):
+    """Upload `snap` and return its URL."""
+    from core.storage import upload_file
+
+    body = gzip.compress(json.dumps(snap.to_dict(), separators=(",", ":")).encode("utf-8"))
+    path = f"snapshots/{snap.domain}/{fetched_at:%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}.json.gz"
+    return upload_file(io.BytesIO(body), path, content_type=CONTENT_TYPE)
+
+
+def download_snapshot(url):
+    """The snapshot dict stored at `url` (for clients that can't take the file)."""
+    resp = requests.get(url, timeout=DOWNLOAD_TIMEOUT)
+    resp.raise_for_status()
+    return json.loads(gzip.decompress(resp.content).decode("utf-8"))
+
+
+def snapshot_info(website):
+    """{"url", "fetched_at", "age_seconds", "stale"} of the site's shared snapshot, or None."""
+    if not website.snapshot_url or not website.snapshot_fetched_at:
+        return None
+    age = int((timezone.now() - website.snapshot_fetched_at).total_seconds())
+    return {
+        "url": website.snapshot_url,
+        "fetched_at": website.snapshot_fetched_at.isoformat(),
+        "age_seconds": age,
+        "stale": age > STALE_AFTER_SECONDS,
+    }
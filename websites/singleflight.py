@@ -0,0 +1,147 @@
+"""One check pipeline per domain at a time, shared by everyone who asks.
+
+start_check() is how every new CheckJob gets going:
+  - a done check of the domain from the last FRESH_RESULT_WINDOW is copied
+    into the job, which is done straight away (no fetch, no LLM calls)
+  - otherwise, if another job is already checking the domain, the new job
+    attaches to it (shared_from): it mirrors that job's live state and gets
+    its results when it finishes
+  - otherwise the job becomes the domain's leader and is queued as usual
+
+Leadership is a Redis key per domain (checkflight:<domain>, the leader's
+job id), claimed atomically. Followers are kept in a set per leader that
+websites.live fans each update out to. finish_flight() copies the leader's
+outcome into the follower rows and hands the domain back.
+
+Priority-lane jobs (owner and paid re-checks) are about seeing a fix land,
+so they never reuse or attach; they always run, and others attach to them.
+"""
+import logging
+from datetime import timedelta
+from django.utils import timezone
+from common.redis_client import get_redis
+from websites.live import TERMINAL_STATUSES, followers_key, job_state, publish_job, store_follower_state
+
+logger = logging.getLogger(__name__)
+
+FRESH_RESULT_WINDOW = timedelta(hours=1)
+# Upper bound on one run; the key is released earlier when the leader finishes.
+FLIGHT_TTL = 60 * 60 * 2
+# Leader fields that followers get when it finishes.
+SHARED_FIELDS = (
+    ["website_name", "website_description", "report_md", "overall_level", "website", "error_message"]
+    + [f"level_{n}_{kind}" for n in range(1, 6) for kind in ("results", "reasoning")]
+)
+
+# Take the flight if it's free or still held by `stale` (a finished leader).
+_CLAIM_LUA = """
+local cur = redis.call('GET', KEYS[1])
+if (not cur) or cur == ARGV[2] then
+    redis.call('SET', KEYS[1], ARGV[1], 'EX', tonumber(ARGV[3]))
+    return ARGV[1]
+end
+return cur
+"""
+
+_RELEASE_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+def _flight_key(domain):
+    return f"checkflight:{domain}"
+
+
+def _claim(domain, job_id, stale=""):
+    """Returns the id of the domain's leader after trying to become it."""
+    script = get_redis().register_script(_CLAIM_LUA)
+    return int(script(keys=[_flight_key(domain)], args=[job_id, stale, FLIGHT_TTL]))
+
+
+def fresh_result(domain):
+    from websites.models import CheckJob
+
+    return (
+        CheckJob.objects.filter(
+            domain=domain, status="done", shared_from__isnull=True,
+            updated_at__gte=timezone.now() - FRESH_RESULT_WINDOW,
+        )
+        .order_by("-updated_at").first()
+    )
+
+
+def start_check(job):
+    """Serve, attach or queue a new CheckJob (see module doc)."""
+    from websites.models import CheckJob
+    from websites.queues import enqueue_check
+
+    if job.lane != "priority":
+        source = fresh_result(job.domain)
+        if source:
+            job.shared_from = source
+            _settle(job, source)
+            return
+
+    stale = ""
+    for _ in range(3):
+        leader_id = _claim(job.domain, job.id, stale)
+        if leader_id == job.id:
+            enqueue_check(job)
+            return
+        leader = CheckJob.objects.filter(id=leader_id).first()
+        if leader is None or leader.status in TERMINAL_STATUSES:
+            stale = str(leader_id)
+            continue
+        if job.lane == "priority":
+            # Runs anyway; the current leader keeps its followers
+            enqueue_check(job)
+            return
+        _attach(job, leader)
+        return
+    enqueue_check(job)
+
+
+def _attach(job, leader):
+    job.shared_from = leader
+    job.status = leader.status
+    job.save(update_fields=["shared_from", "status", "updated_at"])
+    get_redis().sadd(followers_key(leader.id), job.id)
+    logger.info("CheckJob %s attached to running check %s of %s", job.id, leader.id, job.domain)
+
+    # The leader may have finished before this row was saved, in which case
+    # finish_flight() didn't see it
+    leader.refresh_from_db()
+    if leader.status in TERMINAL_STATUSES:
+        _settle(job, leader)
+        return
+    state = job_state(leader.id)
+    if state:
+        store_follower_state(job.id, leader.id, state)
+
+
+def _settle(follower, leader):
+    for field in SHARED_FIELDS:
+        setattr(follower, field, getattr(leader, field))
+    follower.status = leader.status
+    follower.save(update_fields=SHARED_FIELDS + ["status", "updated_at"])
+    publish_job(follower)
+
+
+def finish_flight(job):
+    """Give the leader's outcome to its followers and release the domain.
+
+    Returns the followers that were updated.
+    """
+    from websites.models import CheckJob
+
+    client = get_redis()
+    client.register_script(_RELEASE_LUA)(keys=[_flight_key(job.domain)], args=[job.id])
+    client.delete(followers_key(job.id))
+
+    followers = list(CheckJob.objects.filter(shared_from=job).exclude(status__in=TERMINAL_STATUSES))
+    for follower in followers:
+        _settle(follower, job)
+    return followers
@@ -0,0 +1,88 @@
+"""A site's name and description, read from its own homepage metadata.
+
+extract_site_info() looks at the condensed homepage (websites.condense):
+  name        - og:site_name, application-name, the name of a JSON-LD
+                Organization/WebSite-like item, or the brand part of <title>
+  description - meta description, og:description, a JSON-LD description or
+                twitter:description, whichever comes first at MIN_DESCRIPTION_CHARS
+It returns None unless it finds both, and step 0 then asks Claude as before.
+"""
+import re
+from websites.snapshot import load_json
+
+# Step 0 asks Claude for 150+ characters; shorter metadata isn't good enough.
+MIN_DESCRIPTION_CHARS = 150
+MAX_NAME_CHARS = 60
+NAMED_TYPES = ("Organization", "Corporation", "WebSite", "SoftwareApplication", "WebApplication", "Product", "LocalBusiness")
+TITLE_SEPARATORS = re.compile(r"\s+[|\-–—·:]\s+")
+
+
+def _clean(text):
+    return " ".join(str(text or "").split())
+
+
+def _json_ld_items(page):
+    for block in page["json_ld"]:
+        doc = load_json(block.strip())
+        if isinstance(doc, dict):
+            items = doc.get("@graph", [doc])
+        elif isinstance(doc, list):
+            items = doc
+        else:
+            continue
+        for item in items:
+            if isinstance(item, dict):
+                yield item
+
+
+def _is_named_type(item):
+    types = item.get("@type")
+    types = types if isinstance(types, list) else [types]
+    return any(t in NAMED_TYPES for t in types)
+
+
+def _label(domain):
+    """The part of the domain a brand is usually named after ("stripe" for docs.stripe.com)."""
+    parts = domain.lower().split(".")
+    return parts[-2] if len(parts) >= 2 else parts[0]
+
+
+def _squash(text):
+    return re.sub(r"[^a-z0-9]", "", text.lower())
+
+
+def _name_from_title(title, domain):
+    segments = [s for s in TITLE_SEPARATORS.split(title) if s.strip()]
+    label = _squash(_label(domain))
+    for segment in segments:
+        if label and label in _squash(segment) and len(segment) <= MAX_NAME_CHARS:
+            return segment
+    if len(segments) == 1 and len(title) <= MAX_NAME_CHARS:
+        return title
+    return None
+
+
+def extract_site_info(domain, page):
+    """{"name", "description"} from the page's metadata, or None (see module doc)."""
+    meta = page["meta"]
+    items = [item for item in _json_ld_items(page) if _is_named_type(item)]
+
+    name = _clean(meta.get("og:site_name") or meta.get("application-name"))
+    if not name:
+        name = next((_clean(item["name"]) for item in items if isinstance(item.get("name"), str)), "")
+    if not name and page["title"]:
+        name = _name_from_title(_clean(page["title"]), domain) or ""
+
+    description = None
+    candidates = [meta.get("description"), meta.get("og:description")]
+    candidates += [item.get("description") for item in items if isinstance(item.get("description"), str)]
+    candidates.append(meta.get("twitter:description"))
+    for candidate in candidates:
+        candidate = _clean(candidate)
+        if len(candidate) >= MIN_DESCRIPTION_CHARS:
+            description = candidate
+            break
+
+    if not name or len(name) > MAX_NAME_CHARS or not description:
+        return None
+    return {"name": name, "description": description}
@@ -0,0 +1,141 @@
+"""Everything a check knows about a site, parsed once.
+
+SiteSnapshot.from_fetch() takes the raw output of _prefetch_website_data()
+and does all the parsing up front: the homepage and docs page are condensed
+(websites.condense), and robots.txt, the sitemap, llms.txt, the agent card
+and the OpenAPI spec are read into small summaries. Prompt builders and the
+local rules only read attributes from it.
+
+It is stored with the CheckJob (to_bytes(), zlib-compressed JSON, without
+the raw HTML), so later stages and resumed runs never fetch or parse again.
+"""
+import json
+import re
+import zlib
+from urllib.robotparser import RobotFileParser
+from django.utils import timezone
+from websites.condense import condense_page
+
+# Bump when the stored layout changes; older snapshots are rebuilt on load.
+SNAPSHOT_VERSION = 1
+# How much of each raw document is kept for the prompts.
+KEEP_CHARS = {"robots_txt": 5000, "sitemap_xml": 5000, "llms_txt": 5000, "agent_json": 5000, "openapi_spec": 5000}
+
+
+def looks_like_html(text):
+    head = (text or "").lstrip()[:500].lower()
+    return head.startswith("<!doctype html") or "<html" in head or "<head" in head
+
+
+def load_json(text):
+    try:
+        return json.loads(text)
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_robots(text):
+    if text is None:
+        return {"found": False}
+    if looks_like_html(text):
+        return {"found": True, "is_html": True}
+    parser = RobotFileParser()
+    parser.parse(text.splitlines())
+    return {
+        "found": True,
+        "is_html": False,
+        "allows_root": parser.can_fetch("*", "/"),
+        "crawl_delay": parser.crawl_delay("*"),
+        "sitemaps": re.findall(r'(?im)^\s*sitemap\s*:\s*(\S+)', text),
+    }
+
+
+def _parse_sitemap(text):
+    if text is None:
+        return {"found": False}
+    kind = None
+    if not looks_like_html(text):
+        if "<sitemapindex" in text:
+            kind = "sitemapindex"
+        elif "<urlset" in text:
+            kind = "urlset"
+    return {"found": True, "kind": kind, "url_count": text.count("<loc>")}
+
+
+def _parse_llms_txt(text):
+    if text is None:
+        return {"found": False}
+    return {"found": True, "is_html": looks_like_html(text), "chars": len(text.strip())}
+
+
+def _parse_openapi(text):
+    """Version of a served spec, even from a truncated or YAML body."""
+    if text is None:
+        return {"found": False}
+    doc = load_json(text)
+    version = None
+    if isinstance(doc, dict) and ("openapi" in doc or "swagger" in doc):
+        version = str(doc.get("openapi") or doc.get("swagger"))
+    else:
+        # The prefetch truncates specs, so big ones won't parse as a whole.
+        match = re.search(r'(?m)^\s*"?(openapi|swagger)"?\s*:\s*"?(\d[\w.]*)', text[:3000])
+        if match:
+            version = match.group(2)
+    lowered = text.lower()
+    return {"found": True, "version": version, "ui": "swagger-ui" in lowered or "redoc" in lowered}
+
+
+class SiteSnapshot:
+
+    def __init__(self, **fields):
+        self.__dict__.update(fields)
+
+    @classmethod
+    def from_fetch(cls, domain, data):
+        """Parse the raw prefetch dict. The raw HTML is not kept."""
+        keep = {k: (data.get(k) or None) and data[k][:n] for k, n in KEEP_CHARS.items()}
+        docs_html = data.get("docs_html")
+        return cls(
+            version=SNAPSHOT_VERSION,
+            domain=domain,
+            fetched_at=timezone.now().isoformat(),
+            homepage=condense_page(data.get("homepage_html", "")),
+            homepage_headers=data.get("homepage_headers") or {},
+            docs=condense_page(docs_html) if docs_html else None,
+            docs_found_at=data.get("docs_found_at"),
+            robots_txt=keep["robots_txt"],
+            robots=_parse_robots(data.get("robots_txt")),
+            sitemap_xml=keep["sitemap_xml"],
+            sitemap=_parse_sitemap(data.get("sitemap_xml")),
+            llms_txt=keep["llms_txt"],
+            llms=_parse_llms_txt(data.get("llms_txt")),
+            agent_json=keep["agent_json"],
+            agent_card=load_json(data.get("agent_json")),
+            openapi_spec=keep["openapi_spec"],
+            openapi_path=data.get("openapi_path", ""),
+            openapi=_parse_openapi(data.get("openapi_spec")),
+            api_response=data.get("api_response"),
+            error_response=data.get("error_response"),
+            search_response=data.get("search_response"),
+            rate_limit_headers=data.get("rate_limit_headers") or {},
+        )
+
+    @property
+    def reachable(self):
+        return self.homepage["html_chars"] > 0
+
+    def to_dict(self):
+        return dict(self.__dict__)
+
+    def to_bytes(self):
+        return zlib.compress(json.dumps(self.to_dict(), separators=(",", ":")).encode("utf-8"))
+
+    @classmethod
+    def from_bytes(cls, blob, domain):
+        fields = json.loads(zlib.decompress(bytes(blob)).decode("utf-8"))
+        if fields.get("version") != SNAPSHOT_VERSION:
+            # Stored by an older layout (or the raw prefetch dict): re-parse it
+            return cls.from_fetch(domain, fields)
+        # Snapshots stored before fetched_at was recorded
+        fields.setdefault("fetched_at", None)
+        return cls(**fields)
@@ -0,0 +1,81 @@
+"""Fetch a site while its check page is open, before the check is started.
+
+check_page_view calls request_prefetch(), which queues
+websites.tasks.prefetch_site_snapshot on the fetch queue. Its SiteSnapshot is
+kept "warm" in the cache for WARM_SNAPSHOT_TTL; a check of the domain started
+meanwhile takes it (take_warm_snapshot(), from websites.tasks.dispatch_check
+and the fetch stage) and goes straight to the LLM stage.
+
+Only logged-in visitors who could start a check of the domain get one. One
+prefetch per domain at a time (a pending marker), none for domains that
+already have a warm snapshot, and at most PREFETCHES_PER_USER per hour per
+user, so opening pages can't be used to make us crawl (and use up a
+site's crawl budget).
+"""
+import logging
+import time
+from django.core.cache import cache
+from common.ratelimit import check_rate_limit
+
+logger = logging.getLogger(__name__)
+
+WARM_SNAPSHOT_TTL = 60 * 10
+# How long a prefetch counts as running (it's cleared when it finishes).
+PENDING_TTL = 90
+PREFETCHES_PER_USER = 30
+# The fetch stage waits this long for a running prefetch instead of fetching again.
+PENDING_WAIT_SECONDS = 30
+
+
+def _snapshot_key(domain):
+    return f"checksnap:warm:{domain}"
+
+
+def _pending_key(domain):
+    return f"checksnap:pending:{domain}"
+
+
+def request_prefetch(domain, user_key):
+    """Queue a background fetch of `domain` unless one is warm, running or over the limit.
+
+    `user_key` names who asked ("carbon:<id>"), for the rate limit. Returns
+    True if one was queued. Never raises: rendering the page matters more.
+    """
+    from websites.bulk import _valid_domain
+    from websites.queues import FETCH_QUEUE
+    from websites.tasks import prefetch_site_snapshot
+
+    if not _valid_domain(domain) or cache.get(_snapshot_key(domain)) is not None:
+        return False
+    try:
+        allowed, _ = check_rate_limit(f"check_prefetch:{user_key}", PREFETCHES_PER_USER, 3600)
+        if not allowed or not cache.add(_pending_key(domain), 1, PENDING_TTL):
+            return False
+        prefetch_site_snapshot.apply_async(args=[domain], queue=FETCH_QUEUE)
+        return True
+    except Exception as e:
+        logger.warning("Could not queue a prefetch of %s: %s", domain, e)
+        return False
+
+
+def store_warm_snapshot(domain, blob):
+    """Keep a prefetched snapshot (SiteSnapshot.to_bytes()); None just ends the prefetch."""
+    if blob is not None:
+        cache.set(_snapshot_key(domain), blob, WARM_SNAPSHOT_TTL)
+    cache.delete(_pending_key(domain))
+
+
+def take_warm_snapshot(domain, wait=0):
+    """The warm snapshot of `domain` (compressed bytes), or None.
+
+    With `wait`, a prefetch still running is given up to that many seconds.
+    The snapshot stays cached, for other checks of the domain in the window.
+    """
+    deadline = time.monotonic() + wait
+    while True:
+        # Pending first: a prefetch finishing in between still leaves its snapshot
+        pending = cache.get(_pending_key(domain)) is not None
+        blob = cache.get(_snapshot_key(domain))
+        if blob is not None or not pending or time.monotonic() >= deadline:
+            return blob
+        time.sleep(0.5)
@@ -1,24 +1,66 @@
+import hashlib
 import json
 import logging
-import os
 import re
 import subprocess
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import timedelta
 import requests as http_requests
-from celery import shared_task
+from celery import chain, shared_task
+from django.conf import settings
 from django.core.cache import cache
 from django.db.models import Count
+from django.utils import timezone
 from google import genai
 from google.genai import types as genai_types
+from common.semaphore import AcquireCancelled, RedisSemaphore
+from websites import crawler, replay
+from websites.cancel import CHECK_DEADLINE_SECONDS, CheckCancelled, JobControl, request_cancel
+from websites.condense import page_context
+from websites.live import TERMINAL_STATUSES, PartialOutput, publish_job
+from websites.llm import LLMError, LLMInterrupted, get_backend
+from websites.metrics import CheckMetrics
+from websites.queues import FETCH_QUEUE, FINALIZE_QUEUE, LANE_QUEUES, StageClock, join_lane, leave_lane, mark_started
+from websites.rules import evaluate_local_criteria
+from websites.singleflight import finish_flight, start_check
+from websites.shared_snapshots import snapshot_fetched_at, upload_snapshot
+from websites.siteinfo import extract_site_info
+from websites.snapshot import SiteSnapshot
+from websites.speculative import PENDING_WAIT_SECONDS, store_warm_snapshot, take_warm_snapshot
 import env
 
 logger = logging.getLogger(__name__)
 
-CLAUDE_PATH = os.path.expanduser("~/.local/bin/claude")
 CLAUDE_MAX_CONCURRENT = 4
-CLAUDE_SEMAPHORE_KEY = "claude_cli_slots"
+CLAUDE_SLOTS = RedisSemaphore("claude_cli_slots", limit=CLAUDE_MAX_CONCURRENT, lease_ttl=60)
+LEVEL_CHECK_WORKERS = 5
+# Failures worth another attempt: LLM backend errors and timeouts, network
+# errors. Retries resume from the job's last checkpoint.
+TRANSIENT_ERRORS = (LLMError, TimeoutError, subprocess.TimeoutExpired, http_requests.RequestException)
+CHECK_MAX_RETRIES = 3
+RETRY_BACKOFF_SECONDS = 30
+# Bump a stage's version whenever its prompt template or parsing changes,
+# so stored results from the old template are no longer reused.
+PROMPT_VERSIONS = {"step_0": 2, "level": 3, "report": 1}
+LLM_RESULT_TTL = 60 * 60 * 24 * 30
 FETCH_TIMEOUT = 10
-FETCH_UA = "SiliconFriendly/1.0 (+https://siliconfriendly.com)"
+
+# Which condensed homepage sections (websites.condense) each prompt gets, most
+# important first, and the token budget for them.
+STEP0_PAGE_CONTEXT = (("head", "json_ld", "nav", "text"), 1200)
+LEVEL_PAGE_CONTEXT = {
+    1: (("head", "json_ld", "structure", "scripts", "links", "text"), 3500),
+    2: (("structure",), 100),
+    4: (("signals", "link_rels", "scripts", "forms", "nav", "head", "text"), 3000),
+    5: (("signals", "link_rels", "nav", "forms", "scripts", "text"), 2500),
+}
+DOCS_PAGE_CONTEXT = (("signals", "nav", "text"), 1500)
+
+# Job statuses a check moves through, in order.
+CHECK_STAGES = ("fetching", "step_0", "step_levels", "step_6", "saving")
+# The ones run by evaluate_check, which is what the lane queues wait for.
+LLM_STAGES = ("step_0", "step_levels", "step_6")
 
 LEVEL_NAMES = {
     1: "Basic Accessibility",
@@ -203,33 +245,201 @@ def daily_verification_crunch():
     return f"Processed {len(affected_ids)} websites."
 
 
-# ---------------------------------------------------------------------------
-# Claude CLI website check
-# ---------------------------------------------------------------------------
+@shared_task
+def schedule_rechecks():
+    """Beat task: queue background re-checks of the stalest, most-viewed sites."""
+    from websites.models import CheckJob
+    from websites import freshness
+    from websites.queues import lane_size, prune_lane
+
+    # Jobs that ended without leaving the lane would hold re-checks back for good
+    prune_lane("bulk")
+    # In line for an LLM worker, or still waiting for their site to be fetched
+    waiting = lane_size("bulk") + CheckJob.objects.filter(
+        lane="bulk", status__in=("queued", "fetching"), snapshot__isnull=True,
+    ).count()
+    if waiting >= freshness.RECHECK_MAX_WAITING:
+        return f"Bulk lane has {waiting} waiting, skipping."
+
+    budget = freshness.llm_calls_remaining() // freshness.CALLS_PER_CHECK
+    limit = min(freshness.RECHECK_BATCH_SIZE, budget)
+    if limit <= 0:
+        return "Daily re-check budget spent."
+
+    queued = []
+    for website in freshness.pick_recheck_candidates(limit):
+        job = CheckJob.objects.create(domain=website.url, lane="bulk", trigger="scheduled")
+        freshness.spend_llm_calls(freshness.CALLS_PER_CHECK)
+        start_check(job)
+        queued.append(website.url)
+
+    return f"Queued {len(queued)} re-checks: {', '.join(queued)}" if queued else "Nothing due."
+
+
+@shared_task
+def prefetch_bulk_check(bulk_id):
+    """Fetch every new site of a bulk submission in parallel, then queue its check.
+
+    Threads only fetch and parse; job rows are written from this thread as
+    each site comes back. Unreachable sites fail here, before any LLM call.
+    """
+    from websites.bulk import BULK_PREFETCH_WORKERS
+    from websites.models import CheckJob
+
+    jobs = list(CheckJob.objects.filter(bulk_id=bulk_id, status="queued", snapshot__isnull=True))
+    if not jobs:
+        return "Nothing to prefetch."
+
+    def fetch(domain):
+        return SiteSnapshot.from_fetch(domain, _prefetch_website_data(domain))
+
+    queued = failed = 0
+    with ThreadPoolExecutor(max_workers=BULK_PREFETCH_WORKERS) as pool:
+        futures = {pool.submit(fetch, job.domain): job for job in jobs}
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                snap = future.result()
+                if not snap.reachable:
+                    raise RuntimeError(f"Could not fetch {job.domain} — site may be down or unreachable")
+            except Exception as e:
+                job.status = "error"
+                job.error_message = str(e)[:2000]
+                job.save(update_fields=["status", "error_message", "updated_at"])
+                publish_job(job)
+                failed += 1
+                continue
+            job.snapshot = snap.to_bytes()
+            job.save(update_fields=["snapshot", "updated_at"])
+            start_check(job)
+            queued += 1
+
+    return f"Bulk {bulk_id}: queued {queued}, unreachable {failed}."
+
 
-def _fetch_url(url, timeout=FETCH_TIMEOUT):
-    """Fetch a URL. Returns (status, headers_dict, body) or None on error."""
+@shared_task
+def prefetch_site_snapshot(domain):
+    """Fetch and parse a site ahead of its check (websites.speculative)."""
+    blob = None
     try:
-        resp = http_requests.get(url, headers={"User-Agent": FETCH_UA}, timeout=timeout, allow_redirects=True)
-        return {"status": resp.status_code, "headers": dict(resp.headers), "body": resp.text}
-    except http_requests.exceptions.SSLError:
+        snap = SiteSnapshot.from_fetch(domain, _prefetch_website_data(domain))
+        if snap.reachable:
+            blob = snap.to_bytes()
+    finally:
+        store_warm_snapshot(domain, blob)
+    return f"Prefetched {domain}." if blob else f"{domain} is unreachable."
+
+
+@shared_task(autoretry_for=(Exception,), retry_backoff=RETRY_BACKOFF_SECONDS, max_retries=CHECK_MAX_RETRIES)
+def archive_site_snapshot(check_job_id):
+    """Share a finished check's snapshot with verifiers (websites.shared_snapshots)."""
+    from django.db.models import Q
+    from websites.models import CheckJob, Website
+
+    job = CheckJob.objects.select_related("website").filter(id=check_job_id, status="done").first()
+    if not job or not job.snapshot or not job.website:
+        return f"CheckJob {check_job_id} has no snapshot to share."
+    snap = SiteSnapshot.from_bytes(job.snapshot, job.domain)
+    fetched_at = snapshot_fetched_at(snap) or job.created_at
+    newer = Q(snapshot_fetched_at__isnull=True) | Q(snapshot_fetched_at__lt=fetched_at)
+    # A later check of the site may have shared its own already
+    if not Website.objects.filter(newer, id=job.website_id).exists():
+        return f"{job.domain} already has a newer snapshot."
+
+    url = upload_snapshot(snap, fetched_at)
+    Website.objects.filter(newer, id=job.website_id).update(snapshot_url=url, snapshot_fetched_at=fetched_at)
+    return f"Shared the snapshot of {job.domain}: {url}"
+
+
+@shared_task
+def render_report_pdfs(check_job_ids):
+    """Render and store the PDF reports of finished jobs (websites.report_store)."""
+    from websites.models import CheckJob
+    from websites.report_store import render_and_store, stored_pdf
+
+    rendered = 0
+    for job in CheckJob.objects.select_related("website").filter(id__in=check_job_ids, status="done"):
+        if stored_pdf(job):
+            continue
         try:
-            fallback = url.replace("https://", "http://", 1)
-            resp = http_requests.get(fallback, headers={"User-Agent": FETCH_UA}, timeout=timeout, allow_redirects=True)
-            return {"status": resp.status_code, "headers": dict(resp.headers), "body": resp.text}
-        except Exception:
-            return None
-    except Exception:
-        return None
+            record, _ = render_and_store(job)
+            rendered += record is not None
+        except Exception as e:
+            logger.warning("Could not render the PDF report of CheckJob %s: %s", job.id, e)
+    return f"Stored {rendered} of {len(check_job_ids)} PDF reports."
 
 
-def _prefetch_website_data(domain):
+@shared_task
+def refresh_stale_page_content():
+    """Beat task: re-crawl the homepage text of sites that have none or an old copy."""
+    from django.db.models import F, Q
+    from websites.models import Website
+
+    cutoff = timezone.now() - timedelta(days=crawler.PAGE_CONTENT_MAX_AGE_DAYS)
+    websites = list(
+        Website.objects.filter(Q(page_content_fetched_at__isnull=True) | Q(page_content_fetched_at__lt=cutoff))
+        .order_by(F("page_content_fetched_at").asc(nulls_first=True))[:crawler.PAGE_CONTENT_BATCH]
+    )
+
+    def refresh(website):
+        try:
+            return bool(crawler.refresh_page_content(website))
+        except (crawler.CrawlRefused, TimeoutError) as e:
+            logger.info("Skipped page content for %s: %s", website.url, e)
+            return False
+
+    # Different hosts, so the crawler's per-host limits don't serialise these
+    with ThreadPoolExecutor(max_workers=crawler.PAGE_CONTENT_WORKERS) as pool:
+        refreshed = sum(pool.map(refresh, websites))
+    return f"Refreshed page content for {refreshed}/{len(websites)} websites."
+
+
+# ---------------------------------------------------------------------------
+# Claude CLI website check
+# ---------------------------------------------------------------------------
+
+def _fetch_url(url, timeout=FETCH_TIMEOUT, metrics=None):
+    """Fetch a URL for a check. Returns {status, headers, body} or None on error.
+
+    Goes through the shared crawler (per-host slots and crawl delay), but
+    doesn't skip robots.txt-disallowed paths: the check grades robots.txt.
+    Recorded or replayed instead, depending on settings.CHECKER_FETCH_MODE
+    (websites.replay).
+    """
+    if settings.CHECKER_FETCH_MODE == "replay":
+        return replay.replay(url, metrics=metrics)
+    start = time.monotonic()
+    result = crawler.fetch(url, timeout=timeout, obey_robots=False, metrics=metrics)
+    if settings.CHECKER_FETCH_MODE == "record":
+        replay.record(url, result, int((time.monotonic() - start) * 1000))
+    return result
+
+
+def _fetch_robots(domain):
+    """Current robots.txt text of `domain`, or None. Also primes the crawler's copy."""
+    url = f"https://{domain}/robots.txt"
+    if settings.CHECKER_FETCH_MODE == "replay":
+        page = replay.replay(url)
+        return page["body"] if page and page["status"] == 200 else None
+    start = time.monotonic()
+    text = crawler.robots(domain, refresh=True)["text"]
+    if settings.CHECKER_FETCH_MODE == "record":
+        page = {"status": 200, "headers": {}, "body": text} if text else None
+        replay.record(url, page, int((time.monotonic() - start) * 1000))
+    return text
+
+
+def _prefetch_website_data(domain, metrics=None):
     """Fetch all relevant data from a website for Claude analysis."""
     base = f"https://{domain}"
     data = {"domain": domain}
 
+    # robots.txt first: the crawler needs it (crawl delay) before anything else
+    robots_txt = _fetch_robots(domain)
+    data["robots_txt"] = robots_txt[:10000] if robots_txt else None
+
     # Homepage
-    homepage = _fetch_url(base)
+    homepage = _fetch_url(base, metrics=metrics)
     if homepage:
         data["homepage_html"] = homepage["body"][:50000]
         data["homepage_headers"] = homepage["headers"]
@@ -238,16 +448,16 @@ def _prefetch_website_data(domain):
         data["homepage_headers"] = {}
 
     # Standard files
-    for key, path in [("robots_txt", "/robots.txt"), ("sitemap_xml", "/sitemap.xml"),
+    for key, path in [("sitemap_xml", "/sitemap.xml"),
                       ("llms_txt", "/llms.txt"), ("agent_json", "/.well-known/agent.json")]:
-        result = _fetch_url(f"{base}{path}")
+        result = _fetch_url(f"{base}{path}", metrics=metrics)
         if result and result["status"] == 200:
             data[key] = result["body"][:10000]
         else:
             data[key] = None
 
     # API endpoint
-    api_result = _fetch_url(f"{base}/api/") or _fetch_url(f"{base}/api")
+    api_result = _fetch_url(f"{base}/api/", metrics=metrics) or _fetch_url(f"{base}/api", metrics=metrics)
     if api_result:
         data["api_response"] = {
             "status": api_result["status"],
@@ -262,7 +472,7 @@ def _prefetch_website_data(domain):
     # OpenAPI spec
     data["openapi_spec"] = None
     for path in ["/openapi.json", "/swagger.json", "/api-docs"]:
-        result = _fetch_url(f"{base}{path}")
+        result = _fetch_url(f"{base}{path}", metrics=metrics)
         if result and result["status"] == 200:
             data["openapi_spec"] = result["body"][:10000]
             data["openapi_path"] = path
@@ -271,14 +481,14 @@ def _prefetch_website_data(domain):
     # Docs
     data["docs_found_at"] = None
     for path in ["/docs", "/documentation", "/api/docs"]:
-        result = _fetch_url(f"{base}{path}")
+        result = _fetch_url(f"{base}{path}", metrics=metrics)
         if result and result["status"] == 200:
             data["docs_found_at"] = path
             data["docs_html"] = result["body"][:10000]
             break
 
     # Error response (404 check)
-    err = _fetch_url(f"{base}/this-page-does-not-exist-sf-check")
+    err = _fetch_url(f"{base}/this-page-does-not-exist-sf-check", metrics=metrics)
     if err:
         data["error_response"] = {
             "status": err["status"],
@@ -289,7 +499,7 @@ def _prefetch_website_data(domain):
         data["error_response"] = None
 
     # Search endpoint
-    search = _fetch_url(f"{base}/search") or _fetch_url(f"{base}/api/search")
+    search = _fetch_url(f"{base}/search", metrics=metrics) or _fetch_url(f"{base}/api/search", metrics=metrics)
     data["search_response"] = {"status": search["status"]} if search else None
 
     # Rate limit headers from homepage
@@ -299,37 +509,61 @@ def _prefetch_website_data(domain):
     return data
 
 
-def _acquire_claude_slot(timeout=600):
-    """Block until a Claude CLI slot is available."""
-    deadline = time.time() + timeout
-    while time.time() < deadline:
-        current = cache.get(CLAUDE_SEMAPHORE_KEY, 0)
-        if current < CLAUDE_MAX_CONCURRENT:
-            cache.set(CLAUDE_SEMAPHORE_KEY, current + 1, timeout=600)
-            return True
-        time.sleep(2)
-    raise TimeoutError("Could not acquire Claude CLI slot")
-
+def _run_claude(prompt, timeout=180, json_output=False, timings=None, control=None, on_text=None):
+    """Send a prompt to the configured LLM backend. Returns the raw reply.
 
-def _release_claude_slot():
-    """Release a Claude CLI slot."""
-    current = cache.get(CLAUDE_SEMAPHORE_KEY, 1)
-    cache.set(CLAUDE_SEMAPHORE_KEY, max(0, current - 1), timeout=600)
-
-
-def _run_claude(prompt, timeout=180):
-    """Run claude -p with Sonnet. Returns raw stdout string."""
-    _acquire_claude_slot()
+    If given, `timings` gets the slot wait and call time in ms. With a
+    JobControl, a cancelled or overdue run stops waiting for a slot or kills
+    the running call (freeing the slot) and raises CheckCancelled or
+    CheckDeadlineExceeded (control.stopped()).
+    `on_text` gets the reply so far while it streams in.
+    """
+    timings = timings if timings is not None else {}
+    backend = get_backend()
+    should_stop = control.should_stop if control else None
+    start = time.monotonic()
     try:
-        result = subprocess.run(
-            [CLAUDE_PATH, "-p", prompt, "--model", "sonnet"],
-            capture_output=True, text=True, timeout=timeout,
-        )
-        if result.returncode != 0:
-            raise RuntimeError(f"Claude CLI error: {result.stderr[:500]}")
-        return result.stdout.strip()
-    finally:
-        _release_claude_slot()
+        if not backend.uses_slot:
+            reply = backend.run(prompt, timeout=timeout, json_output=json_output, should_stop=should_stop, on_text=on_text)
+            timings["call_ms"] = int((time.monotonic() - start) * 1000)
+            return reply
+        with CLAUDE_SLOTS.lease(timeout=600, should_stop=should_stop):
+            acquired = time.monotonic()
+            timings["slot_wait_ms"] = int((acquired - start) * 1000)
+            reply = backend.run(prompt, timeout=timeout, json_output=json_output, should_stop=should_stop, on_text=on_text)
+            timings["call_ms"] = int((time.monotonic() - acquired) * 1000)
+            return reply
+    except (AcquireCancelled, LLMInterrupted) as e:
+        raise control.stopped() from e
+
+
+def _cached_claude(stage, prompt, parse=None, timeout=180, metrics=None, label=None, control=None, on_text=None):
+    """Run a prompt through Claude, reusing a stored result for identical input.
+
+    The key is the stage's template version plus a hash of the exact prompt,
+    which embeds everything the model sees. A hit costs no Claude slot
+    (and streams nothing to `on_text`).
+    """
+    digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    key = f"llm_result:{stage}:v{PROMPT_VERSIONS[stage]}:{digest}"
+    reuse = settings.CHECKER_LLM_REUSE_RESULTS
+    stored = cache.get(key) if reuse else None
+    if stored is not None:
+        logger.info("Reusing stored %s result %s", stage, digest[:12])
+        if metrics:
+            metrics.record_llm(label or stage, len(prompt), 0, cached=True)
+        return stored
+
+    timings = {}
+    raw = _run_claude(
+        prompt, timeout=timeout, json_output=parse is not None, timings=timings, control=control, on_text=on_text,
+    )
+    if metrics:
+        metrics.record_llm(label or stage, len(prompt), len(raw), cached=False, **timings)
+    result = parse(raw) if parse else raw
+    if reuse:
+        cache.set(key, result, LLM_RESULT_TTL)
+    return result
 
 
 def _parse_json_from_claude(raw):
@@ -357,24 +591,31 @@ def _parse_json_from_claude(raw):
     raise ValueError(f"Could not parse JSON from Claude response: {raw[:200]}")
 
 
-def _build_step0_prompt(domain, data):
-    html_snippet = data.get("homepage_html", "")[:5000]
+def _homepage_context(snap, spec):
+    sections, budget = spec
+    return page_context(snap.homepage, sections, budget)
+
+
+def _build_step0_prompt(domain, snap):
     return f"""You are analyzing the website {domain}.
 
-Based on the following homepage HTML, provide:
+Based on the following homepage content, provide:
 1. The website's name (what it's commonly known as)
 2. A description (2-3 sentences, 150+ characters) of what the website does, aimed at helping AI agents understand the service
 
-Homepage HTML (first 5000 chars):
-{html_snippet}
+Homepage (condensed):
+{_homepage_context(snap, STEP0_PAGE_CONTEXT)}
 
 Respond ONLY with a JSON object, nothing else:
 {{"name": "...", "description": "..."}}"""
 
 
-def _build_level_prompt(level, domain, name, description, data):
+def _build_level_prompt(level, domain, name, description, snap, fields=None):
+    """Build the prompt for one level. fields limits it to the criteria still
+    undecided after the local rules; context only they need is left out."""
     from websites.models import LEVEL_RANGES
-    fields = LEVEL_RANGES[level]
+    fields = fields or LEVEL_RANGES[level]
+    pending = set(fields)
     level_name = LEVEL_NAMES[level]
 
     criteria_text = ""
@@ -385,69 +626,72 @@ def _build_level_prompt(level, domain, name, description, data):
     context = f"Website: {name} ({domain})\nDescription: {description}\n\n"
 
     if level == 1:
-        context += f"Homepage HTML (first 20000 chars):\n{data.get('homepage_html', '')[:20000]}\n"
+        context += f"Homepage (condensed):\n{_homepage_context(snap, LEVEL_PAGE_CONTEXT[1])}\n"
     elif level == 2:
-        context += f"robots.txt:\n{data.get('robots_txt') or 'NOT FOUND'}\n\n"
-        context += f"sitemap.xml (first 5000 chars):\n{(data.get('sitemap_xml') or 'NOT FOUND')[:5000]}\n\n"
-        context += f"llms.txt:\n{(data.get('llms_txt') or 'NOT FOUND')[:5000]}\n\n"
-        context += f"OpenAPI spec found: {data.get('openapi_spec') is not None} (at {data.get('openapi_path', 'N/A')})\n"
-        if data.get("openapi_spec"):
-            context += f"OpenAPI spec (first 3000 chars):\n{data['openapi_spec'][:3000]}\n\n"
-        context += f"Documentation page found at: {data.get('docs_found_at') or 'NOT FOUND'}\n"
-        html = data.get("homepage_html", "")
-        text_len = len(re.sub(r'<[^>]+>', '', html))
-        context += f"Homepage HTML length: {len(html)} chars, text content length: {text_len} chars\n"
+        if pending & {"l2_robots_txt", "l2_sitemap"}:
+            context += f"robots.txt:\n{snap.robots_txt or 'NOT FOUND'}\n\n"
+        if "l2_sitemap" in pending:
+            context += f"sitemap.xml (first 5000 chars):\n{(snap.sitemap_xml or 'NOT FOUND')[:5000]}\n\n"
+        context += f"llms.txt:\n{(snap.llms_txt or 'NOT FOUND')[:5000]}\n\n"
+        context += f"OpenAPI spec found: {snap.openapi_spec is not None} (at {snap.openapi_path or 'N/A'})\n"
+        if snap.openapi_spec:
+            context += f"OpenAPI spec (first 3000 chars):\n{snap.openapi_spec[:3000]}\n\n"
+        context += f"Documentation page found at: {snap.docs_found_at or 'NOT FOUND'}\n"
+        context += f"Homepage: {_homepage_context(snap, LEVEL_PAGE_CONTEXT[2])}\n"
     elif level == 3:
-        if data.get("api_response"):
-            ar = data["api_response"]
+        if snap.api_response:
+            ar = snap.api_response
             context += f"/api/ response: status={ar['status']}, content-type={ar['content_type']}\n"
             context += f"Body (first 2000 chars):\n{ar['body'][:2000]}\n\n"
         else:
             context += "/api/ endpoint: NOT FOUND\n\n"
-        context += f"/.well-known/agent.json:\n{data.get('agent_json') or 'NOT FOUND'}\n\n"
-        context += f"Rate limit headers: {data.get('rate_limit_headers') or 'NONE FOUND'}\n\n"
-        if data.get("error_response"):
-            er = data["error_response"]
+        if "l3_a2a_agent_card" in pending:
+            context += f"/.well-known/agent.json:\n{snap.agent_json or 'NOT FOUND'}\n\n"
+        if "l3_rate_limits_documented" in pending:
+            context += f"Rate limit headers: {snap.rate_limit_headers or 'NONE FOUND'}\n\n"
+        if snap.error_response:
+            er = snap.error_response
             context += f"404 error response: status={er['status']}, content-type={er['content_type']}\n"
             context += f"Body (first 1000 chars):\n{er['body'][:1000]}\n\n"
         else:
             context += "404 error response: COULD NOT FETCH\n\n"
-        context += f"Search endpoint: {data.get('search_response') or 'NOT FOUND'}\n"
+        context += f"Search endpoint: {snap.search_response or 'NOT FOUND'}\n"
     elif level == 4:
-        context += f"Homepage HTML (first 15000 chars, check for MCP/WebMCP scripts):\n{data.get('homepage_html', '')[:15000]}\n\n"
-        context += f"/.well-known/agent.json:\n{data.get('agent_json') or 'NOT FOUND'}\n\n"
-        if data.get("api_response"):
-            context += f"/api/ response: status={data['api_response']['status']}, content-type={data['api_response']['content_type']}\n\n"
-        context += f"OpenAPI spec found: {data.get('openapi_spec') is not None}\n"
-        if data.get("openapi_spec"):
-            context += f"OpenAPI spec (first 5000 chars):\n{data['openapi_spec'][:5000]}\n\n"
-        context += f"Documentation found at: {data.get('docs_found_at') or 'NOT FOUND'}\n"
-        if data.get("docs_html"):
-            context += f"Docs HTML (first 5000 chars):\n{data['docs_html'][:5000]}\n\n"
-        context += f"llms.txt:\n{(data.get('llms_txt') or 'NOT FOUND')[:5000]}\n"
+        context += f"Homepage (condensed; check the signals and scripts for MCP/WebMCP):\n{_homepage_context(snap, LEVEL_PAGE_CONTEXT[4])}\n\n"
+        context += f"/.well-known/agent.json:\n{snap.agent_json or 'NOT FOUND'}\n\n"
+        if snap.api_response:
+            context += f"/api/ response: status={snap.api_response['status']}, content-type={snap.api_response['content_type']}\n\n"
+        context += f"OpenAPI spec found: {snap.openapi_spec is not None}\n"
+        if snap.openapi_spec:
+            context += f"OpenAPI spec (first 5000 chars):\n{snap.openapi_spec[:5000]}\n\n"
+        context += f"Documentation found at: {snap.docs_found_at or 'NOT FOUND'}\n"
+        if snap.docs:
+            context += f"Docs page (condensed):\n{page_context(snap.docs, *DOCS_PAGE_CONTEXT)}\n\n"
+        context += f"llms.txt:\n{(snap.llms_txt or 'NOT FOUND')[:5000]}\n"
     elif level == 5:
-        context += f"Homepage HTML (first 10000 chars):\n{data.get('homepage_html', '')[:10000]}\n\n"
-        context += f"/.well-known/agent.json:\n{data.get('agent_json') or 'NOT FOUND'}\n\n"
-        if data.get("api_response"):
-            context += f"/api/ response body (first 3000 chars):\n{data['api_response']['body'][:3000]}\n\n"
-        if data.get("openapi_spec"):
-            context += f"OpenAPI spec (first 5000 chars):\n{data['openapi_spec'][:5000]}\n\n"
-        if data.get("docs_html"):
-            context += f"Docs HTML (first 5000 chars):\n{data['docs_html'][:5000]}\n\n"
-        context += f"llms.txt:\n{(data.get('llms_txt') or 'NOT FOUND')[:5000]}\n"
+        context += f"Homepage (condensed):\n{_homepage_context(snap, LEVEL_PAGE_CONTEXT[5])}\n\n"
+        context += f"/.well-known/agent.json:\n{snap.agent_json or 'NOT FOUND'}\n\n"
+        if snap.api_response:
+            context += f"/api/ response body (first 3000 chars):\n{snap.api_response['body'][:3000]}\n\n"
+        if snap.openapi_spec:
+            context += f"OpenAPI spec (first 5000 chars):\n{snap.openapi_spec[:5000]}\n\n"
+        if snap.docs:
+            context += f"Docs page (condensed):\n{page_context(snap.docs, *DOCS_PAGE_CONTEXT)}\n\n"
+        context += f"llms.txt:\n{(snap.llms_txt or 'NOT FOUND')[:5000]}\n"
 
     field_names = ', '.join(f'"{f}"' for f in fields)
+    count = len(fields)
 
     return f"""You are evaluating {domain} for Silicon Friendly Level {level} ({level_name}).
 
 {context}
 
-Check each of the following 6 criteria based on the data above. Be strict but fair.
+Check each of the following {count} criteria based on the data above. Be strict but fair.
 
 Criteria:
 {criteria_text}
 
-IMPORTANT: Evaluate ALL 6 criteria. Do not skip any, even if previous ones failed.
+IMPORTANT: Evaluate ALL {count} criteria. Do not skip any, even if previous ones failed.
 
 Respond ONLY with a JSON object (no markdown, no code fences, no explanation), with exactly these keys: {field_names}
 
@@ -578,30 +822,221 @@ def _send_check_report_email(job):
         logger.error("Failed to send check report email: %s", e)
 
 
+def _evaluate_level(level, domain, name, description, snap, local, metrics=None, control=None, partial=None):
+    """Evaluate one level. Returns (results, reasoning) dicts.
+
+    Criteria already decided by the local rules (websites.rules) are taken
+    as-is; only the rest go to Claude, and none at all if nothing is left.
+    Called from worker threads, so it must not touch the ORM.
+    """
+    from websites.models import LEVEL_RANGES
+
+    fields = LEVEL_RANGES[level]
+    pending = [f for f in fields if f not in local]
+    parsed = {}
+    if pending:
+        prompt = _build_level_prompt(level, domain, name, description, snap, fields=pending)
+        parsed = _cached_claude(
+            "level", prompt, parse=_parse_json_from_claude, metrics=metrics, label=f"level_{level}", control=control,
+            on_text=partial.for_level() if partial else None,
+        )
+
+    results = {}
+    reasoning = {}
+    for field in fields:
+        field_data = local.get(field) or parsed.get(field, {"pass": False, "reason": "Not evaluated by Claude"})
+        if isinstance(field_data, dict):
+            results[field] = bool(field_data.get("pass", False))
+            reasoning[field] = str(field_data.get("reason", ""))
+        else:
+            results[field] = bool(field_data)
+            reasoning[field] = ""
+    return results, reasoning
+
+
+def _checkpoint(job, clock, update_fields=None):
+    """Persist the CheckJob (the given fields, or all of them), then publish.
+
+    Progress in between checkpoints only goes to Redis (_publish), so a run
+    costs a handful of row writes instead of one per state change.
+    """
+    job.save(update_fields=update_fields + ["updated_at"] if update_fields else None)
+    publish_job(job, timings=clock.timings)
+
+
+def _publish(job, clock, partial=None):
+    publish_job(job, timings=clock.timings, partial=partial.as_dict() if partial else None)
+
+
+def _retry_countdown(retries):
+    return RETRY_BACKOFF_SECONDS * 2 ** retries
+
+
+def dispatch_check(job):
+    """Hand a job to the task for its next stage, on that stage's queue.
+
+    A check is three tasks, each on its own queue so each worker pool can be
+    sized to its own bottleneck (websites.queues):
+      fetch_check_site - FETCH_QUEUE, network-bound: fetch and parse the site
+      evaluate_check   - the job's lane queue, LLM-bound: step 0, levels, report
+      finalize_check   - FINALIZE_QUEUE: update the Website, embedding, emails
+    Every stage checkpoints the job row and then dispatches it again, so the
+    next stage only depends on what the row holds. That is also how a
+    resumed job skips the stages it already finished.
+    """
+    if not job.snapshot:
+        # Fetched already if someone had the check page open (websites.speculative)
+        job.snapshot = take_warm_snapshot(job.domain)
+        if job.snapshot:
+            job.save(update_fields=["snapshot", "updated_at"])
+    if not job.snapshot:
+        fetch_check_site.apply_async(args=[job.id], queue=FETCH_QUEUE)
+    elif not job.report_md:
+        join_lane(job)
+        evaluate_check.apply_async(args=[job.id], queue=LANE_QUEUES[job.lane])
+    else:
+        finalize_check.apply_async(args=[job.id], queue=FINALIZE_QUEUE)
+
+
 @shared_task
 def run_website_check(check_job_id):
-    """Main task: run Claude Sonnet to check a website across all 5 levels."""
-    from websites.models import CheckJob, Website, LEVEL_RANGES
+    """Start (or continue) a website check by dispatching it to its next stage.
+
+    Also picks up messages queued before checks were split into stages.
+    """
+    from websites.models import CheckJob
+
+    job = CheckJob.objects.get(id=check_job_id)
+    if job.status in TERMINAL_STATUSES:
+        return
+    dispatch_check(job)
+
+
+def _run_stage(task, check_job_id, stage):
+    """Run one stage of a check with the shared cancel/retry/failure handling.
+
+    `stage(job, clock, metrics, control)` returns True if the job goes on to
+    its next stage. Transient failures retry the stage with exponential
+    backoff; the stage tasks are acked late, so a job whose worker dies is
+    redelivered and picks up from its last checkpoint. Stage times and
+    metrics carry over between stages on CheckJob.metrics.
+    """
+    from websites.models import CheckJob
 
     job = CheckJob.objects.get(id=check_job_id)
+    if job.status in TERMINAL_STATUSES:
+        return
+    clock = StageClock()
+    clock.timings.update((job.metrics or {}).get("stages", {}))
+    metrics = CheckMetrics.from_dict(job.metrics)
+    # One deadline for the whole job, through every stage and retry
+    if job.deadline_at is None:
+        job.deadline_at = timezone.now() + timedelta(seconds=CHECK_DEADLINE_SECONDS)
+        job.save(update_fields=["deadline_at"])
+    elif job.status == "queued":
+        # Fetched and back in line: the wait for an LLM worker doesn't count
+        job.deadline_at += timezone.now() - job.updated_at
+        job.save(update_fields=["deadline_at"])
+    control = JobControl(job.id, deadline_at=job.deadline_at)
 
     try:
-        # Step: Fetch data
-        job.status = "fetching"
-        job.save(update_fields=["status", "updated_at"])
-        data = _prefetch_website_data(job.domain)
+        control.check()
+        go_on = stage(job, clock, metrics, control)
+
+    except CheckCancelled:
+        clock.stop()
+        logger.info("CheckJob %s cancelled", check_job_id)
+        job.metrics = metrics.as_dict(clock.timings)
+        _cancel_job(job, clock)
+        return
+
+    except TRANSIENT_ERRORS as e:
+        clock.stop()
+        job.metrics = metrics.as_dict(clock.timings)
+        if task.request.retries >= task.max_retries:
+            _fail_job(job, clock, e)
+            return
+        countdown = _retry_countdown(task.request.retries)
+        logger.warning("CheckJob %s hit a transient error, retrying in %ss: %s", check_job_id, countdown, e)
+        job.status = "retrying"
+        job.error_message = str(e)[:2000]
+        _checkpoint(job, clock)
+        raise task.retry(exc=e, countdown=countdown)
+
+    except Exception as e:
+        clock.stop()
+        job.metrics = metrics.as_dict(clock.timings)
+        _fail_job(job, clock, e)
+        return
+
+    if go_on:
+        dispatch_check(job)
 
-        if not data.get("homepage_html"):
-            raise RuntimeError(f"Could not fetch {job.domain} — site may be down or unreachable")
 
-        # Step 0: Get name + description
+@shared_task(bind=True, acks_late=True, reject_on_worker_lost=True, max_retries=CHECK_MAX_RETRIES)
+def fetch_check_site(self, check_job_id):
+    """Stage 1: fetch the site and store its snapshot on the job."""
+    return _run_stage(self, check_job_id, _fetch_stage)
+
+
+def _fetch_stage(job, clock, metrics, control):
+    job.status = "fetching"
+    clock.start("fetching")
+    _publish(job, clock)
+    # A prefetch started from the check page may be about to finish
+    warm = take_warm_snapshot(job.domain, wait=PENDING_WAIT_SECONDS)
+    if warm:
+        snap = SiteSnapshot.from_bytes(warm, job.domain)
+    else:
+        snap = SiteSnapshot.from_fetch(job.domain, _prefetch_website_data(job.domain, metrics=metrics))
+    if not snap.reachable:
+        raise RuntimeError(f"Could not fetch {job.domain} — site may be down or unreachable")
+    control.check()
+
+    # Back in line, now for an LLM worker
+    job.snapshot = snap.to_bytes()
+    job.status = "queued"
+    clock.stop()
+    job.metrics = metrics.as_dict(clock.timings)
+    _checkpoint(job, clock, ["status", "snapshot", "metrics"])
+    return True
+
+
+@shared_task(bind=True, acks_late=True, reject_on_worker_lost=True, max_retries=CHECK_MAX_RETRIES)
+def evaluate_check(self, check_job_id):
+    """Stage 2: Claude Sonnet names the site, checks all 5 levels and writes the report."""
+    return _run_stage(self, check_job_id, _evaluate_stage)
+
+
+def _evaluate_stage(job, clock, metrics, control):
+    """Resumable: each step first looks at what the job row already holds
+    (step 0 output, level results) and skips work that was checkpointed by
+    an earlier attempt. Level results finished after the last checkpoint
+    come back from the stored LLM results (_cached_claude), since the
+    resumed prompts are identical.
+    """
+    from websites.models import Website, LEVEL_RANGES
+
+    mark_started(job)
+    snap = SiteSnapshot.from_bytes(job.snapshot, job.domain)
+    partial = PartialOutput(job, clock.timings)
+
+    # Step 0: Get name + description
+    if not job.website_id:
         job.status = "step_0"
-        job.save(update_fields=["status", "updated_at"])
-        raw = _run_claude(_build_step0_prompt(job.domain, data))
-        info = _parse_json_from_claude(raw)
+        clock.start("step_0")
+        _publish(job, clock)
+        # Well-annotated sites say what they are; only ask Claude otherwise
+        info = extract_site_info(job.domain, snap.homepage)
+        if info:
+            logger.info("CheckJob %s: name and description from %s's own metadata", job.id, job.domain)
+        else:
+            info = _cached_claude(
+                "step_0", _build_step0_prompt(job.domain, snap), parse=_parse_json_from_claude,
+                metrics=metrics, control=control,
+            )
         job.website_name = info.get("name", job.domain)[:255]
         job.website_description = info.get("description", "")
-        job.save(update_fields=["website_name", "website_description", "updated_at"])
 
         # Create website immediately (all criteria default False)
         website, created = Website.objects.get_or_create(
@@ -612,6 +1047,11 @@ def run_website_check(check_job_id):
                 "submitted_by_carbon": job.carbon,
             },
         )
+        job.changes = {
+            "first_check": created,
+            "name": website.name != job.website_name,
+            "description": website.description != job.website_description,
+        }
         if not created:
             website.name = job.website_name
             website.description = job.website_description
@@ -619,73 +1059,194 @@ def run_website_check(check_job_id):
                 website.submitted_by_carbon = job.carbon
             website.save(update_fields=["name", "description", "submitted_by_carbon", "updated_at"])
         job.website = website
-        job.save(update_fields=["website", "updated_at"])
-
-        # Steps 1-5: Check each level
-        all_results = {}
-        for level in range(1, 6):
-            job.status = f"step_{level}"
-            job.save(update_fields=["status", "updated_at"])
-
-            prompt = _build_level_prompt(level, job.domain, job.website_name, job.website_description, data)
-            raw = _run_claude(prompt)
-            parsed = _parse_json_from_claude(raw)
-
-            fields = LEVEL_RANGES[level]
-            results = {}
-            reasoning = {}
-            for field in fields:
-                field_data = parsed.get(field, {"pass": False, "reason": "Not evaluated by Claude"})
-                if isinstance(field_data, dict):
-                    results[field] = bool(field_data.get("pass", False))
-                    reasoning[field] = str(field_data.get("reason", ""))
-                else:
-                    results[field] = bool(field_data)
-                    reasoning[field] = ""
-
-            setattr(job, f"level_{level}_results", results)
-            setattr(job, f"level_{level}_reasoning", reasoning)
-            job.save(update_fields=[f"level_{level}_results", f"level_{level}_reasoning", "updated_at"])
-            all_results.update(results)
-
-        # Compute overall level (highest passing, not cumulative)
-        overall = 0
-        for level in range(1, 6):
-            fields = LEVEL_RANGES[level]
-            passed = sum(1 for f in fields if all_results.get(f, False))
-            if passed >= 4:
-                overall = level
-        job.overall_level = overall
-
-        # Step 6: Generate report
-        job.status = "step_6"
-        job.save(update_fields=["status", "overall_level", "updated_at"])
-        job.report_md = _run_claude(_build_report_prompt(job), timeout=240)
-
-        # Update Website model with check results
-        job.status = "saving"
-        job.save(update_fields=["status", "report_md", "updated_at"])
-
-        website = job.website
-        for field, value in all_results.items():
-            setattr(website, field, value)
-        website.verified = True
-        website.save()
+        _checkpoint(job, clock, ["status", "website_name", "website_description", "website", "changes"])
+
+    # Steps 1-5: Check all levels concurrently. Levels only depend on the
+    # prefetched data and the step 0 name/description, so they run side by
+    # side (each still waits for a Claude slot) and are published as they finish.
+    control.check()
+    todo = [level for level in range(1, 6) if getattr(job, f"level_{level}_results") is None]
+    if todo:
+        job.status = "step_levels"
+        clock.start("step_levels")
+        _publish(job, clock)
+
+        local = evaluate_local_criteria(snap)
+        # Rule verdicts are known now; the model's stream in after them
+        partial.add_criteria({f: v for f, v in local.items() if int(f[1]) in todo})
+        with ThreadPoolExecutor(max_workers=LEVEL_CHECK_WORKERS) as pool:
+            futures = {
+                pool.submit(
+                    _evaluate_level, level, job.domain, job.website_name, job.website_description,
+                    snap, local, metrics, control, partial,
+                ): level
+                for level in todo
+            }
+            try:
+                for future in as_completed(futures):
+                    level = futures[future]
+                    results, reasoning = future.result()
+                    setattr(job, f"level_{level}_results", results)
+                    setattr(job, f"level_{level}_reasoning", reasoning)
+                    partial.drop_criteria(LEVEL_RANGES[level])
+                    _publish(job, clock, partial)
+            except Exception:
+                for f in futures:
+                    f.cancel()
+                raise
+
+    # Compute overall level (highest passing, not cumulative)
+    all_results = _all_results(job)
+    overall = 0
+    for level in range(1, 6):
+        fields = LEVEL_RANGES[level]
+        passed = sum(1 for f in fields if all_results.get(f, False))
+        if passed >= 4:
+            overall = level
+    job.overall_level = overall
+
+    # Step 6: Generate report
+    job.status = "step_6"
+    clock.start("step_6")
+    level_fields = [f"level_{n}_{kind}" for n in range(1, 6) for kind in ("results", "reasoning")]
+    _checkpoint(job, clock, ["status", "overall_level"] + level_fields)
+    control.check()
+    job.report_md = _cached_claude(
+        "report", _build_report_prompt(job), timeout=240, metrics=metrics, control=control,
+        on_text=partial.for_report(),
+    )
 
-        job.status = "done"
-        job.save(update_fields=["status", "updated_at"])
+    job.status = "saving"
+    clock.stop()
+    job.metrics = metrics.as_dict(clock.timings)
+    _checkpoint(job, clock, ["status", "report_md", "metrics"])
+    return True
 
-        # Generate embedding async
-        try:
-            generate_website_embedding.delay(website.id)
-        except Exception:
-            pass
 
-        # Send email report
-        _send_check_report_email(job)
+@shared_task(bind=True, acks_late=True, reject_on_worker_lost=True, max_retries=CHECK_MAX_RETRIES)
+def finalize_check(self, check_job_id):
+    """Stage 3: apply the results to the Website, finish the job and send the emails."""
+    return _run_stage(self, check_job_id, _finalize_stage)
 
-    except Exception as e:
-        logger.exception("CheckJob %s failed: %s", check_job_id, e)
-        job.status = "error"
-        job.error_message = str(e)[:2000]
+
+def _all_results(job):
+    all_results = {}
+    for level in range(1, 6):
+        all_results.update(getattr(job, f"level_{level}_results"))
+    return all_results
+
+
+def _finalize_stage(job, clock, metrics, control):
+    # Update Website model with check results
+    job.status = "saving"
+    clock.start("saving")
+    _publish(job, clock)
+
+    all_results = _all_results(job)
+    website = job.website
+    level_before = website.level
+    changed = {f: v for f, v in all_results.items() if getattr(website, f) != v}
+    for field, value in all_results.items():
+        setattr(website, field, value)
+    website.verified = True
+    # The snapshot already has the homepage text, no need to crawl it again
+    website.page_content = SiteSnapshot.from_bytes(job.snapshot, job.domain).homepage["text"]
+    website.page_content_fetched_at = timezone.now()
+    website.save()
+    job.changes = {**(job.changes or {}), "criteria": changed, "level": [level_before, website.level]}
+
+    job.status = "done"
+    job.error_message = ""
+    clock.stop()
+    job.metrics = metrics.as_dict(clock.timings)
+    _checkpoint(job, clock, ["status", "changes", "error_message", "metrics"])
+
+    # Jobs that attached to this run get the same results
+    followers = finish_flight(job)
+
+    # Async: generate the embedding, then pre-render the PDF reports (their
+    # competitors come from it), and share the snapshot. Benchmark runs stay offline.
+    if job.trigger != "benchmark":
+        try:
+            render = render_report_pdfs.si([j.id for j in [job] + followers]).set(queue=FINALIZE_QUEUE)
+            embed = generate_website_embedding.si(website.id)
+            # The PDFs are still rendered (without competitors) if the embedding fails
+            embed.link_error(render.clone())
+            chain(embed, render).delay()
+        except Exception as e:
+            logger.warning("Could not queue the embedding and PDF reports of %s: %s", job.domain, e)
+        try:
+            archive_site_snapshot.apply_async(args=[job.id], queue=FINALIZE_QUEUE)
+        except Exception as e:
+            logger.warning("Could not queue the snapshot upload of %s: %s", job.domain, e)
+
+    # Send email report
+    email_start = time.monotonic()
+    for report_job in [job] + followers:
+        _send_check_report_email(report_job)
+    metrics.email_ms = int((time.monotonic() - email_start) * 1000)
+    job.metrics = metrics.as_dict(clock.timings)
+    job.save(update_fields=["metrics"])
+    return False
+
+
+def _fail_job(job, clock, e):
+    logger.exception("CheckJob %s failed: %s", job.id, e)
+    # Failed before the LLM stage (unreachable site, say): stop holding a place in line
+    leave_lane(job)
+    job.status = "error"
+    job.error_message = str(e)[:2000]
+    _checkpoint(job, clock)
+    finish_flight(job)
+
+
+def _cancel_job(job, clock=None):
+    leave_lane(job)
+    job.status = "cancelled"
+    job.error_message = ""
+    if clock:
+        _checkpoint(job, clock)
+    else:
         job.save(update_fields=["status", "error_message", "updated_at"])
+        publish_job(job)
+    finish_flight(job)
+
+
+def cancel_check(job):
+    """Stop a job. Returns False if there's nothing to stop (it already
+    finished) or it can't be stopped because other jobs share its run.
+
+    A job that hasn't started (queued, or waiting to retry) is cancelled
+    here; a running one gets the cancel flag and its worker winds it down
+    within a second or two.
+    """
+    from websites.live import TERMINAL_STATUSES, followers_key
+    from websites.models import CheckJob
+    from common.redis_client import get_redis
+
+    if job.status in TERMINAL_STATUSES:
+        return False
+    if job.shared_from_id:
+        # Only this user's view of a shared run; the run itself goes on
+        get_redis().srem(followers_key(job.shared_from_id), job.id)
+        _cancel_job(job)
+        return True
+    if CheckJob.objects.filter(shared_from=job).exclude(status__in=TERMINAL_STATUSES).exists():
+        return False
+
+    request_cancel(job.id)
+    if job.status in ("queued", "retrying"):
+        _cancel_job(job)
+    return True
+
+
+def resume_check(job):
+    """Re-queue a failed job. It continues from its last checkpoint (or
+    attaches to a check of the domain that's running by now)."""
+    job.status = "queued"
+    job.error_message = ""
+    job.shared_from = None
+    # A fresh deadline for the new run
+    job.deadline_at = None
+    job.save(update_fields=["status", "error_message", "shared_from", "deadline_at", "updated_at"])
+    start_check(job)
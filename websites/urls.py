@@ -6,7 +6,10 @@ urlpatterns = [
     path('', views.WebsiteListView.as_view()),
     path('submit/', views.WebsiteSubmitView.as_view()),
     path('verify-queue/', views.VerifyQueueView.as_view()),
+    path('bulk-check/', views.BulkCheckView.as_view()),
+    path('bulk-check/<int:bulk_id>/', views.BulkCheckDetailView.as_view()),
     path('<str:domain>/', views.WebsiteDetailView.as_view()),
+    path('<str:domain>/snapshot/', views.WebsiteSnapshotView.as_view()),
     path('<str:domain>/verify/', views.WebsiteVerifyView.as_view()),
     path('<str:domain>/request-verification/', CreateVerificationRequestView.as_view()),
     path('<str:domain>/usage-report/', views.WebsiteUsageReportView.as_view()),
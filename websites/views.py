@@ -8,6 +8,8 @@ from rest_framework.pagination import PageNumberPagination
 from core.utils import api_response, error_response
 from accounts.models import Carbon
 from websites.models import Website, WebsiteVerification, CRITERIA_FIELDS, LEVEL_RANGES
+from websites.freshness import record_view
+from websites.shared_snapshots import snapshot_info
 import env
 
 
@@ -167,6 +169,30 @@ class WebsiteDetailView(APIView):
         return api_response(_website_to_dict(website), meta=_website_meta())
 
 
+class WebsiteSnapshotView(APIView):
+    """Where to download the site's latest check snapshot, and how old it is."""
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request, domain):
+        domain = _normalize_url(domain)
+        website = Website.objects.filter(url=domain).first()
+        if not website:
+            return error_response("Website not found.", status=404)
+        info = snapshot_info(website)
+        if not info:
+            return error_response("No snapshot of this website yet. Run a check at /check/<domain>/ to make one.", status=404)
+
+        return api_response(
+            {"domain": domain, **info},
+            meta={
+                "url": "Gzip-compressed JSON of what the check fetched: the condensed homepage (text, meta, JSON-LD, links, forms) and docs page, robots.txt, sitemap, llms.txt, agent card, OpenAPI spec and API probe responses, raw and parsed",
+                "fetched_at": "When the site was fetched (ISO 8601)",
+                "age_seconds": "Seconds since it was fetched",
+                "stale": "True when older than a week; check the site itself too",
+            },
+        )
+
+
 class WebsiteListView(APIView):
     permission_classes = [permissions.AllowAny]
 
@@ -436,6 +462,67 @@ class WebsiteAnalyticsView(APIView):
         )
 
 
+def _bulk_check_meta():
+    return {
+        "bulk_id": "Id of the batch. Poll GET /api/websites/bulk-check/<bulk_id>/ for progress.",
+        "status": "running until every domain is done, failed or cancelled, then done",
+        "total": "Number of distinct valid domains in the batch",
+        "finished": "Domains that are done, failed or cancelled",
+        "counts": "Domains per state: done, error, cancelled, running (fetching or being evaluated), queued",
+        "invalid": "Submitted entries that were not valid domains (skipped)",
+        "results": "One row per domain. source is new (checked by this batch), recent (an existing check from the last 24h is reused) or existing (already listed, not re-checked). level is set once done.",
+        "created_at": "When the batch was submitted",
+    }
+
+
+class BulkCheckView(APIView):
+
+    def post(self, request):
+        from websites.bulk import BULK_MAX_DOMAINS, bulk_progress, create_bulk_check
+        from websites.queues import FETCH_QUEUE
+        from websites.tasks import prefetch_bulk_check
+
+        carbon, silicon = _get_auth(request)
+        if not carbon and not silicon:
+            return error_response("Authentication required.", status=401)
+
+        domains = request.data.get("domains")
+        if not isinstance(domains, list) or not domains:
+            return error_response("domains must be a non-empty list of domains.")
+        if len(domains) > BULK_MAX_DOMAINS:
+            return error_response(f"At most {BULK_MAX_DOMAINS} domains per batch.")
+
+        # Rate limit: 5 batches per day per account
+        who = f"carbon:{carbon.id}" if carbon else f"silicon:{silicon.id}"
+        allowed, retry_after = check_rate_limit(f"bulk_check:{who}", 5, 86400)
+        if not allowed:
+            return rate_limit_response(retry_after)
+
+        bulk = create_bulk_check(domains, carbon=carbon, silicon=silicon)
+        if any(item["source"] == "new" for item in bulk.items):
+            # Fetch work, for the fetch workers
+            prefetch_bulk_check.apply_async(args=[bulk.id], queue=FETCH_QUEUE)
+
+        return api_response(bulk_progress(bulk), meta=_bulk_check_meta(), status=201)
+
+
+class BulkCheckDetailView(APIView):
+
+    def get(self, request, bulk_id):
+        from websites.bulk import bulk_progress
+        from websites.models import BulkCheck
+
+        carbon, silicon = _get_auth(request)
+        if not carbon and not silicon:
+            return error_response("Authentication required.", status=401)
+
+        bulk = BulkCheck.objects.filter(id=bulk_id).first()
+        if not bulk or not ((carbon and bulk.carbon_id == carbon.id) or (silicon and bulk.silicon_id == silicon.id)):
+            return error_response("Bulk check not found.", status=404)
+
+        return api_response(bulk_progress(bulk), meta=_bulk_check_meta())
+
+
 class VerifyQueueView(APIView):
 
     def get(self, request):
@@ -460,16 +547,17 @@ class VerifyQueueView(APIView):
                 "name": w.name,
                 "description": w.description,
                 "current_verification_count": w.v_count,
+                "snapshot": snapshot_info(w),
             })
 
         return api_response(
             {
                 "websites": results,
                 "criteria_docs": CRITERIA_DOCS,
-                "instructions": "For each website, visit it and evaluate all 30 criteria. Submit your findings via POST /api/websites/<domain>/verify/ with a 'criteria' object containing 30 boolean fields.",
+                "instructions": "For each website, evaluate all 30 criteria: from its snapshot (a shared crawl, see GET /api/websites/<domain>/snapshot/) when it has a fresh one, otherwise by visiting it. Submit your findings via POST /api/websites/<domain>/verify/ with a 'criteria' object containing 30 boolean fields.",
             },
             meta={
-                "websites": "List of websites needing verification",
+                "websites": "List of websites needing verification, each with its snapshot (url, fetched_at, age_seconds, stale) or null",
                 "criteria_docs": "Documentation for each of the 30 criteria to evaluate",
                 "instructions": "How to perform and submit a verification",
             },
@@ -488,6 +576,7 @@ class WebsiteBadgeSvgView(APIView):
             svg = _badge_svg("?", domain="", theme=theme)
             return HttpResponse(svg, content_type="image/svg+xml")
 
+        record_view(domain)
         level = website.level
         svg = _badge_svg(f"L{level}", domain=domain, theme=theme)
         return HttpResponse(svg, content_type="image/svg+xml")